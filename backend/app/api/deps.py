@@ -2,15 +2,21 @@
 API dependencies - authentication, database, permissions
 """
 
+import base64
+from datetime import datetime
 from typing import Generator, Optional
 from fastapi import Depends, HTTPException, status, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import SessionLocal
+from app.database import SessionLocal, get_async_db
 from app.core.security import decode_access_token, check_permission
+from app.core.cache import is_jti_revoked
 from app.models import User
 from app.schemas import CurrentUser
+from app.schemas.event import to_naive_utc
 
 # Security scheme
 security = HTTPBearer()
@@ -42,7 +48,7 @@ def get_db() -> Generator[Session, None, None]:
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> CurrentUser:
     """
     Get current authenticated user from JWT token
@@ -73,8 +79,23 @@ async def get_current_user(
     except ValueError:
         raise credentials_exception
 
-    # Get user from database
-    user = db.query(User).filter(User.user_id == user_id).first()
+    # Revoked by logout / password change (tokens issued before jti have none)
+    jti = payload.get("jti")
+    if jti and await is_jti_revoked(jti):
+        raise credentials_exception
+
+    # Get user from database (same AsyncSession as async endpoints in the request)
+    user = (await db.execute(
+        select(User).where(User.user_id == user_id)
+    )).scalar_one_or_none()
+
+    # End the lookup transaction so the asyncpg connection goes back to the
+    # pool now: routes on the sync get_db session would otherwise hold it
+    # (next to their psycopg2 connection) until the response is sent.
+    # expire_on_commit=False keeps the loaded user usable; async routes
+    # sharing this session simply check a connection out again.
+    await db.commit()
+
     if user is None:
         raise credentials_exception
 
@@ -245,3 +266,20 @@ def get_pagination(
         PaginationParams: Pagination parameters
     """
     return PaginationParams(page=page, size=size)
+
+
+def encode_event_cursor(event_time: datetime, event_id: int) -> str:
+    """Encode keyset pagination cursor from last (event_time, event_id)"""
+    return base64.urlsafe_b64encode(f"{event_time.isoformat()}|{event_id}".encode()).decode()
+
+
+def decode_event_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode keyset pagination cursor (raises HTTP 400 if malformed)"""
+    try:
+        event_time, event_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return to_naive_utc(datetime.fromisoformat(event_time)), int(event_id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
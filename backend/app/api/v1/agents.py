@@ -632,22 +632,22 @@ async def get_agent_statistics(
     """
     try:
         # Total agents
-        total_agents = db.query(func.count(Agent.agent_id)).scalar()
+        total_agents = db.query(func.count()).select_from(Agent).scalar()
 
         # Agents by status
-        online_agents = db.query(func.count(Agent.agent_id)).filter(Agent.status == 'online').scalar()
-        offline_agents = db.query(func.count(Agent.agent_id)).filter(Agent.status == 'offline').scalar()
-        error_agents = db.query(func.count(Agent.agent_id)).filter(Agent.status == 'error').scalar()
+        online_agents = db.query(func.count()).select_from(Agent).filter(Agent.status == 'online').scalar()
+        offline_agents = db.query(func.count()).select_from(Agent).filter(Agent.status == 'offline').scalar()
+        error_agents = db.query(func.count()).select_from(Agent).filter(Agent.status == 'error').scalar()
 
         # Agents by criticality
-        critical_agents = db.query(func.count(Agent.agent_id)).filter(Agent.criticality_level == 'critical').scalar()
+        critical_agents = db.query(func.count()).select_from(Agent).filter(Agent.criticality_level == 'critical').scalar()
 
         # Agents by domain (top 10)
         agents_by_domain = {}
         domain_stats = db.query(
             Agent.domain,
-            func.count(Agent.agent_id).label('count')
-        ).group_by(Agent.domain).order_by(func.count(Agent.agent_id).desc()).limit(10).all()
+            func.count().label('count')
+        ).group_by(Agent.domain).order_by(func.count().desc()).limit(10).all()
 
         for domain, count in domain_stats:
             agents_by_domain[domain or 'No Domain'] = count
@@ -656,15 +656,15 @@ async def get_agent_statistics(
         agents_by_os = {}
         os_stats = db.query(
             Agent.os_version,
-            func.count(Agent.agent_id).label('count')
-        ).group_by(Agent.os_version).order_by(func.count(Agent.agent_id).desc()).limit(10).all()
+            func.count().label('count')
+        ).group_by(Agent.os_version).order_by(func.count().desc()).limit(10).all()
 
         for os_version, count in os_stats:
             agents_by_os[os_version or 'Unknown'] = count
 
         # Recently registered (last 7 days)
         week_ago = datetime.utcnow() - timedelta(days=7)
-        recent_agents = db.query(func.count(Agent.agent_id)).filter(
+        recent_agents = db.query(func.count()).select_from(Agent).filter(
             Agent.registered_at >= week_ago
         ).scalar()
 
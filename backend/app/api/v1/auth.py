@@ -2,19 +2,26 @@
 Authentication API endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
+from pydantic import TypeAdapter
+from sqlalchemy import select, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
+from typing import Optional
 
-from app.api.deps import get_db, get_current_user, require_admin
+from app.api.deps import get_async_db, get_current_user, require_admin
 from app.core.security import (
-    verify_password,
-    get_password_hash,
+    verify_password_async,
+    verify_and_update_password_cached,
+    get_dummy_password_hash,
+    get_password_hash_async,
     create_session_token,
+    generate_session_id,
     validate_password_strength,
     get_client_ip,
     get_user_agent,
 )
+from app.core.cache import revoke_jti, incr_with_ttl, cache_delete
 from app.models import User, Session as DBSession
 from app.schemas import (
     LoginRequest,
@@ -24,13 +31,62 @@ from app.schemas import (
     UserCreate,
     UserUpdate,
     UserResponse,
+    UserListResponse,
     CurrentUser,
 )
 from app.config import settings
-import uuid
 
 router = APIRouter()
 
+# Token lifetime is fixed at startup
+_EXPIRES_SECONDS = settings.jwt_access_token_expire_minutes * 60
+_EXPIRES_DELTA = timedelta(seconds=_EXPIRES_SECONDS)
+
+# Columns returned by UserResponse (avoids loading password_hash/settings)
+USER_RESPONSE_COLUMNS = (
+    User.user_id,
+    User.username,
+    User.email,
+    User.role,
+    User.is_ad_user,
+    User.is_active,
+    User.created_at,
+    User.last_login,
+)
+
+# Validates/serializes a whole page of users in one pydantic-core call
+_USER_LIST_ADAPTER = TypeAdapter(list[UserResponse])
+
+
+# ============================================================================
+# SESSION HELPERS
+# ============================================================================
+
+async def _deactivate_user_sessions(db: AsyncSession, user_id: int) -> list:
+    """
+    Deactivate all active sessions of a user
+
+    Returns:
+        list: (session_id, expires_at) rows of deactivated sessions
+    """
+    result = await db.execute(
+        update(DBSession)
+        .where(DBSession.user_id == user_id, DBSession.is_active == True)
+        .values(is_active=False)
+        .returning(DBSession.session_id, DBSession.expires_at)
+        .execution_options(synchronize_session=False)
+    )
+    return result.all()
+
+
+async def _revoke_session_tokens(sessions: list) -> None:
+    """Add JWT ids of deactivated sessions to the Redis revocation list"""
+    now = datetime.utcnow()
+    for session in sessions:
+        ttl = int((session.expires_at - now).total_seconds())
+        if ttl > 0:
+            await revoke_jti(str(session.session_id), ttl)
+
 
 # ============================================================================
 # AUTHENTICATION ENDPOINTS
@@ -40,7 +96,7 @@ router = APIRouter()
 async def login(
     login_data: LoginRequest,
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Authenticate user and return JWT token
@@ -49,12 +105,40 @@ async def login(
     - Creates session in database
     - Returns JWT token
     """
-    # Get user from database
-    user = db.query(User).filter(User.username == login_data.username).first()
+    # Brute-force throttle: reject before spending CPU on password hashing
+    throttle_key = f"login:fail:{login_data.username.lower()}:{get_client_ip(request)}"
+    attempts = await incr_with_ttl(throttle_key, settings.account_lockout_minutes * 60)
+    if attempts > settings.failed_login_attempts:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts. Try again later.",
+            headers={"Retry-After": str(settings.account_lockout_minutes * 60)},
+        )
+
+    # Get user from database (only the columns needed to authenticate)
+    # username is UNIQUE in config.users, so this is a single index lookup
+    result = await db.execute(
+        select(
+            User.user_id,
+            User.username,
+            User.email,
+            User.password_hash,
+            User.role,
+            User.is_active,
+        ).where(User.username == login_data.username)
+    )
+    user = result.first()
 
     # Check if user exists and password is correct
-    if not user or not verify_password(login_data.password, user.password_hash or ""):
-        # Log failed attempt (TODO: implement lockout after N attempts)
+    if user:
+        password_valid, new_password_hash = await verify_and_update_password_cached(
+            user.user_id, login_data.password, user.password_hash or ""
+        )
+    else:
+        # Same hashing cost as a wrong password for unknown usernames
+        await verify_password_async(login_data.password, get_dummy_password_hash())
+        password_valid, new_password_hash = False, None
+    if not password_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -68,51 +152,53 @@ async def login(
             detail="User account is disabled"
         )
 
-    # Create JWT token
-    token = create_session_token(user.user_id, user.username)
+    # Create JWT token (session_id doubles as jti claim)
+    session_id = generate_session_id()
+    token = create_session_token(user.user_id, user.username, session_id)
 
     # Calculate expiration
-    expires_at = datetime.utcnow() + timedelta(
-        minutes=settings.jwt_access_token_expire_minutes
+    now = datetime.utcnow()
+    expires_at = now + _EXPIRES_DELTA
+
+    # Create session in database (sent together with the last_login UPDATE, one commit)
+    await db.execute(
+        insert(DBSession).values(
+            session_id=session_id,
+            user_id=user.user_id,
+            token=token,
+            ip_address=get_client_ip(request),
+            user_agent=get_user_agent(request),
+            expires_at=expires_at,
+            is_active=True
+        )
     )
 
-    # Create session in database
-    session_id = str(uuid.uuid4())
-    db_session = DBSession(
-        session_id=session_id,
-        user_id=user.user_id,
-        token=token,
-        ip_address=get_client_ip(request),
-        user_agent=get_user_agent(request),
-        expires_at=expires_at,
-        is_active=True
+    # Update last login time (and migrate legacy bcrypt hash to argon2id)
+    user_values = {"last_login": now}
+    if new_password_hash:
+        user_values["password_hash"] = new_password_hash
+    await db.execute(
+        update(User).where(User.user_id == user.user_id).values(**user_values)
     )
-    db.add(db_session)
 
-    # Update last login time
-    user.last_login = datetime.utcnow()
+    await db.commit()
 
-    db.commit()
+    # Successful login resets the failed attempts counter
+    await cache_delete(throttle_key)
 
     # Return token response
     return TokenResponse(
         access_token=token,
         token_type="bearer",
-        expires_in=settings.jwt_access_token_expire_minutes * 60,
-        user=UserInfo(
-            user_id=user.user_id,
-            username=user.username,
-            email=user.email,
-            role=user.role,
-            is_active=user.is_active
-        )
+        expires_in=_EXPIRES_SECONDS,
+        user=UserInfo.model_validate(user)
     )
 
 
 @router.post("/logout")
 async def logout(
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Logout current user
@@ -120,12 +206,11 @@ async def logout(
     - Deactivates current session
     """
     # Deactivate all active sessions for this user
-    db.query(DBSession).filter(
-        DBSession.user_id == current_user.user_id,
-        DBSession.is_active == True
-    ).update({"is_active": False})
+    revoked_sessions = await _deactivate_user_sessions(db, current_user.user_id)
+
+    await db.commit()
 
-    db.commit()
+    await _revoke_session_tokens(revoked_sessions)
 
     return {"message": "Logged out successfully"}
 
@@ -133,12 +218,15 @@ async def logout(
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get current user information
     """
-    user = db.query(User).filter(User.user_id == current_user.user_id).first()
+    result = await db.execute(
+        select(*USER_RESPONSE_COLUMNS).where(User.user_id == current_user.user_id)
+    )
+    user = result.first()
 
     if not user:
         raise HTTPException(
@@ -146,23 +234,14 @@ async def get_current_user_info(
             detail="User not found"
         )
 
-    return UserResponse(
-        user_id=user.user_id,
-        username=user.username,
-        email=user.email,
-        role=user.role,
-        is_ad_user=user.is_ad_user,
-        is_active=user.is_active,
-        created_at=user.created_at,
-        last_login=user.last_login
-    )
+    return UserResponse.model_validate(user)
 
 
 @router.post("/change-password")
 async def change_password(
     password_data: PasswordChangeRequest,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Change current user's password
@@ -172,7 +251,7 @@ async def change_password(
     - Updates password hash
     """
     # Get user from database
-    user = db.query(User).filter(User.user_id == current_user.user_id).first()
+    user = await db.get(User, current_user.user_id)
 
     if not user:
         raise HTTPException(
@@ -188,7 +267,7 @@ async def change_password(
         )
 
     # Verify old password
-    if not verify_password(password_data.old_password, user.password_hash or ""):
+    if not await verify_password_async(password_data.old_password, user.password_hash or ""):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect old password"
@@ -202,16 +281,12 @@ async def change_password(
             detail=error_message
         )
 
-    # Update password hash
-    user.password_hash = get_password_hash(password_data.new_password)
-    db.commit()
+    # Update password hash and deactivate all sessions (force re-login) in one transaction
+    user.password_hash = await get_password_hash_async(password_data.new_password)
+    revoked_sessions = await _deactivate_user_sessions(db, user.user_id)
+    await db.commit()
 
-    # Deactivate all sessions (force re-login)
-    db.query(DBSession).filter(
-        DBSession.user_id == user.user_id,
-        DBSession.is_active == True
-    ).update({"is_active": False})
-    db.commit()
+    await _revoke_session_tokens(revoked_sessions)
 
     return {"message": "Password changed successfully. Please login again."}
 
@@ -223,7 +298,7 @@ async def change_password(
 @router.post("/users", response_model=UserResponse, dependencies=[Depends(require_admin)])
 async def create_user(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create new user (admin only)
@@ -233,8 +308,10 @@ async def create_user(
     - Creates user with hashed password
     """
     # Check if username already exists
-    existing_user = db.query(User).filter(User.username == user_data.username).first()
-    if existing_user:
+    result = await db.execute(
+        select(User.user_id).where(User.username == user_data.username)
+    )
+    if result.first():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already exists"
@@ -249,69 +326,83 @@ async def create_user(
         )
 
     # Create user
-    new_user = User(
-        username=user_data.username,
-        email=user_data.email,
-        password_hash=get_password_hash(user_data.password),
-        role=user_data.role,
-        is_ad_user=user_data.is_ad_user,
-        is_active=True
+    password_hash = await get_password_hash_async(user_data.password)
+    # RETURNING gives generated user_id/created_at without a refresh SELECT
+    result = await db.execute(
+        insert(User)
+        .values(
+            username=user_data.username,
+            email=user_data.email,
+            password_hash=password_hash,
+            role=user_data.role,
+            is_ad_user=user_data.is_ad_user,
+            is_active=True
+        )
+        .returning(*USER_RESPONSE_COLUMNS)
     )
+    new_user = result.one()
+    await db.commit()
 
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-
-    return UserResponse(
-        user_id=new_user.user_id,
-        username=new_user.username,
-        email=new_user.email,
-        role=new_user.role,
-        is_ad_user=new_user.is_ad_user,
-        is_active=new_user.is_active,
-        created_at=new_user.created_at,
-        last_login=new_user.last_login
-    )
+    return UserResponse.model_validate(new_user)
 
 
-@router.get("/users", response_model=list[UserResponse], dependencies=[Depends(require_admin)])
+@router.get("/users", response_model=UserListResponse, dependencies=[Depends(require_admin)])
 async def list_users(
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100
+    db: AsyncSession = Depends(get_async_db),
+    after_user_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=500)
 ):
     """
     List all users (admin only)
+
+    - Keyset pagination: pass `next` from the previous page as after_user_id
     """
-    users = db.query(User).offset(skip).limit(limit).all()
+    query = select(*USER_RESPONSE_COLUMNS).order_by(User.user_id).limit(limit)
+    if after_user_id is not None:
+        query = query.where(User.user_id > after_user_id)
 
-    return [
-        UserResponse(
-            user_id=user.user_id,
-            username=user.username,
-            email=user.email,
-            role=user.role,
-            is_ad_user=user.is_ad_user,
-            is_active=user.is_active,
-            created_at=user.created_at,
-            last_login=user.last_login
-        )
-        for user in users
-    ]
+    result = await db.execute(query)
+    users = _USER_LIST_ADAPTER.validate_python(result.all(), from_attributes=True)
+
+    return UserListResponse(
+        items=users,
+        next=users[-1].user_id if len(users) == limit else None,
+    )
 
 
 @router.patch("/users/{user_id}", response_model=UserResponse, dependencies=[Depends(require_admin)])
 async def update_user(
     user_id: int,
     user_data: UserUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update user (admin only)
 
     - Can update email, role, active status
     """
-    user = db.query(User).filter(User.user_id == user_id).first()
+    # Update fields
+    changes = {}
+    if user_data.email is not None:
+        changes["email"] = user_data.email
+    if user_data.role is not None:
+        changes["role"] = user_data.role
+    if user_data.is_active is not None:
+        changes["is_active"] = user_data.is_active
+
+    # Single UPDATE ... RETURNING instead of load + flush + refresh
+    if changes:
+        query = (
+            update(User)
+            .where(User.user_id == user_id)
+            .values(**changes)
+            .returning(*USER_RESPONSE_COLUMNS)
+        )
+    else:
+        query = select(*USER_RESPONSE_COLUMNS).where(User.user_id == user_id)
+
+    result = await db.execute(query)
+    user = result.first()
 
     if not user:
         raise HTTPException(
@@ -319,34 +410,16 @@ async def update_user(
             detail="User not found"
         )
 
-    # Update fields
-    if user_data.email is not None:
-        user.email = user_data.email
-    if user_data.role is not None:
-        user.role = user_data.role
-    if user_data.is_active is not None:
-        user.is_active = user_data.is_active
-
-    db.commit()
-    db.refresh(user)
-
-    return UserResponse(
-        user_id=user.user_id,
-        username=user.username,
-        email=user.email,
-        role=user.role,
-        is_ad_user=user.is_ad_user,
-        is_active=user.is_active,
-        created_at=user.created_at,
-        last_login=user.last_login
-    )
+    await db.commit()
+
+    return UserResponse.model_validate(user)
 
 
 @router.delete("/users/{user_id}", dependencies=[Depends(require_admin)])
 async def delete_user(
     user_id: int,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete user (admin only)
@@ -359,16 +432,21 @@ async def delete_user(
             detail="Cannot delete your own account"
         )
 
-    user = db.query(User).filter(User.user_id == user_id).first()
+    # Soft delete - just deactivate
+    result = await db.execute(
+        update(User)
+        .where(User.user_id == user_id)
+        .values(is_active=False)
+        .returning(User.username)
+    )
+    username = result.scalar_one_or_none()
 
-    if not user:
+    if username is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
 
-    # Soft delete - just deactivate
-    user.is_active = False
-    db.commit()
+    await db.commit()
 
-    return {"message": f"User {user.username} deactivated successfully"}
+    return {"message": f"User {username} deactivated successfully"}
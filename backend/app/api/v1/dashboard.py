@@ -4,25 +4,105 @@ Combined statistics for the main dashboard
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, text
+from sqlalchemy import text
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import DBAPIError
 from datetime import datetime, timedelta
+import asyncio
 import logging
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_current_user
 from app.schemas.auth import CurrentUser
-from app.models.event import Event
-from app.models.incident import Alert, Incident
-from app.models.agent import Agent
+from app.core.cache import cache_get_json, cache_set_json
+from app.database import async_engine
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+DASHBOARD_STATS_CACHE_KEY = "dashboard:stats:v1"
+
+
+# ============================================================================
+# STATISTICS QUERIES
+# ============================================================================
+
+# Last hour is counted live (small index range)
+EVENTS_LAST_HOUR_SQL = text("""
+    SELECT COUNT(*) AS events_1h
+    FROM security_events.events
+    WHERE event_time >= :start_1h
+""")
+
+# 24h / 7d are summed from the hourly rollup (migration 006), hour granularity
+EVENTS_ROLLUP_COUNTS_SQL = text("""
+    SELECT
+        COALESCE(SUM(event_count) FILTER (WHERE hour_bucket >= :start_24h), 0) AS events_24h,
+        COALESCE(SUM(event_count), 0) AS events_7d
+    FROM security_events.event_counts_hourly
+    WHERE hour_bucket >= :start_7d
+""")
+
+# Fallback when the rollup is not available (TimescaleDB missing / migration not applied)
+EVENTS_RAW_COUNTS_SQL = text("""
+    SELECT
+        COUNT(*) FILTER (WHERE event_time >= :start_24h) AS events_24h,
+        COUNT(*) AS events_7d
+    FROM security_events.events
+    WHERE event_time >= :start_7d
+""")
+
+# new / acknowledged / open (new + acknowledged + investigating)
+ALERTS_COUNTS_SQL = text("""
+    SELECT
+        COUNT(*) FILTER (WHERE status = 'new') AS new,
+        COUNT(*) FILTER (WHERE status = 'acknowledged') AS acknowledged,
+        COUNT(*) FILTER (WHERE status IN ('new', 'acknowledged', 'investigating')) AS total_open
+    FROM incidents.alerts
+""")
+
+INCIDENTS_COUNTS_SQL = text("""
+    SELECT
+        COUNT(*) FILTER (WHERE status = 'open') AS open,
+        COUNT(*) FILTER (WHERE status = 'investigating') AS investigating,
+        COUNT(*) FILTER (WHERE created_at >= :start_month) AS this_month
+    FROM incidents.incidents
+""")
+
+# Online agents = seen in last 5 minutes
+AGENTS_COUNTS_SQL = text("""
+    SELECT
+        COUNT(*) AS total,
+        COUNT(*) FILTER (WHERE last_seen >= :online_threshold) AS online
+    FROM assets.agents
+""")
+
+
+async def _fetch_counts(query, params: dict = None) -> Row:
+    """Run one aggregate query on its own pooled connection"""
+    async with async_engine.connect() as conn:
+        result = await conn.execute(query, params or {})
+        return result.one()
+
+
+async def _fetch_event_window_counts(start_24h: datetime, start_7d: datetime) -> Row:
+    """Get 24h / 7d event counts from hourly rollup, falling back to raw events"""
+    hour_params = {
+        "start_24h": start_24h.replace(minute=0, second=0, microsecond=0),
+        "start_7d": start_7d.replace(minute=0, second=0, microsecond=0),
+    }
+    try:
+        return await _fetch_counts(EVENTS_ROLLUP_COUNTS_SQL, hour_params)
+    except DBAPIError as e:
+        logger.warning(f"Event counts rollup unavailable, counting raw events: {e}")
+        return await _fetch_counts(
+            EVENTS_RAW_COUNTS_SQL, {"start_24h": start_24h, "start_7d": start_7d}
+        )
+
 
 @router.get("/stats")
 async def get_dashboard_stats(
-    db: Session = Depends(get_db),
     current_user: CurrentUser = Depends(get_current_user)
 ):
     """
@@ -30,84 +110,30 @@ async def get_dashboard_stats(
     Returns data in the format expected by the frontend Dashboard component
     """
     try:
+        # Served from Redis for a few seconds between refreshes
+        cached = await cache_get_json(DASHBOARD_STATS_CACHE_KEY)
+        if cached is not None:
+            return cached
+
         now = datetime.utcnow()
         start_24h = now - timedelta(hours=24)
         start_7d = now - timedelta(days=7)
-        start_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-
-        # ============================================================================
-        # EVENTS STATISTICS
-        # ============================================================================
-
-        # Total events in last 24 hours
-        events_24h = db.execute(
-            text("SELECT COUNT(*) FROM security_events.events WHERE event_time >= :start_time"),
-            {"start_time": start_24h}
-        ).scalar() or 0
-
-        # Total events in last 7 days
-        events_7d = db.execute(
-            text("SELECT COUNT(*) FROM security_events.events WHERE event_time >= :start_time"),
-            {"start_time": start_7d}
-        ).scalar() or 0
-
-        # Calculate rate per hour (events in last hour)
         start_1h = now - timedelta(hours=1)
-        events_1h = db.execute(
-            text("SELECT COUNT(*) FROM security_events.events WHERE event_time >= :start_time"),
-            {"start_time": start_1h}
-        ).scalar() or 0
-
-        # ============================================================================
-        # ALERTS STATISTICS
-        # ============================================================================
-
-        # New alerts (status = 'new')
-        alerts_new = db.query(func.count(Alert.AlertId)).filter(
-            Alert.Status == 'new'
-        ).scalar() or 0
-
-        # Acknowledged alerts
-        alerts_acknowledged = db.query(func.count(Alert.AlertId)).filter(
-            Alert.Status == 'acknowledged'
-        ).scalar() or 0
-
-        # Total open alerts (new + acknowledged + investigating)
-        alerts_total_open = db.query(func.count(Alert.AlertId)).filter(
-            Alert.Status.in_(['new', 'acknowledged', 'investigating'])
-        ).scalar() or 0
-
-        # ============================================================================
-        # INCIDENTS STATISTICS
-        # ============================================================================
-
-        # Open incidents
-        incidents_open = db.query(func.count(Incident.IncidentId)).filter(
-            Incident.Status == 'open'
-        ).scalar() or 0
-
-        # Investigating incidents
-        incidents_investigating = db.query(func.count(Incident.IncidentId)).filter(
-            Incident.Status == 'investigating'
-        ).scalar() or 0
-
-        # Total incidents this month
-        incidents_this_month = db.query(func.count(Incident.IncidentId)).filter(
-            Incident.CreatedAt >= start_month
-        ).scalar() or 0
-
-        # ============================================================================
-        # AGENTS STATISTICS
-        # ============================================================================
+        start_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        agent_online_threshold = now - timedelta(minutes=5)
 
-        # Total agents
-        agents_total = db.query(func.count(Agent.agent_id)).scalar() or 0
+        # Independent groups run concurrently on separate connections,
+        # so wall time is the slowest group instead of the sum
+        events_1h_row, events_row, alerts_row, incidents_row, agents_row = await asyncio.gather(
+            _fetch_counts(EVENTS_LAST_HOUR_SQL, {"start_1h": start_1h}),
+            _fetch_event_window_counts(start_24h, start_7d),
+            _fetch_counts(ALERTS_COUNTS_SQL),
+            _fetch_counts(INCIDENTS_COUNTS_SQL, {"start_month": start_month}),
+            _fetch_counts(AGENTS_COUNTS_SQL, {"online_threshold": agent_online_threshold}),
+        )
 
-        # Online agents (seen in last 5 minutes)
-        agent_online_threshold = now - timedelta(minutes=5)
-        agents_online = db.query(func.count(Agent.agent_id)).filter(
-            Agent.last_seen >= agent_online_threshold
-        ).scalar() or 0
+        agents_total = agents_row.total or 0
+        agents_online = agents_row.online or 0
 
         # Offline agents
         agents_offline = agents_total - agents_online
@@ -116,21 +142,21 @@ async def get_dashboard_stats(
         # BUILD RESPONSE
         # ============================================================================
 
-        return {
+        stats = {
             "events": {
-                "total_24h": events_24h,
-                "total_7d": events_7d,
-                "rate_per_hour": events_1h
+                "total_24h": events_row.events_24h or 0,
+                "total_7d": events_row.events_7d or 0,
+                "rate_per_hour": events_1h_row.events_1h or 0
             },
             "alerts": {
-                "new": alerts_new,
-                "acknowledged": alerts_acknowledged,
-                "total_open": alerts_total_open
+                "new": alerts_row.new or 0,
+                "acknowledged": alerts_row.acknowledged or 0,
+                "total_open": alerts_row.total_open or 0
             },
             "incidents": {
-                "open": incidents_open,
-                "investigating": incidents_investigating,
-                "total_this_month": incidents_this_month
+                "open": incidents_row.open or 0,
+                "investigating": incidents_row.investigating or 0,
+                "total_this_month": incidents_row.this_month or 0
             },
             "agents": {
                 "online": agents_online,
@@ -139,6 +165,10 @@ async def get_dashboard_stats(
             }
         }
 
+        await cache_set_json(DASHBOARD_STATS_CACHE_KEY, stats, settings.dashboard_stats_cache_ttl)
+
+        return stats
+
     except Exception as e:
         logger.error(f"Error getting dashboard stats: {e}", exc_info=True)
         raise HTTPException(
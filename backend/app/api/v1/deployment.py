@@ -3,30 +3,179 @@ Agent Deployment API Endpoints
 Handles agent package management, deployment configuration, and distribution
 """
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request, Response, status
+from fastapi.responses import FileResponse, ORJSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, and_, select, insert, update, delete
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 from datetime import datetime
+from pathlib import Path
 import os
 import shutil
 import hashlib
+import uuid
+import asyncio
 import json
 import logging
+from functools import lru_cache
 
-from app.api.deps import get_db, get_current_user, require_admin
+from app.api.deps import get_db, get_async_db, get_current_user, require_admin
 from app.schemas.auth import CurrentUser
 from app.models.agent import Agent, AgentPackage, AgentDeployment, AgentDeploymentTarget
 from app.config import settings
 
+try:
+    import blake3  # optional: SIMD BLAKE3 integrity hash for packages
+except ImportError:
+    blake3 = None
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 # Storage path for agent packages
-PACKAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), "storage", "agent_packages")
-os.makedirs(PACKAGES_DIR, exist_ok=True)
+PACKAGES_DIR = (
+    Path(settings.agent_packages_dir) if settings.agent_packages_dir
+    else Path(__file__).resolve().parents[3] / "storage" / "agent_packages"
+)
+PACKAGES_DIR.mkdir(parents=True, exist_ok=True)
+
+# Upload/download I/O block size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# ISO-8601 timestamps formatted by PostgreSQL in list projections
+ISO_TIMESTAMP_FORMAT = 'YYYY-MM-DD"T"HH24:MI:SS.US'
+
+# Deployment projection shared by list and detail endpoints; package version
+# comes from an outer join on AgentPackage instead of a lazy load per row
+DEPLOYMENT_COLUMNS = (
+    AgentDeployment.DeploymentId,
+    AgentDeployment.Name,
+    AgentDeployment.Description,
+    AgentDeployment.PackageId,
+    AgentPackage.Version.label("PackageVersion"),
+    AgentDeployment.DeploymentMode,
+    AgentDeployment.TargetOU,
+    AgentDeployment.ServerUrl,
+    AgentDeployment.NetworkPath,
+    AgentDeployment.EnableProtection,
+    AgentDeployment.InstallWatchdog,
+    AgentDeployment.Status,
+    AgentDeployment.CreatedBy,
+    func.to_char(AgentDeployment.CreatedAt, ISO_TIMESTAMP_FORMAT).label("CreatedAtIso"),
+    func.to_char(AgentDeployment.ActivatedAt, ISO_TIMESTAMP_FORMAT).label("ActivatedAtIso"),
+    AgentDeployment.TotalTargets,
+    AgentDeployment.DeployedCount,
+    AgentDeployment.FailedCount,
+)
+
+
+def _deployment_row_to_dict(d) -> dict:
+    """Response dict for a DEPLOYMENT_COLUMNS row"""
+    return {
+        "deployment_id": d.DeploymentId,
+        "name": d.Name,
+        "description": d.Description,
+        "package_id": d.PackageId,
+        "package_version": d.PackageVersion,
+        "deployment_mode": d.DeploymentMode,
+        "target_ou": d.TargetOU,
+        "server_url": d.ServerUrl,
+        "network_path": d.NetworkPath,
+        "enable_protection": d.EnableProtection,
+        "install_watchdog": d.InstallWatchdog,
+        "status": d.Status,
+        "created_by": d.CreatedBy,
+        "created_at": d.CreatedAtIso,
+        "activated_at": d.ActivatedAtIso,
+        "total_targets": d.TotalTargets,
+        "deployed_count": d.DeployedCount,
+        "failed_count": d.FailedCount
+    }
+
+
+def _target_mappings(deployment_id: int, computers: list) -> List[dict]:
+    """Build AgentDeploymentTarget insert mappings from names or {name, dn, ip} dicts"""
+    mappings = []
+    for computer in computers:
+        if isinstance(computer, dict):
+            mappings.append({
+                "DeploymentId": deployment_id,
+                "ComputerName": computer.get("name"),
+                "ComputerDN": computer.get("dn"),
+                "IPAddress": computer.get("ip"),
+                "Status": "pending",
+            })
+        else:
+            mappings.append({
+                "DeploymentId": deployment_id,
+                "ComputerName": computer,
+                "ComputerDN": None,
+                "IPAddress": None,
+                "Status": "pending",
+            })
+    return mappings
+
+
+def _persist_and_hash(src, dest_path: str) -> tuple[str, Optional[str], int]:
+    """
+    Copy upload to disk in chunks while hashing (blocking, run in a worker thread)
+
+    Args:
+        src: Binary file object of the received upload
+        dest_path: Destination file path
+
+    Returns:
+        tuple: (sha256_hex, blake3_hex or None, file_size)
+    """
+    hasher = hashlib.sha256()
+    hasher_b3 = blake3.blake3() if blake3 is not None else None
+    file_size = 0
+
+    with open(dest_path, "wb") as f:
+        while chunk := src.read(UPLOAD_CHUNK_SIZE):
+            hasher.update(chunk)
+            if hasher_b3 is not None:
+                hasher_b3.update(chunk)
+            f.write(chunk)
+            file_size += len(chunk)
+
+    return hasher.hexdigest(), (hasher_b3.hexdigest() if hasher_b3 is not None else None), file_size
+
+
+def sync_package_file_availability(db: Session) -> int:
+    """
+    Re-check package files on disk and fix FileAvailable flags
+
+    Called on application startup to catch files removed or restored out of band.
+
+    Args:
+        db: Database session
+
+    Returns:
+        int: Number of packages whose flag was changed
+    """
+    packages = db.execute(
+        select(AgentPackage.PackageId, AgentPackage.StoragePath, AgentPackage.FileAvailable)
+        .where(AgentPackage.IsActive == True)
+    ).all()
+
+    changed = 0
+    for package in packages:
+        available = bool(package.StoragePath) and os.path.exists(package.StoragePath)
+        if available != bool(package.FileAvailable):
+            db.execute(
+                update(AgentPackage)
+                .where(AgentPackage.PackageId == package.PackageId)
+                .values(FileAvailable=available)
+                .execution_options(synchronize_session=False)
+            )
+            changed += 1
+
+    db.commit()
+    return changed
 
 
 # ============================================================================
@@ -35,24 +184,58 @@ os.makedirs(PACKAGES_DIR, exist_ok=True)
 
 @router.get("/packages")
 async def list_packages(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(require_admin),
     active_only: bool = True
 ):
     """List all agent packages"""
-    query = db.query(AgentPackage)
+    # Cheap version marker: packages are only added (upload) or deactivated (delete)
+    marker_query = select(
+        func.max(AgentPackage.PackageId),
+        func.count(),
+        func.count().filter(AgentPackage.IsActive == True),
+    )
+    if active_only:
+        marker_query = marker_query.where(AgentPackage.IsActive == True)
+
+    max_id, total, active = (await db.execute(marker_query)).one()
+    etag = f'W/"{max_id or 0}-{total}-{active}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    # Projected columns only (no StoragePath/DownloadUrl, no ORM hydration)
+    query = select(
+        AgentPackage.PackageId,
+        AgentPackage.Version,
+        AgentPackage.FileName,
+        AgentPackage.FileSize,
+        AgentPackage.FileHash,
+        AgentPackage.FileHashBlake3,
+        AgentPackage.Platform,
+        AgentPackage.Architecture,
+        AgentPackage.Description,
+        AgentPackage.ReleaseNotes,
+        AgentPackage.IsActive,
+        AgentPackage.IsLatest,
+        AgentPackage.UploadedBy,
+        func.to_char(AgentPackage.UploadedAt, ISO_TIMESTAMP_FORMAT).label("UploadedAtIso"),
+    )
     if active_only:
-        query = query.filter(AgentPackage.IsActive == True)
+        query = query.where(AgentPackage.IsActive == True)
 
-    packages = query.order_by(AgentPackage.UploadedAt.desc()).all()
+    result = await db.execute(query.order_by(AgentPackage.UploadedAt.desc()))
+    packages = result.all()
 
-    return [
+    # ORJSONResponse directly: skips jsonable_encoder's per-value walk
+    return ORJSONResponse([
         {
             "package_id": p.PackageId,
             "version": p.Version,
             "file_name": p.FileName,
             "file_size": p.FileSize,
             "file_hash": p.FileHash,
+            "file_hash_blake3": p.FileHashBlake3,
             "platform": p.Platform,
             "architecture": p.Architecture,
             "description": p.Description,
@@ -60,11 +243,11 @@ async def list_packages(
             "is_active": p.IsActive,
             "is_latest": p.IsLatest,
             "uploaded_by": p.UploadedBy,
-            "uploaded_at": p.UploadedAt.isoformat() if p.UploadedAt else None,
+            "uploaded_at": p.UploadedAtIso,
             "download_url": f"/api/v1/deployment/packages/{p.PackageId}/download"
         }
         for p in packages
-    ]
+    ], headers={"ETag": etag})
 
 
 @router.post("/packages/upload")
@@ -85,75 +268,85 @@ async def upload_package(
         if not file.filename:
             raise HTTPException(status_code=400, detail="No file provided")
 
-        # Check if version already exists
-        existing = db.query(AgentPackage).filter(
-            AgentPackage.Version == version,
-            AgentPackage.Platform == platform,
-            AgentPackage.Architecture == architecture,
-            AgentPackage.IsActive == True
-        ).first()
-
-        if existing:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Package version {version} for {platform}/{architecture} already exists"
-            )
-
         # Create version directory
         version_dir = os.path.join(PACKAGES_DIR, version)
         os.makedirs(version_dir, exist_ok=True)
 
-        # Save file
+        # Stream file to a temporary name in chunks, hashing as we go (O(1 MiB) memory).
+        # It replaces the final path only after the row is inserted, so a duplicate
+        # upload never overwrites the file of the existing package.
         file_path = os.path.join(version_dir, file.filename)
-        file_content = await file.read()
-
-        with open(file_path, "wb") as f:
-            f.write(file_content)
-
-        # Calculate hash
-        file_hash = hashlib.sha256(file_content).hexdigest()
-
-        # Unset previous latest
-        if set_as_latest:
-            db.query(AgentPackage).filter(
-                AgentPackage.Platform == platform,
-                AgentPackage.Architecture == architecture,
-                AgentPackage.IsLatest == True
-            ).update({"IsLatest": False})
-
-        # Create package record
-        package = AgentPackage(
-            Version=version,
-            FileName=file.filename,
-            FileSize=len(file_content),
-            FileHash=file_hash,
-            Platform=platform,
-            Architecture=architecture,
-            Description=description,
-            ReleaseNotes=release_notes,
-            StoragePath=file_path,
-            IsActive=True,
-            IsLatest=set_as_latest,
-            UploadedBy=current_user.username
-        )
+        partial_path = f"{file_path}.{uuid.uuid4().hex}.part"
 
-        db.add(package)
-        db.commit()
-        db.refresh(package)
+        try:
+            # Write + hash in a worker thread; hashlib releases the GIL on large chunks
+            file_hash, file_hash_b3, file_size = await asyncio.to_thread(
+                _persist_and_hash, file.file, partial_path
+            )
+
+            # Unset previous latest
+            if set_as_latest:
+                db.execute(
+                    update(AgentPackage)
+                    .where(
+                        AgentPackage.Platform == platform,
+                        AgentPackage.Architecture == architecture,
+                        AgentPackage.IsLatest == True
+                    )
+                    .values(IsLatest=False)
+                    .execution_options(synchronize_session=False)
+                )
+
+            # Create package record; duplicates are rejected by idx_agent_packages_active_version
+            package_id = db.execute(
+                insert(AgentPackage)
+                .values(
+                    Version=version,
+                    FileName=file.filename,
+                    FileSize=file_size,
+                    FileHash=file_hash,
+                    FileHashBlake3=file_hash_b3,
+                    Platform=platform,
+                    Architecture=architecture,
+                    Description=description,
+                    ReleaseNotes=release_notes,
+                    StoragePath=file_path,
+                    FileAvailable=True,
+                    IsActive=True,
+                    IsLatest=set_as_latest,
+                    UploadedBy=current_user.username
+                )
+                .returning(AgentPackage.PackageId)
+            ).scalar_one()
+
+            os.replace(partial_path, file_path)
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(
+                status_code=400,
+                detail=f"Package version {version} for {platform}/{architecture} already exists"
+            )
+        finally:
+            # Do not leave a partial package on disk
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
 
         logger.info(f"Agent package {version} uploaded by {current_user.username}")
 
         return {
             "success": True,
-            "package_id": package.PackageId,
-            "version": package.Version,
-            "file_hash": package.FileHash,
+            "package_id": package_id,
+            "version": version,
+            "file_hash": file_hash,
+            "file_hash_blake3": file_hash_b3,
             "message": f"Package {version} uploaded successfully"
         }
 
     except HTTPException:
         raise
     except Exception as e:
+        db.rollback()
         logger.error(f"Error uploading package: {e}", exc_info=True)
         raise HTTPException(
             status_code=500,
@@ -164,6 +357,7 @@ async def upload_package(
 @router.get("/packages/{package_id}/download")
 async def download_package(
     package_id: int,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """Download agent package file"""
@@ -172,14 +366,30 @@ async def download_package(
     if not package:
         raise HTTPException(status_code=404, detail="Package not found")
 
-    if not package.StoragePath or not os.path.exists(package.StoragePath):
+    # Package content is immutable: its SHA-256 is a strong validator
+    cache_headers = {"Cache-Control": "public, max-age=86400"}
+    if package.FileHash:
+        etag = f'"{package.FileHash}"'
+        cache_headers["ETag"] = etag
+
+        # Repeated GPO polls from agents: answer 304 without touching the disk
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag in [t.strip().removeprefix("W/") for t in if_none_match.split(",")]:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+    # Availability is recorded on upload and re-checked at startup
+    if not package.StoragePath or not package.FileAvailable:
         raise HTTPException(status_code=404, detail="Package file not found")
 
-    return FileResponse(
+    response = FileResponse(
         path=package.StoragePath,
         filename=package.FileName,
-        media_type="application/octet-stream"
+        media_type="application/octet-stream",
+        headers=cache_headers
     )
+    # Larger reads than Starlette's 64 KiB default for multi-MB packages
+    response.chunk_size = UPLOAD_CHUNK_SIZE
+    return response
 
 
 @router.delete("/packages/{package_id}")
@@ -194,16 +404,18 @@ async def delete_package(
     if not package:
         raise HTTPException(status_code=404, detail="Package not found")
 
-    # Check if package is used in active deployments
-    active_deployments = db.query(AgentDeployment).filter(
-        AgentDeployment.PackageId == package_id,
-        AgentDeployment.Status == 'active'
-    ).count()
+    # Check if package is used in active deployments (EXISTS stops at the first row)
+    in_use = db.query(
+        db.query(AgentDeployment).filter(
+            AgentDeployment.PackageId == package_id,
+            AgentDeployment.Status == 'active'
+        ).exists()
+    ).scalar()
 
-    if active_deployments > 0:
+    if in_use:
         raise HTTPException(
             status_code=400,
-            detail=f"Cannot delete package: used in {active_deployments} active deployment(s)"
+            detail="Cannot delete package: currently in use by active deployment(s)"
         )
 
     package.IsActive = False
@@ -218,41 +430,22 @@ async def delete_package(
 
 @router.get("/deployments")
 async def list_deployments(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(require_admin),
     status_filter: Optional[str] = None
 ):
     """List all deployments"""
-    query = db.query(AgentDeployment)
+    query = select(*DEPLOYMENT_COLUMNS).join(
+        AgentPackage, AgentDeployment.PackageId == AgentPackage.PackageId, isouter=True
+    )
 
     if status_filter:
-        query = query.filter(AgentDeployment.Status == status_filter)
+        query = query.where(AgentDeployment.Status == status_filter)
 
-    deployments = query.order_by(AgentDeployment.CreatedAt.desc()).all()
+    result = await db.execute(query.order_by(AgentDeployment.CreatedAt.desc()))
+    deployments = result.all()
 
-    return [
-        {
-            "deployment_id": d.DeploymentId,
-            "name": d.Name,
-            "description": d.Description,
-            "package_id": d.PackageId,
-            "package_version": d.package.Version if d.package else None,
-            "deployment_mode": d.DeploymentMode,
-            "target_ou": d.TargetOU,
-            "server_url": d.ServerUrl,
-            "network_path": d.NetworkPath,
-            "enable_protection": d.EnableProtection,
-            "install_watchdog": d.InstallWatchdog,
-            "status": d.Status,
-            "created_by": d.CreatedBy,
-            "created_at": d.CreatedAt.isoformat() if d.CreatedAt else None,
-            "activated_at": d.ActivatedAt.isoformat() if d.ActivatedAt else None,
-            "total_targets": d.TotalTargets,
-            "deployed_count": d.DeployedCount,
-            "failed_count": d.FailedCount
-        }
-        for d in deployments
-    ]
+    return ORJSONResponse([_deployment_row_to_dict(d) for d in deployments])
 
 
 @router.post("/deployments")
@@ -285,23 +478,20 @@ async def create_deployment(
             CreatedBy=current_user.username
         )
 
-        db.add(deployment)
-        db.commit()
-        db.refresh(deployment)
-
         # Add target computers if provided
         target_computers = deployment_data.get("target_computers", [])
-        for computer in target_computers:
-            target = AgentDeploymentTarget(
-                DeploymentId=deployment.DeploymentId,
-                ComputerName=computer.get("name") or computer,
-                ComputerDN=computer.get("dn") if isinstance(computer, dict) else None,
-                IPAddress=computer.get("ip") if isinstance(computer, dict) else None,
-                Status="pending"
+        deployment.TotalTargets = len(target_computers)
+
+        # Flush to get DeploymentId, then insert all targets in one executemany
+        db.add(deployment)
+        db.flush()
+
+        if target_computers:
+            db.bulk_insert_mappings(
+                AgentDeploymentTarget,
+                _target_mappings(deployment.DeploymentId, target_computers)
             )
-            db.add(target)
 
-        deployment.TotalTargets = len(target_computers)
         db.commit()
 
         logger.info(f"Deployment '{deployment.Name}' created by {current_user.username}")
@@ -323,54 +513,53 @@ async def create_deployment(
 @router.get("/deployments/{deployment_id}")
 async def get_deployment(
     deployment_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(require_admin)
 ):
     """Get deployment details with targets"""
-    deployment = db.query(AgentDeployment).filter(
-        AgentDeployment.DeploymentId == deployment_id
-    ).first()
+    # Same projection (and timestamp formatting) as list_deployments
+    result = await db.execute(
+        select(*DEPLOYMENT_COLUMNS)
+        .join(AgentPackage, AgentDeployment.PackageId == AgentPackage.PackageId, isouter=True)
+        .where(AgentDeployment.DeploymentId == deployment_id)
+    )
+    deployment = result.first()
 
     if not deployment:
         raise HTTPException(status_code=404, detail="Deployment not found")
 
-    targets = db.query(AgentDeploymentTarget).filter(
-        AgentDeploymentTarget.DeploymentId == deployment_id
-    ).all()
+    # Targets as plain rows (no ORM objects / identity map for large target lists)
+    targets_result = await db.execute(
+        select(
+            AgentDeploymentTarget.TargetId,
+            AgentDeploymentTarget.ComputerName,
+            AgentDeploymentTarget.ComputerDN,
+            AgentDeploymentTarget.IPAddress,
+            AgentDeploymentTarget.Status,
+            func.to_char(AgentDeploymentTarget.DeployedAt, ISO_TIMESTAMP_FORMAT).label("DeployedAtIso"),
+            AgentDeploymentTarget.DeployedVersion,
+            AgentDeploymentTarget.ErrorMessage,
+        )
+        .where(AgentDeploymentTarget.DeploymentId == deployment_id)
+        .order_by(AgentDeploymentTarget.TargetId)
+    )
+    targets = targets_result.all()
 
-    return {
-        "deployment_id": deployment.DeploymentId,
-        "name": deployment.Name,
-        "description": deployment.Description,
-        "package_id": deployment.PackageId,
-        "package_version": deployment.package.Version if deployment.package else None,
-        "deployment_mode": deployment.DeploymentMode,
-        "target_ou": deployment.TargetOU,
-        "server_url": deployment.ServerUrl,
-        "network_path": deployment.NetworkPath,
-        "enable_protection": deployment.EnableProtection,
-        "install_watchdog": deployment.InstallWatchdog,
-        "status": deployment.Status,
-        "created_by": deployment.CreatedBy,
-        "created_at": deployment.CreatedAt.isoformat() if deployment.CreatedAt else None,
-        "activated_at": deployment.ActivatedAt.isoformat() if deployment.ActivatedAt else None,
-        "total_targets": deployment.TotalTargets,
-        "deployed_count": deployment.DeployedCount,
-        "failed_count": deployment.FailedCount,
-        "targets": [
-            {
-                "target_id": t.TargetId,
-                "computer_name": t.ComputerName,
-                "computer_dn": t.ComputerDN,
-                "ip_address": t.IPAddress,
-                "status": t.Status,
-                "deployed_at": t.DeployedAt.isoformat() if t.DeployedAt else None,
-                "deployed_version": t.DeployedVersion,
-                "error_message": t.ErrorMessage
-            }
-            for t in targets
-        ]
-    }
+    response = _deployment_row_to_dict(deployment)
+    response["targets"] = [
+        {
+            "target_id": t.TargetId,
+            "computer_name": t.ComputerName,
+            "computer_dn": t.ComputerDN,
+            "ip_address": t.IPAddress,
+            "status": t.Status,
+            "deployed_at": t.DeployedAtIso,
+            "deployed_version": t.DeployedVersion,
+            "error_message": t.ErrorMessage
+        }
+        for t in targets
+    ]
+    return ORJSONResponse(response)
 
 
 @router.put("/deployments/{deployment_id}/targets")
@@ -391,22 +580,18 @@ async def update_deployment_targets(
     if deployment.Status == "active":
         raise HTTPException(status_code=400, detail="Cannot modify active deployment targets")
 
-    # Remove existing targets
+    # Remove existing targets (single DELETE, no identity map sync)
     db.query(AgentDeploymentTarget).filter(
         AgentDeploymentTarget.DeploymentId == deployment_id
-    ).delete()
+    ).delete(synchronize_session=False)
 
     # Add new targets
     target_computers = targets_data.get("computers", [])
-    for computer in target_computers:
-        target = AgentDeploymentTarget(
-            DeploymentId=deployment_id,
-            ComputerName=computer.get("name") if isinstance(computer, dict) else computer,
-            ComputerDN=computer.get("dn") if isinstance(computer, dict) else None,
-            IPAddress=computer.get("ip") if isinstance(computer, dict) else None,
-            Status="pending"
+    if target_computers:
+        db.bulk_insert_mappings(
+            AgentDeploymentTarget,
+            _target_mappings(deployment_id, target_computers)
         )
-        db.add(target)
 
     deployment.TotalTargets = len(target_computers)
     deployment.DeploymentMode = targets_data.get("mode", "selected")
@@ -488,19 +673,22 @@ async def delete_deployment(
     current_user: CurrentUser = Depends(require_admin)
 ):
     """Delete a deployment"""
-    deployment = db.query(AgentDeployment).filter(
-        AgentDeployment.DeploymentId == deployment_id
+    # Delete targets first; both DELETEs run in one transaction without loading rows
+    db.query(AgentDeploymentTarget).filter(
+        AgentDeploymentTarget.DeploymentId == deployment_id
+    ).delete(synchronize_session=False)
+
+    deleted = db.execute(
+        delete(AgentDeployment)
+        .where(AgentDeployment.DeploymentId == deployment_id)
+        .returning(AgentDeployment.DeploymentId)
+        .execution_options(synchronize_session=False)
     ).first()
 
-    if not deployment:
+    if not deleted:
+        db.rollback()
         raise HTTPException(status_code=404, detail="Deployment not found")
 
-    # Delete targets first
-    db.query(AgentDeploymentTarget).filter(
-        AgentDeploymentTarget.DeploymentId == deployment_id
-    ).delete()
-
-    db.delete(deployment)
     db.commit()
 
     return {"success": True, "message": "Deployment deleted"}
@@ -514,18 +702,53 @@ def generate_deployment_script(deployment: AgentDeployment, db: Session) -> str:
     """Generate PowerShell deployment script for GPO"""
 
     # Get target computers filter if in selected mode
-    target_filter = ""
+    target_names = ()
     if deployment.DeploymentMode == "selected":
-        targets = db.query(AgentDeploymentTarget).filter(
-            AgentDeploymentTarget.DeploymentId == deployment.DeploymentId
-        ).all()
+        # Uppercased by the database, ready to embed in the script
+        target_names = tuple(db.execute(
+            select(func.upper(AgentDeploymentTarget.ComputerName))
+            .where(AgentDeploymentTarget.DeploymentId == deployment.DeploymentId)
+            .order_by(AgentDeploymentTarget.TargetId)
+        ).scalars())
+
+    return _build_deployment_script(
+        deployment.DeploymentId,
+        deployment.Name,
+        deployment.package.Version,
+        deployment.DeploymentMode,
+        deployment.NetworkPath,
+        deployment.ServerUrl,
+        deployment.EnableProtection,
+        deployment.InstallWatchdog,
+        target_names,
+    )
+
 
-        if targets:
-            computer_names = [t.ComputerName.upper() for t in targets]
-            target_filter = f"""
+@lru_cache(maxsize=256)
+def _build_deployment_script(
+    deployment_id: int,
+    name: str,
+    version: str,
+    mode: str,
+    network_path: str,
+    server_url: str,
+    enable_protection: bool,
+    install_watchdog: bool,
+    target_names: tuple,
+) -> str:
+    """
+    Render deployment script (memoized)
+
+    Every input is part of the cache key, so changing targets or settings
+    renders a new script. "Generated" is the time of the first render.
+    """
+    target_filter = ""
+    if target_names:
+        target_list = "\n".join(f'    "{computer}"' for computer in target_names)
+        target_filter = f"""
 # Список целевых компьютеров
 $TargetComputers = @(
-    {chr(10).join([f'    "{name}"' for name in computer_names])}
+{target_list}
 )
 
 # Проверка, входит ли текущий компьютер в список целевых
@@ -538,26 +761,26 @@ if ($env:COMPUTERNAME.ToUpper() -notin $TargetComputers) {{
     script = f'''<#
 .SYNOPSIS
     SIEM Agent Deployment Script (Auto-generated)
-    Deployment: {deployment.Name}
-    Version: {deployment.package.Version}
+    Deployment: {name}
+    Version: {version}
     Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
 .DESCRIPTION
     Этот скрипт автоматически сгенерирован системой развертывания SIEM.
-    Режим развертывания: {deployment.DeploymentMode}
-    Защита агента: {"Включена" if deployment.EnableProtection else "Отключена"}
-    Watchdog: {"Включен" if deployment.InstallWatchdog else "Отключен"}
+    Режим развертывания: {mode}
+    Защита агента: {"Включена" if enable_protection else "Отключена"}
+    Watchdog: {"Включен" if install_watchdog else "Отключен"}
 #>
 
 param(
-    [string]$AgentPath = "{deployment.NetworkPath}",
-    [string]$ServerUrl = "{deployment.ServerUrl}",
+    [string]$AgentPath = "{network_path}",
+    [string]$ServerUrl = "{server_url}",
     [string]$InstallDir = "C:\\Program Files\\SIEM Agent",
-    [bool]$EnableProtection = ${str(deployment.EnableProtection).lower()},
-    [bool]$InstallWatchdog = ${str(deployment.InstallWatchdog).lower()}
+    [bool]$EnableProtection = ${str(enable_protection).lower()},
+    [bool]$InstallWatchdog = ${str(install_watchdog).lower()}
 )
 
-$LogPath = "C:\\Windows\\Temp\\SIEMAgent_Deploy_{deployment.DeploymentId}.log"
+$LogPath = "C:\\Windows\\Temp\\SIEMAgent_Deploy_{deployment_id}.log"
 
 function Write-Log {{
     param([string]$Message, [string]$Level = "INFO")
@@ -569,8 +792,8 @@ function Write-Log {{
 
 Write-Log "=========================================="
 Write-Log "SIEM Agent Deployment Script"
-Write-Log "Deployment ID: {deployment.DeploymentId}"
-Write-Log "Target Version: {deployment.package.Version}"
+Write-Log "Deployment ID: {deployment_id}"
+Write-Log "Target Version: {version}"
 Write-Log "Computer: $env:COMPUTERNAME"
 Write-Log "=========================================="
 {target_filter}
@@ -632,7 +855,7 @@ async def get_deployment_script(
 @router.post("/report-status")
 async def report_deployment_status(
     status_data: dict,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Report deployment status from agent (no auth required)"""
     try:
@@ -645,33 +868,45 @@ async def report_deployment_status(
         if not deployment_id or not computer_name:
             raise HTTPException(status_code=400, detail="Missing required fields")
 
-        # Find target
-        target = db.query(AgentDeploymentTarget).filter(
-            AgentDeploymentTarget.DeploymentId == deployment_id,
-            AgentDeploymentTarget.ComputerName == computer_name.upper()
-        ).first()
-
-        if target:
-            target.Status = status
-            target.DeployedAt = datetime.utcnow()
-            target.DeployedVersion = version
-            target.ErrorMessage = error_message
+        # Update target in place (idx_agent_deployment_targets_lookup)
+        result = await db.execute(
+            update(AgentDeploymentTarget)
+            .where(
+                AgentDeploymentTarget.DeploymentId == deployment_id,
+                AgentDeploymentTarget.ComputerName == computer_name.upper()
+            )
+            .values(
+                Status=status,
+                DeployedAt=datetime.utcnow(),
+                DeployedVersion=version,
+                ErrorMessage=error_message
+            )
+            .returning(AgentDeploymentTarget.TargetId)
+            .execution_options(synchronize_session=False)
+        )
 
-            # Update deployment counters
-            deployment = db.query(AgentDeployment).filter(
-                AgentDeployment.DeploymentId == deployment_id
-            ).first()
+        if result.first() is not None:
+            # Update deployment counters atomically in SQL
+            counter_column = {
+                "success": AgentDeployment.DeployedCount,
+                "failed": AgentDeployment.FailedCount,
+            }.get(status)
 
-            if deployment:
-                if status == "success":
-                    deployment.DeployedCount = (deployment.DeployedCount or 0) + 1
-                elif status == "failed":
-                    deployment.FailedCount = (deployment.FailedCount or 0) + 1
+            if counter_column is not None:
+                await db.execute(
+                    update(AgentDeployment)
+                    .where(AgentDeployment.DeploymentId == deployment_id)
+                    .values({counter_column: func.coalesce(counter_column, 0) + 1})
+                    .execution_options(synchronize_session=False)
+                )
 
-            db.commit()
+            await db.commit()
 
         return {"success": True}
 
+    except HTTPException:
+        raise
     except Exception as e:
+        await db.rollback()
         logger.error(f"Error reporting deployment status: {e}")
         raise HTTPException(status_code=500, detail=str(e))
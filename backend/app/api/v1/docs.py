@@ -3,15 +3,113 @@ Documentation API Endpoints
 Serves markdown documentation files from docs/ folder
 """
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.responses import FileResponse
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 DOCS_DIR = Path(__file__).parent.parent.parent.parent.parent / "docs"
+DOCS_DIR_RESOLVED = DOCS_DIR.resolve()
+
+# Plain ASCII names only: no separators, dots or unicode lookalikes
+_SAFE_DOC_RE = re.compile(r'[A-Za-z0-9_\-]{1,128}\.md')
+
+
+def _get_doc_path(filename: str) -> Path:
+    """Validate documentation filename and return existing file path"""
+    # Security: only allow .md files and no path traversal
+    if not _SAFE_DOC_RE.fullmatch(filename):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid filename. Only .md files are allowed."
+        )
+
+    # Defense in depth (e.g. symlinks pointing outside docs/)
+    doc_path = (DOCS_DIR / filename).resolve()
+    if not doc_path.is_relative_to(DOCS_DIR_RESOLVED):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid filename. Only .md files are allowed."
+        )
+
+    if not doc_path.exists():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Documentation file '{filename}' not found"
+        )
+
+    return doc_path
+
+
+# File reads are memoized by (path, mtime_ns): an edited file gets a new key
+@lru_cache(maxsize=256)
+def _read_doc_title(path: str, mtime_ns: int) -> str:
+    """Read first line of markdown file as title"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            first_line = f.readline().strip()
+            # Remove markdown heading symbols
+            return first_line.lstrip('#').strip()
+    except Exception:
+        return Path(path).stem.replace('_', ' ').title()
+
+
+@lru_cache(maxsize=64)
+def _read_doc_content(path: str, mtime_ns: int) -> str:
+    """Read full markdown file content"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+# Listing is built at startup and rebuilt only when the set of
+# (filename, mtime) pairs changes: a file added, removed or edited in place
+_docs_index: list = []
+_docs_index_signature: Optional[tuple] = None
+
+
+def _docs_signature() -> tuple:
+    """Sorted (filename, mtime_ns) pairs of the markdown files in docs/"""
+    return tuple(sorted(
+        (doc_file.name, doc_file.stat().st_mtime_ns) for doc_file in DOCS_DIR.glob("*.md")
+    ))
+
+
+def build_docs_index(signature: Optional[tuple] = None) -> list:
+    """
+    Scan docs/ and rebuild documentation listing
+
+    Args:
+        signature: Precomputed _docs_signature() (scanned when omitted)
+
+    Returns:
+        list: Sorted documentation entries (filename, title, path)
+    """
+    global _docs_index, _docs_index_signature
+
+    if signature is None:
+        signature = _docs_signature()
+
+    docs = []
+    for filename, mtime_ns in signature:
+        # First line as title
+        title = _read_doc_title(str(DOCS_DIR / filename), mtime_ns)
+
+        docs.append({
+            "filename": filename,
+            "title": title,
+            "path": f"/api/v1/docs/{filename}"
+        })
+
+    _docs_index = docs
+    _docs_index_signature = signature
+    return docs
 
 
 @router.get("/list")
@@ -20,31 +118,14 @@ async def list_documentation():
     List all available documentation files
     """
     try:
-        if not DOCS_DIR.exists():
+        if not DOCS_DIR.is_dir():
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Documentation directory not found"
             )
 
-        docs = []
-        for doc_file in DOCS_DIR.glob("*.md"):
-            # Read first line as title
-            try:
-                with open(doc_file, 'r', encoding='utf-8') as f:
-                    first_line = f.readline().strip()
-                    # Remove markdown heading symbols
-                    title = first_line.lstrip('#').strip()
-            except:
-                title = doc_file.stem.replace('_', ' ').title()
-
-            docs.append({
-                "filename": doc_file.name,
-                "title": title,
-                "path": f"/api/v1/docs/{doc_file.name}"
-            })
-
-        # Sort by filename
-        docs.sort(key=lambda x: x['filename'])
+        signature = _docs_signature()
+        docs = _docs_index if signature == _docs_index_signature else build_docs_index(signature)
 
         return {
             "docs": docs,
@@ -62,7 +143,7 @@ async def list_documentation():
 
 
 @router.get("/{filename}")
-async def get_documentation(filename: str):
+async def get_documentation(filename: str, request: Request, response: Response):
     """
     Get documentation file content by filename
 
@@ -72,29 +153,20 @@ async def get_documentation(filename: str):
     - /api/v1/docs/FREESCOUT_INTEGRATION.md
     """
     try:
-        # Security: only allow .md files and no path traversal
-        if not filename.endswith('.md') or '/' in filename or '\\' in filename or '..' in filename:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid filename. Only .md files are allowed."
-            )
-
-        doc_path = DOCS_DIR / filename
-
-        if not doc_path.exists():
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Documentation file '{filename}' not found"
-            )
+        doc_path = _get_doc_path(filename)
+        doc_stat = doc_path.stat()
+        mtime_ns = doc_stat.st_mtime_ns
+        etag = f'W/"{mtime_ns}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
 
-        # Read file content
-        with open(doc_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = _read_doc_content(str(doc_path), mtime_ns)
+        response.headers["ETag"] = etag
 
         return {
             "filename": filename,
             "content": content,
-            "size": len(content)
+            "size": doc_stat.st_size
         }
 
     except HTTPException:
@@ -105,3 +177,23 @@ async def get_documentation(filename: str):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to read documentation: {str(e)}"
         )
+
+
+@router.get("/{filename}/raw")
+async def get_documentation_raw(filename: str):
+    """
+    Get documentation file as raw markdown (sent from disk, no JSON envelope)
+
+    Example:
+    - /api/v1/docs/QUICK_INSTALL.md/raw
+    """
+    doc_path = _get_doc_path(filename)
+
+    return FileResponse(
+        path=doc_path,
+        media_type="text/markdown; charset=utf-8",
+        filename=filename,
+        content_disposition_type="inline",
+        # FileResponse adds ETag/Last-Modified from the file stat itself
+        headers={"Cache-Control": "public, max-age=60"}
+    )
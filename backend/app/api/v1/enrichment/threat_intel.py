@@ -5,13 +5,16 @@ Manual lookups and enrichment
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Any, Callable, Optional
+import asyncio
 import logging
 from pydantic import BaseModel, Field
 
 from app.api.deps import get_db, get_current_user, require_analyst
 from app.schemas.auth import CurrentUser
-from app.api.v1.settings import get_setting
+from app.api.v1.settings import get_setting_cached
+from app.core.cache import cache_get_json, cache_set_json
+from app.config import settings
 from app.services.threat_intelligence import get_threat_intel_service
 from app.services.geoip_service import get_geoip_service
 
@@ -51,6 +54,58 @@ class HashLookupResponse(BaseModel):
     sources: dict
 
 
+# ============================================================================
+# LOOKUP CACHE
+# ============================================================================
+
+TI_IP_CACHE_PREFIX = "ti:ip:"
+TI_HASH_CACHE_PREFIX = "ti:hash:"
+GEOIP_CACHE_PREFIX = "geo:ip:"
+
+
+async def _cached_lookup(
+    key: str,
+    ttl: int,
+    lookup: Callable[..., Any],
+    *args,
+    cacheable: Callable[[Any], bool] = lambda value: value is not None
+) -> Any:
+    """
+    Run blocking lookup in a worker thread, memoized in Redis
+
+    Args:
+        key: Cache key
+        ttl: Time to live in seconds
+        lookup: Blocking lookup function
+        cacheable: Predicate deciding whether the result may be stored
+
+    Returns:
+        Cached or fresh lookup result
+    """
+    cached = await cache_get_json(key)
+    if cached is not None:
+        return cached
+
+    value = await asyncio.to_thread(lookup, *args)
+    if cacheable(value):
+        await cache_set_json(key, value, ttl)
+    return value
+
+
+def _ti_ip_cache_key(ip: str, virustotal: bool, abuseipdb: bool) -> str:
+    """
+    IP verdict cache key, scoped to the configured sources so adding or
+    removing an API key does not keep serving verdicts from the old set
+    """
+    sources = "+".join(name for name, enabled in (("vt", virustotal), ("abuseipdb", abuseipdb)) if enabled)
+    return f"{TI_IP_CACHE_PREFIX}{sources}:{ip}"
+
+
+def _all_sources_answered(expected: int) -> Callable[[dict], bool]:
+    """Only cache verdicts where every configured source responded"""
+    return lambda result: len(result['sources']) >= expected
+
+
 # ============================================================================
 # ENDPOINTS
 # ============================================================================
@@ -67,7 +122,7 @@ async def lookup_ip_address(
     """
     try:
         # Check if threat intel is enabled
-        threat_intel_enabled = get_setting(db, 'threat_intel_enabled', False)
+        threat_intel_enabled = get_setting_cached(db, 'threat_intel_enabled', False)
         if not threat_intel_enabled:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -75,8 +130,8 @@ async def lookup_ip_address(
             )
 
         # Get API keys
-        virustotal_api_key = get_setting(db, 'virustotal_api_key')
-        abuseipdb_api_key = get_setting(db, 'abuseipdb_api_key')
+        virustotal_api_key = get_setting_cached(db, 'virustotal_api_key')
+        abuseipdb_api_key = get_setting_cached(db, 'abuseipdb_api_key')
 
         if not virustotal_api_key and not abuseipdb_api_key:
             raise HTTPException(
@@ -90,17 +145,29 @@ async def lookup_ip_address(
             abuseipdb_api_key=abuseipdb_api_key
         )
 
-        # Lookup IP
-        result = threat_intel.check_ip(request.ip_address, db)
-
-        # Add GeoIP information
+        # Threat intel (HTTP) and GeoIP (mmdb) are independent: run both
+        # in worker threads concurrently, latency = max instead of sum.
+        # Results are cached in Redis so repeat lookups skip API quota.
+        ip = request.ip_address
+        ti_lookup = _cached_lookup(
+            _ti_ip_cache_key(ip, bool(virustotal_api_key), bool(abuseipdb_api_key)),
+            settings.threat_intel_ip_cache_ttl,
+            threat_intel.check_ip, ip, db,
+            cacheable=_all_sources_answered(bool(virustotal_api_key) + bool(abuseipdb_api_key))
+        )
         geoip_service = get_geoip_service()
         if geoip_service.is_available():
-            geoip_data = geoip_service.lookup_ip(request.ip_address)
+            result, geoip_data = await asyncio.gather(
+                ti_lookup,
+                _cached_lookup(f"{GEOIP_CACHE_PREFIX}{ip}", settings.geoip_cache_ttl, geoip_service.lookup_ip, ip),
+            )
             result['geoip'] = geoip_data
+        else:
+            result = await ti_lookup
 
-        logger.info(f"Threat intel lookup for IP {request.ip_address} by {current_user.username}: "
-                   f"Malicious={result['is_malicious']}, Score={result['max_threat_score']}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Threat intel lookup for IP {request.ip_address} by {current_user.username}: "
+                       f"Malicious={result['is_malicious']}, Score={result['max_threat_score']}")
 
         return IPLookupResponse(**result)
 
@@ -126,7 +193,7 @@ async def lookup_file_hash(
     """
     try:
         # Check if threat intel is enabled
-        threat_intel_enabled = get_setting(db, 'threat_intel_enabled', False)
+        threat_intel_enabled = get_setting_cached(db, 'threat_intel_enabled', False)
         if not threat_intel_enabled:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -134,7 +201,7 @@ async def lookup_file_hash(
             )
 
         # Get VirusTotal API key (primary source for file hashes)
-        virustotal_api_key = get_setting(db, 'virustotal_api_key')
+        virustotal_api_key = get_setting_cached(db, 'virustotal_api_key')
         if not virustotal_api_key:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -146,8 +213,12 @@ async def lookup_file_hash(
             virustotal_api_key=virustotal_api_key
         )
 
-        # Lookup hash
-        result = threat_intel.check_file_hash(request.file_hash, db)
+        # Lookup hash (file hashes are immutable, so verdicts are cached longer)
+        result = await _cached_lookup(
+            f"{TI_HASH_CACHE_PREFIX}{request.file_hash.lower()}", settings.threat_intel_hash_cache_ttl,
+            threat_intel.check_file_hash, request.file_hash, db,
+            cacheable=_all_sources_answered(1)
+        )
 
         logger.info(f"Threat intel lookup for hash {request.file_hash[:16]}... by {current_user.username}: "
                    f"Malicious={result['is_malicious']}, Score={result['max_threat_score']}")
@@ -182,7 +253,10 @@ async def lookup_geoip(
                 detail="GeoIP service is not available. GeoLite2 database not found."
             )
 
-        result = geoip_service.lookup_ip(ip_address)
+        result = await _cached_lookup(
+            f"{GEOIP_CACHE_PREFIX}{ip_address}", settings.geoip_cache_ttl,
+            geoip_service.lookup_ip, ip_address
+        )
 
         if not result:
             raise HTTPException(
@@ -213,9 +287,9 @@ async def get_enrichment_status(
     """
     Get status of enrichment services
     """
-    threat_intel_enabled = get_setting(db, 'threat_intel_enabled', False)
-    virustotal_api_key = get_setting(db, 'virustotal_api_key')
-    abuseipdb_api_key = get_setting(db, 'abuseipdb_api_key')
+    threat_intel_enabled = get_setting_cached(db, 'threat_intel_enabled', False)
+    virustotal_api_key = get_setting_cached(db, 'virustotal_api_key')
+    abuseipdb_api_key = get_setting_cached(db, 'abuseipdb_api_key')
 
     geoip_service = get_geoip_service()
 
@@ -4,15 +4,22 @@ Handles event ingestion, retrieval, and statistics
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, text
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy import Float, cast, func, and_, text, select, tuple_, union, literal_column
 from typing import List, Optional
 from datetime import datetime, timedelta
-import json
 import logging
+import orjson
+import re
 
-from app.api.deps import get_db, get_current_user, require_analyst, require_admin, PaginationParams
+from app.api.deps import (
+    get_async_db, get_current_user, require_analyst, require_admin, PaginationParams,
+    encode_event_cursor, decode_event_cursor
+)
 from app.schemas.event import (
+    to_naive_utc,
     EventCreate,
     EventBatchCreate,
     EventFilter,
@@ -24,22 +31,84 @@ from app.schemas.event import (
 )
 from app.schemas.auth import CurrentUser
 from app.models.event import Event
-from app.models.agent import Agent
 from app.config import settings
+from app.database import AsyncSessionLocal
+from app.core.cache import cache_incr
+from app.api.v1.fim import FIM_EVENT_CODES, FIM_EVENTS_CACHE_GEN_KEY
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+# List endpoints query the Core table (no ORM compile step, identity map or
+# per-row instrumentation) and emit plain rows
+events_table = Event.__table__
+
+# Columns of EventResponse, selected directly so list endpoints can emit rows
+# without loading ORM entities or validating each one through pydantic.
+# Numeric AI score is cast to float (orjson does not serialize Decimal).
+EVENT_RESPONSE_FIELDS = tuple(EventResponse.model_fields)
+EVENT_RESPONSE_COLUMNS = tuple(
+    cast(events_table.c.ai_score, Float).label("ai_score") if name == "ai_score" else events_table.c[name]
+    for name in EVENT_RESPONSE_FIELDS
+)
+
+
+def _event_rows_to_dicts(rows) -> list[dict]:
+    """Map projected EventResponse rows to dicts (extra trailing columns are ignored)"""
+    return [dict(zip(EVENT_RESPONSE_FIELDS, row)) for row in rows]
+
+
+# Same expression as idx_events_message_fts (migration 012)
+# Literals are inlined (not bound) so the planner can match the index expression
+EVENT_MESSAGE_TSVECTOR = func.to_tsvector(
+    literal_column("'simple'"), func.coalesce(events_table.c.message, literal_column("''"))
+)
+
+
+def _message_search_clause(search_text: str):
+    """
+    Full-text predicate for search_text: every word must appear as a word
+    prefix in the message ("fail logon" matches "Failed logon attempt").
+    Falls back to ILIKE when the text has no word characters.
+    """
+    words = re.findall(r"\w+", search_text)
+    if not words:
+        return events_table.c.message.ilike(f"%{search_text}%")
+    tsquery = " & ".join(f"{word}:*" for word in words)
+    return EVENT_MESSAGE_TSVECTOR.op("@@")(func.to_tsquery(literal_column("'simple'"), tsquery))
+
+
 # ============================================================================
 # EVENT INGESTION
 # ============================================================================
 
+# Batch agent IDs not registered in assets.agents
+MISSING_AGENTS_SQL = text("""
+    SELECT ids.agent_id
+    FROM unnest(CAST(:agent_ids AS uuid[])) AS ids(agent_id)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM assets.agents a WHERE a.agent_id = ids.agent_id
+    )
+""")
+
+# CAST() instead of "::jsonb" - a cast right after a bind name is not parsed as a parameter
+EVENT_INSERT_SQL = text("""
+    INSERT INTO security_events.events
+    (agent_id, event_time, event_code, provider, source_type, category,
+     severity, message, subject_user, target_user, source_ip, destination_ip,
+     process_name, process_id, file_path, registry_key, raw_event)
+    VALUES
+    (:agent_id, :event_time, :event_code, :provider, :source_type, :category,
+     :severity, :message, :subject_user, :target_user, :source_ip, :destination_ip,
+     :process_name, :process_id, :file_path, :registry_key, CAST(:raw_event AS jsonb))
+""")
+
 @router.post("/batch", status_code=status.HTTP_201_CREATED)
 async def create_events_batch(
     batch: EventBatchCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(get_current_user)
 ):
     """
@@ -47,55 +116,52 @@ async def create_events_batch(
     Maximum 1000 events per batch
     """
     try:
-        # Validate all agents exist (PostgreSQL snake_case)
-        agent_ids = {str(event.agent_id) for event in batch.events}
-        agents = db.query(Agent).filter(Agent.agent_id.in_(agent_ids)).all()
-        existing_agent_ids = {str(agent.agent_id) for agent in agents}
-
-        missing_agents = agent_ids - existing_agent_ids
+        # Validate all agents exist: the anti-join returns only unknown IDs
+        agent_ids = list({event.agent_id for event in batch.events})
+        result = await db.execute(MISSING_AGENTS_SQL, {"agent_ids": agent_ids})
+        missing_agents = [str(agent_id) for agent_id in result.scalars()]
         if missing_agents:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Unknown agents: {', '.join(missing_agents)}"
             )
 
-        # Insert events using PostgreSQL batch insert
-        for event in batch.events:
-            db.execute(
-                text("""
-                    INSERT INTO security_events.events
-                    (agent_id, event_time, event_code, provider, source_type, category,
-                     severity, message, subject_user, target_user, source_ip, destination_ip,
-                     process_name, process_id, file_path, registry_key, event_data, raw_xml)
-                    VALUES
-                    (:agent_id, :event_time, :event_code, :provider, :source_type, :category,
-                     :severity, :message, :subject_user, :target_user, :source_ip, :destination_ip,
-                     :process_name, :process_id, :file_path, :registry_key, :event_data::jsonb, :raw_xml)
-                """),
-                {
-                    "agent_id": str(event.agent_id),
-                    "event_time": event.event_time or datetime.utcnow(),
-                    "event_code": event.event_code,
-                    "provider": event.provider,
-                    "source_type": event.source_type,
-                    "category": event.category,
-                    "severity": event.severity or 0,
-                    "message": event.message,
-                    "subject_user": event.subject_user,
-                    "target_user": event.target_user,
-                    "source_ip": event.source_ip,
-                    "destination_ip": event.destination_ip,
-                    "process_name": event.process_name,
-                    "process_id": event.process_id,
-                    "file_path": event.file_path,
-                    "registry_key": event.registry_key,
-                    "event_data": json.dumps(event.event_data) if event.event_data else None,
-                    "raw_xml": event.raw_xml
-                }
-            )
-        db.commit()
-
-        logger.info(f"Inserted {len(batch.events)} events from {len(agent_ids)} agents")
+        # Parameters are built straight from the validated models; raw_event is
+        # serialized once with orjson and the whole batch goes in one executemany
+        params = [
+            {
+                "agent_id": str(event.agent_id),
+                "event_time": event.event_time or datetime.utcnow(),
+                "event_code": event.event_code,
+                "provider": event.provider,
+                "source_type": event.source_type,
+                "category": event.category,
+                "severity": event.severity or 0,
+                "message": event.message,
+                "subject_user": event.subject_user,
+                "target_user": event.target_user,
+                "source_ip": event.source_ip,
+                "destination_ip": event.destination_ip,
+                "process_name": event.process_name,
+                "process_id": event.process_id,
+                "file_path": event.file_path,
+                "registry_key": event.registry_key,
+                "raw_event": orjson.dumps(event.raw_event).decode() if event.raw_event else None,
+            }
+            for event in batch.events
+        ]
+        await db.execute(EVENT_INSERT_SQL, params)
+        await db.commit()
+
+        # New FIM events retire the cached /fim/events pages
+        if any(
+            event.source_type == "Sysmon" and event.event_code in FIM_EVENT_CODES
+            for event in batch.events
+        ):
+            await cache_incr(FIM_EVENTS_CACHE_GEN_KEY)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Inserted {len(batch.events)} events from {len(agent_ids)} agents")
 
         return {
             "success": True,
@@ -106,7 +172,7 @@ async def create_events_batch(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error inserting events batch: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -151,85 +217,128 @@ async def get_events(
     # Pagination
     limit: int = Query(100, ge=1, le=settings.max_events_per_query),
     offset: int = Query(0, ge=0),
+    after: Optional[str] = Query(None, description="Keyset cursor (next_cursor of previous page); replaces offset"),
 
     # Dependencies
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Search and filter events with pagination
-    Returns events list and total count
+    Returns events list and total count (total is omitted in cursor mode)
     """
     try:
         # Build query
-        query = db.query(Event)
+        query = select(*EVENT_RESPONSE_COLUMNS)
 
         # Time filters
         if last_hours:
             start_time = datetime.utcnow() - timedelta(hours=last_hours)
 
+        start_time, end_time = to_naive_utc(start_time), to_naive_utc(end_time)
         if start_time:
-            query = query.filter(Event.event_time >= start_time)
+            query = query.where(events_table.c.event_time >= start_time)
         if end_time:
-            query = query.filter(Event.event_time <= end_time)
+            query = query.where(events_table.c.event_time <= end_time)
 
         # Entity filters
         if agent_id:
-            query = query.filter(Event.agent_id == agent_id)
+            query = query.where(events_table.c.agent_id == agent_id)
         if min_severity is not None:
-            query = query.filter(Event.severity >= min_severity)
+            query = query.where(events_table.c.severity >= min_severity)
 
         if categories:
             cat_list = [c.strip() for c in categories.split(',')]
-            query = query.filter(Event.category.in_(cat_list))
+            query = query.where(events_table.c.category.in_(cat_list))
 
         if source_types:
             type_list = [t.strip() for t in source_types.split(',')]
-            query = query.filter(Event.source_type.in_(type_list))
+            query = query.where(events_table.c.source_type.in_(type_list))
 
         # User/Network filters
         if subject_user:
-            query = query.filter(Event.subject_user.ilike(f"%{subject_user}%"))
+            query = query.where(events_table.c.subject_user.ilike(f"%{subject_user}%"))
         if source_ip:
-            query = query.filter(Event.source_ip == source_ip)
+            query = query.where(events_table.c.source_ip == source_ip)
         if destination_ip:
-            query = query.filter(Event.destination_ip == destination_ip)
+            query = query.where(events_table.c.destination_ip == destination_ip)
         if process_name:
-            query = query.filter(Event.process_name.ilike(f"%{process_name}%"))
+            query = query.where(events_table.c.process_name.ilike(f"%{process_name}%"))
 
         # Search
         if search_text:
-            query = query.filter(Event.message.ilike(f"%{search_text}%"))
+            query = query.where(_message_search_clause(search_text))
 
         # MITRE ATT&CK
         if mitre_tactic:
-            query = query.filter(Event.mitre_attack_tactic == mitre_tactic)
+            query = query.where(events_table.c.mitre_attack_tactic == mitre_tactic)
         if mitre_technique:
-            query = query.filter(Event.mitre_attack_technique == mitre_technique)
+            query = query.where(events_table.c.mitre_attack_technique == mitre_technique)
 
         # AI Analysis
         if ai_processed is not None:
-            query = query.filter(Event.ai_processed == ai_processed)
+            query = query.where(events_table.c.ai_processed == ai_processed)
         if ai_is_attack is not None:
-            query = query.filter(Event.ai_is_attack == ai_is_attack)
-
-        # Get total count
-        total = query.count()
+            query = query.where(events_table.c.ai_is_attack == ai_is_attack)
 
-        # Apply pagination and ordering
-        events = query.order_by(Event.event_time.desc()).offset(offset).limit(limit).all()
+        order_by = (events_table.c.event_time.desc(), events_table.c.event_id.desc())
 
-        # Convert to response model
-        events_response = [EventResponse.from_orm(event) for event in events]
-
-        return {
-            "events": events_response,
+        if after:
+            # Keyset pagination: seek past the cursor, cost independent of page depth
+            cursor_time, cursor_id = decode_event_cursor(after)
+            result = await db.execute(
+                query.where(tuple_(events_table.c.event_time, events_table.c.event_id) < (cursor_time, cursor_id))
+                .order_by(*order_by)
+                .limit(limit + 1)
+            )
+            events = _event_rows_to_dicts(result.all())
+            has_more = len(events) > limit
+            events = events[:limit]
+            last = events[-1] if events else None
+
+            return ORJSONResponse({
+                "events": events,
+                "total": None,
+                "limit": limit,
+                "offset": None,
+                "has_more": has_more,
+                "next_cursor": encode_event_cursor(last["event_time"], last["event_id"]) if has_more else None
+            })
+
+        # Page and total count in one pass: COUNT(*) OVER () is evaluated over
+        # the filtered set before OFFSET/LIMIT are applied
+        result = await db.execute(
+            query.add_columns(func.count().over().label("total"))
+            .order_by(*order_by)
+            .offset(offset)
+            .limit(limit)
+        )
+        rows = result.all()
+        events = _event_rows_to_dicts(rows)
+
+        if rows:
+            total = rows[0].total
+        elif offset:
+            # Page past the end: no row to carry the window count
+            total = (await db.execute(
+                select(func.count()).select_from(query.subquery())
+            )).scalar_one()
+        else:
+            total = 0
+
+        has_more = (offset + limit) < total
+
+        return ORJSONResponse({
+            "events": events,
             "total": total,
             "limit": limit,
             "offset": offset,
-            "has_more": (offset + limit) < total
-        }
+            "has_more": has_more,
+            "next_cursor": encode_event_cursor(events[-1]["event_time"], events[-1]["event_id"]) if has_more and events else None
+        })
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving events: {e}", exc_info=True)
         raise HTTPException(
@@ -241,13 +350,13 @@ async def get_events(
 @router.get("/{event_id}", response_model=EventDetail)
 async def get_event_by_id(
     event_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Get detailed event information by ID
     """
-    event = db.query(Event).filter(Event.event_id == event_id).first()
+    event = await db.get(Event, event_id)
 
     if not event:
         raise HTTPException(
@@ -262,10 +371,143 @@ async def get_event_by_id(
 # EVENT STATISTICS
 # ============================================================================
 
+# All dashboard statistics in one statement returning one JSON document,
+# decoded with orjson straight into EventStatistics (one round-trip, no per-row
+# Python loops). Rendered twice: summed from the hourly rollup (migration 014,
+# hour granularity) and, as fallback when the rollup is not available, counted
+# from raw events. User / process tops are too high-cardinality for the rollup
+# and always come from raw events.
+STATS_JSON_SQL_TEMPLATE = """
+    SELECT json_build_object(
+        'total_events', t.total,
+        'critical_events', t.critical,
+        'high_events', t.high,
+        'medium_events', t.medium,
+        'low_events', t.low,
+        'events_by_severity', (
+            SELECT COALESCE(json_object_agg(name, count ORDER BY sev), '{{}}'::json)
+            FROM (
+                SELECT
+                    GREATEST(LEAST(COALESCE(severity, 0), 4), 0) as sev,
+                    (ARRAY['Info', 'Low', 'Medium', 'High', 'Critical'])[GREATEST(LEAST(COALESCE(severity, 0), 4), 0) + 1] as name,
+                    {count} as count
+                FROM {source}
+                WHERE {time_col} >= {start}
+                GROUP BY 1, 2
+            ) s
+        ),
+        'events_by_category', (
+            SELECT COALESCE(json_object_agg(cat, count ORDER BY count DESC), '{{}}'::json)
+            FROM (
+                SELECT COALESCE(category, 'Unknown') as cat, {count} as count
+                FROM {source}
+                WHERE {time_col} >= {start}
+                GROUP BY category
+                ORDER BY count DESC
+                LIMIT 10
+            ) c
+        ),
+        'events_by_source', (
+            SELECT COALESCE(json_object_agg(src, count ORDER BY count DESC), '{{}}'::json)
+            FROM (
+                SELECT COALESCE(source_type, 'Unknown') as src, {count} as count
+                FROM {source}
+                WHERE {time_col} >= {start}
+                GROUP BY source_type
+                ORDER BY count DESC
+                LIMIT 10
+            ) st
+        ),
+        'top_agents', (
+            SELECT COALESCE(json_agg(json_build_object(
+                'agent_id', agent_id, 'hostname', hostname, 'event_count', count
+            ) ORDER BY count DESC), '[]'::json)
+            FROM (
+                SELECT s.agent_id::text as agent_id, COALESCE(a.hostname, 'Unknown') as hostname, {count} as count
+                FROM {source} s
+                LEFT JOIN assets.agents a ON s.agent_id = a.agent_id
+                WHERE s.{time_col} >= {start} AND s.agent_id IS NOT NULL
+                GROUP BY s.agent_id, a.hostname
+                ORDER BY count DESC
+                LIMIT 10
+            ) ag
+        ),
+        'top_users', (
+            SELECT COALESCE(json_agg(json_build_object(
+                'username', subject_user, 'event_count', count
+            ) ORDER BY count DESC), '[]'::json)
+            FROM (
+                SELECT subject_user, COUNT(*) as count
+                FROM security_events.events
+                WHERE event_time >= :start_time AND subject_user IS NOT NULL AND subject_user != ''
+                GROUP BY subject_user
+                ORDER BY count DESC
+                LIMIT 10
+            ) u
+        ),
+        'top_processes', (
+            SELECT COALESCE(json_agg(json_build_object(
+                'process_name', process_name, 'event_count', count
+            ) ORDER BY count DESC), '[]'::json)
+            FROM (
+                SELECT process_name, COUNT(*) as count
+                FROM security_events.events
+                WHERE event_time >= :start_time AND process_name IS NOT NULL AND process_name != ''
+                GROUP BY process_name
+                ORDER BY count DESC
+                LIMIT 10
+            ) p
+        )
+    )::text
+    FROM (
+        SELECT
+            COALESCE({count}, 0) as total,
+            COALESCE({count} FILTER (WHERE severity = 4), 0) as critical,
+            COALESCE({count} FILTER (WHERE severity = 3), 0) as high,
+            COALESCE({count} FILTER (WHERE severity = 2), 0) as medium,
+            COALESCE({count} FILTER (WHERE severity <= 1), 0) as low
+        FROM {source}
+        WHERE {time_col} >= {start}
+    ) t
+"""
+
+STATS_ROLLUP_JSON_SQL = text(STATS_JSON_SQL_TEMPLATE.format(
+    source="security_events.event_stats_hourly",
+    count="SUM(event_count)",
+    time_col="hour_bucket",
+    start=":start_hour",
+))
+
+STATS_RAW_JSON_SQL = text(STATS_JSON_SQL_TEMPLATE.format(
+    source="security_events.events",
+    count="COUNT(*)",
+    time_col="event_time",
+    start=":start_time",
+))
+
+# date_trunc unit is rendered into the statement (one per interval), so the
+# SELECT and GROUP BY expressions are identical
+TIMELINE_SQL_TEMPLATE = """
+    SELECT
+        date_trunc('{unit}', event_time) as time_slot,
+        severity,
+        COUNT(*) as event_count
+    FROM security_events.events
+    WHERE event_time >= :start_time AND event_time <= :end_time
+    GROUP BY time_slot, severity
+    ORDER BY time_slot, severity
+"""
+
+TIMELINE_SQL = {
+    unit: text(TIMELINE_SQL_TEMPLATE.format(unit=unit))
+    for unit in ("hour", "day")
+}
+
+
 @router.get("/stats/dashboard", response_model=EventStatistics)
 async def get_event_statistics(
     hours: int = Query(24, ge=1, le=168, description="Time window in hours (max 7 days)"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(get_current_user)
 ):
     """
@@ -273,115 +515,19 @@ async def get_event_statistics(
     """
     try:
         start_time = datetime.utcnow() - timedelta(hours=hours)
+        params = {
+            "start_time": start_time,
+            "start_hour": start_time.replace(minute=0, second=0, microsecond=0),
+        }
 
-        # Total counts by severity
-        total_query = text("""
-            SELECT
-                COUNT(*) as total,
-                COUNT(*) FILTER (WHERE severity = 4) as critical,
-                COUNT(*) FILTER (WHERE severity = 3) as high,
-                COUNT(*) FILTER (WHERE severity = 2) as medium,
-                COUNT(*) FILTER (WHERE severity <= 1) as low
-            FROM security_events.events
-            WHERE event_time >= :start_time
-        """)
-        total_result = db.execute(total_query, {"start_time": start_time}).fetchone()
-
-        total_events = total_result[0] if total_result else 0
-        critical_events = total_result[1] if total_result else 0
-        high_events = total_result[2] if total_result else 0
-        medium_events = total_result[3] if total_result else 0
-        low_events = total_result[4] if total_result else 0
-
-        # Events by severity
-        severity_query = text("""
-            SELECT severity, COUNT(*) as count
-            FROM security_events.events
-            WHERE event_time >= :start_time
-            GROUP BY severity
-            ORDER BY severity
-        """)
-        severity_result = db.execute(severity_query, {"start_time": start_time})
-        events_by_severity = {}
-        severity_names = ['Info', 'Low', 'Medium', 'High', 'Critical']
-        for row in severity_result:
-            sev_idx = min(row[0], 4) if row[0] is not None else 0
-            events_by_severity[severity_names[sev_idx]] = row[1]
-
-        # Events by category
-        category_query = text("""
-            SELECT COALESCE(category, 'Unknown') as cat, COUNT(*) as count
-            FROM security_events.events
-            WHERE event_time >= :start_time
-            GROUP BY category
-            ORDER BY count DESC
-            LIMIT 10
-        """)
-        category_result = db.execute(category_query, {"start_time": start_time})
-        events_by_category = {row[0]: row[1] for row in category_result}
-
-        # Events by source type
-        source_query = text("""
-            SELECT COALESCE(source_type, 'Unknown') as src, COUNT(*) as count
-            FROM security_events.events
-            WHERE event_time >= :start_time
-            GROUP BY source_type
-            ORDER BY count DESC
-            LIMIT 10
-        """)
-        source_result = db.execute(source_query, {"start_time": start_time})
-        events_by_source = {row[0]: row[1] for row in source_result}
-
-        # Top agents
-        agents_query = text("""
-            SELECT e.agent_id::text, COALESCE(a.hostname, 'Unknown') as hostname, COUNT(*) as count
-            FROM security_events.events e
-            LEFT JOIN assets.agents a ON e.agent_id = a.agent_id
-            WHERE e.event_time >= :start_time AND e.agent_id IS NOT NULL
-            GROUP BY e.agent_id, a.hostname
-            ORDER BY count DESC
-            LIMIT 10
-        """)
-        agents_result = db.execute(agents_query, {"start_time": start_time})
-        top_agents = [{"agent_id": row[0], "hostname": row[1], "event_count": row[2]} for row in agents_result]
-
-        # Top users
-        users_query = text("""
-            SELECT subject_user, COUNT(*) as count
-            FROM security_events.events
-            WHERE event_time >= :start_time AND subject_user IS NOT NULL AND subject_user != ''
-            GROUP BY subject_user
-            ORDER BY count DESC
-            LIMIT 10
-        """)
-        users_result = db.execute(users_query, {"start_time": start_time})
-        top_users = [{"username": row[0], "event_count": row[1]} for row in users_result]
-
-        # Top processes
-        processes_query = text("""
-            SELECT process_name, COUNT(*) as count
-            FROM security_events.events
-            WHERE event_time >= :start_time AND process_name IS NOT NULL AND process_name != ''
-            GROUP BY process_name
-            ORDER BY count DESC
-            LIMIT 10
-        """)
-        processes_result = db.execute(processes_query, {"start_time": start_time})
-        top_processes = [{"process_name": row[0], "event_count": row[1]} for row in processes_result]
-
-        return EventStatistics(
-            total_events=total_events,
-            critical_events=critical_events,
-            high_events=high_events,
-            medium_events=medium_events,
-            low_events=low_events,
-            events_by_severity=events_by_severity,
-            events_by_category=events_by_category,
-            events_by_source=events_by_source,
-            top_agents=top_agents,
-            top_users=top_users,
-            top_processes=top_processes
-        )
+        try:
+            stats_json = (await db.execute(STATS_ROLLUP_JSON_SQL, params)).scalar_one()
+        except DBAPIError as e:
+            logger.warning(f"Event stats rollup unavailable, aggregating raw events: {e}")
+            await db.rollback()
+            stats_json = (await db.execute(STATS_RAW_JSON_SQL, {"start_time": start_time})).scalar_one()
+
+        return EventStatistics(**orjson.loads(stats_json))
 
     except Exception as e:
         logger.error(f"Error getting event statistics: {e}", exc_info=True)
@@ -395,7 +541,7 @@ async def get_event_statistics(
 async def get_events_timeline(
     hours: int = Query(24, ge=1, le=168, description="Time window in hours"),
     interval: str = Query("hour", pattern="^(hour|day)$", description="Time interval"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(get_current_user)
 ):
     """
@@ -406,23 +552,7 @@ async def get_events_timeline(
         start_time = datetime.utcnow() - timedelta(hours=hours)
         end_time = datetime.utcnow()
 
-        # PostgreSQL date_trunc for time grouping
-        time_trunc = 'hour' if interval == 'hour' else 'day'
-
-        # Query timeline data
-        query = text(f"""
-            SELECT
-                date_trunc(:time_trunc, event_time) as time_slot,
-                severity,
-                COUNT(*) as event_count
-            FROM security_events.events
-            WHERE event_time >= :start_time AND event_time <= :end_time
-            GROUP BY date_trunc(:time_trunc, event_time), severity
-            ORDER BY time_slot, severity
-        """)
-
-        result = db.execute(query, {
-            "time_trunc": time_trunc,
+        result = await db.execute(TIMELINE_SQL[interval], {
             "start_time": start_time,
             "end_time": end_time
         })
@@ -459,7 +589,7 @@ async def get_similar_events(
     event_id: int,
     hours: int = Query(24, ge=1, le=168, description="Time window to search"),
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(require_analyst)
 ):
     """
@@ -467,7 +597,7 @@ async def get_similar_events(
     Requires analyst role
     """
     # Get the reference event
-    reference = db.query(Event).filter(Event.event_id == event_id).first()
+    reference = await db.get(Event, event_id)
 
     if not reference:
         raise HTTPException(
@@ -479,38 +609,53 @@ async def get_similar_events(
     start_time = reference.event_time - timedelta(hours=hours)
     end_time = reference.event_time + timedelta(hours=hours)
 
-    query = db.query(Event).filter(
-        and_(
-            Event.event_id != event_id,
-            Event.event_time >= start_time,
-            Event.event_time <= end_time
-        )
+    window = and_(
+        events_table.c.event_id != event_id,
+        events_table.c.event_time >= start_time,
+        events_table.c.event_time <= end_time
     )
+    query = select(*EVENT_RESPONSE_COLUMNS)
 
     # Match on similar attributes
     conditions = []
 
     if reference.agent_id:
-        conditions.append(Event.agent_id == reference.agent_id)
+        conditions.append(events_table.c.agent_id == reference.agent_id)
     if reference.subject_user:
-        conditions.append(Event.subject_user == reference.subject_user)
+        conditions.append(events_table.c.subject_user == reference.subject_user)
     if reference.source_ip:
-        conditions.append(Event.source_ip == reference.source_ip)
+        conditions.append(events_table.c.source_ip == reference.source_ip)
     if reference.process_name:
-        conditions.append(Event.process_name == reference.process_name)
+        conditions.append(events_table.c.process_name == reference.process_name)
     if reference.category:
-        conditions.append(Event.category == reference.category)
+        conditions.append(events_table.c.category == reference.category)
 
     if conditions:
-        query = query.filter(or_(*conditions))
+        # One leg per attribute instead of OR: each leg walks its own
+        # (column, event_time DESC) index and stops after `limit` rows,
+        # UNION dedupes events matching several attributes
+        matches = union(*[
+            select(events_table.c.event_time, events_table.c.event_id)
+            .where(window, condition)
+            .order_by(events_table.c.event_time.desc())
+            .limit(limit)
+            for condition in conditions
+        ]).subquery()
+        query = query.join(
+            matches,
+            and_(events_table.c.event_time == matches.c.event_time, events_table.c.event_id == matches.c.event_id)
+        )
+    else:
+        query = query.where(window)
 
-    similar_events = query.order_by(Event.event_time.desc()).limit(limit).all()
+    result = await db.execute(query.order_by(events_table.c.event_time.desc()).limit(limit))
+    similar_events = _event_rows_to_dicts(result.all())
 
-    return {
+    return ORJSONResponse({
         "reference_event_id": event_id,
-        "similar_events": [EventResponse.from_orm(event) for event in similar_events],
+        "similar_events": similar_events,
         "count": len(similar_events)
-    }
+    })
 
 
 # ============================================================================
@@ -520,47 +665,50 @@ async def get_similar_events(
 @router.post("/export")
 async def export_events(
     filters: EventFilter,
-    db: Session = Depends(get_db),
     current_user: CurrentUser = Depends(require_analyst)
 ):
     """
-    Export events to JSON (for external analysis or backup)
+    Export events as NDJSON (for external analysis or backup)
+    First line is export metadata, then one event per line.
     Requires analyst role
     Maximum 10,000 events per export
     """
-    try:
-        # Build query with filters
-        query = db.query(Event)
-
-        if filters.start_time:
-            query = query.filter(Event.event_time >= filters.start_time)
-        if filters.end_time:
-            query = query.filter(Event.event_time <= filters.end_time)
-        if filters.agent_id:
-            query = query.filter(Event.agent_id == str(filters.agent_id))
-        if filters.min_severity is not None:
-            query = query.filter(Event.severity >= filters.min_severity)
-
-        # Limit export size
-        max_export = min(filters.limit, 10000)
-        events = query.order_by(Event.event_time.desc()).limit(max_export).all()
-
-        # Convert to dict
-        export_data = {
-            "export_time": datetime.utcnow().isoformat(),
-            "exported_by": current_user.username,
-            "filters": filters.dict(exclude_none=True),
-            "event_count": len(events),
-            "events": [EventDetail.from_orm(event).dict() for event in events]
-        }
-
-        logger.info(f"User {current_user.username} exported {len(events)} events")
-
-        return export_data
+    # Build query with filters
+    query = select(Event)
+
+    if filters.start_time:
+        query = query.where(Event.event_time >= filters.start_time)
+    if filters.end_time:
+        query = query.where(Event.event_time <= filters.end_time)
+    if filters.agent_id:
+        query = query.where(Event.agent_id == str(filters.agent_id))
+    if filters.min_severity is not None:
+        query = query.where(Event.severity >= filters.min_severity)
+
+    # Limit export size
+    max_export = min(filters.limit, 10000)
+    query = query.order_by(Event.event_time.desc()).limit(max_export)
+
+    metadata = {
+        "export_time": datetime.utcnow(),
+        "exported_by": current_user.username,
+        "filters": filters.dict(exclude_none=True),
+    }
 
-    except Exception as e:
-        logger.error(f"Error exporting events: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to export events: {str(e)}"
-        )
+    async def generate_ndjson():
+        # Own session: request dependencies are closed before a streamed body is sent
+        exported = 0
+        yield orjson.dumps(metadata) + b"\n"
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.stream_scalars(query.execution_options(yield_per=500))
+                async for event in result:
+                    yield orjson.dumps(EventDetail.from_orm(event).dict()) + b"\n"
+                    exported += 1
+        except Exception as e:
+            logger.error(f"Error exporting events: {e}", exc_info=True)
+            raise
+
+        logger.info(f"User {current_user.username} exported {exported} events")
+
+    return StreamingResponse(generate_ndjson(), media_type="application/x-ndjson")
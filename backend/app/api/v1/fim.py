@@ -3,18 +3,28 @@ File Integrity Monitoring (FIM) API Endpoints
 Handles Sysmon file and registry events
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import ORJSONResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy import func, and_, select, text, tuple_, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
 from typing import List, Optional
 from datetime import datetime, timedelta
+import asyncio
+import hashlib
 import logging
 import json
+import orjson
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_async_db, get_current_user, encode_event_cursor, decode_event_cursor
 from app.schemas.auth import CurrentUser
+from app.schemas.event import to_naive_utc
 from app.models.event import Event
 from app.config import settings
+from app.database import async_engine
+from app.core.settings_cache import TTLCache
+from app.core.cache import cache_get_json, cache_set_json
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +38,9 @@ def parse_event_data(raw_event: str) -> dict:
     except (json.JSONDecodeError, TypeError):
         return {}
 
-router = APIRouter()
+# orjson encodes datetime / UUID natively; list endpoints return ORJSONResponse
+# directly so payloads skip jsonable_encoder
+router = APIRouter(default_response_class=ORJSONResponse)
 
 # Sysmon Event IDs for FIM
 FIM_EVENT_CODES = {
@@ -39,10 +51,107 @@ FIM_EVENT_CODES = {
     13: "Registry Value Set",
     14: "Registry Key/Value Renamed"
 }
+FIM_EVENT_CODE_LIST = tuple(FIM_EVENT_CODES.keys())
+
+# event_type query parameter -> Sysmon event codes
+FIM_EVENT_TYPE_CODES = {
+    "file_created": (11,),
+    "file_deleted": (23, 26),
+    "registry_create": (12,),
+    "registry_set": (13,),
+    "registry_rename": (14,)
+}
+
+# Statistics are the same for every user; dashboards poll them every few
+# seconds, so each worker keeps the serialized body per time window for a
+# short TTL (cache hits skip both the queries and the encoding)
+fim_stats_cache = TTLCache(ttl=settings.fim_stats_cache_ttl, maxsize=168)
+
+# Event listing pages are cached in Redis per query string for a few seconds
+# (dashboard panels poll the same filters). Ingest bumps the generation when
+# FIM events arrive, which retires every cached page at once.
+FIM_EVENTS_CACHE_PREFIX = "fim:events:"
+FIM_EVENTS_CACHE_GEN_KEY = "fim:events:gen"
+
+# Counts by (event_code, severity) from the hourly rollup (migration 017);
+# hour granularity, the current hour is aggregated live by TimescaleDB
+FIM_STATS_ROLLUP_SQL = text("""
+    SELECT event_code, severity, SUM(event_count)::bigint AS event_count
+    FROM security_events.fim_stats_hourly
+    WHERE hour_bucket >= :start_hour
+    GROUP BY event_code, severity
+""")
+
+# Top paths and top processes need raw events; both come from one scan of
+# the FIM window (the CTE is referenced twice, so it is materialized once)
+FIM_TOP_N_SQL = text("""
+    WITH fim AS (
+        SELECT file_path, process_name
+        FROM security_events.events
+        WHERE source_type = 'Sysmon'
+        AND event_code = ANY(:codes)
+        AND event_time >= :start_time
+    )
+    (SELECT 'path' AS kind, file_path AS name, COUNT(*) AS count
+     FROM fim
+     WHERE file_path IS NOT NULL
+     GROUP BY file_path
+     ORDER BY COUNT(*) DESC
+     LIMIT 10)
+    UNION ALL
+    (SELECT 'process' AS kind, process_name AS name, COUNT(*) AS count
+     FROM fim
+     WHERE process_name IS NOT NULL
+     GROUP BY process_name
+     ORDER BY COUNT(*) DESC
+     LIMIT 10)
+""")
+
+# raw_event is jsonb in the database (Text in the model); the listing pulls
+# only the paths it needs instead of json.loads-ing every row in Python
+_raw_event = type_coerce(Event.raw_event, JSONB)
+
+# Labels are the response keys, so row mappings go into the payload as is
+FIM_LIST_COLUMNS = (
+    Event.event_id,
+    Event.event_time,
+    Event.event_code,
+    Event.computer.label('hostname'),  # Event model uses 'computer', not 'hostname'
+    Event.agent_id,
+    Event.file_path,
+    Event.process_name,
+    Event.target_user,
+    Event.message,
+    Event.severity,
+    Event.category,
+    func.coalesce(
+        Event.file_hash, _raw_event['FileHash'].astext, _raw_event['Hashes'].astext
+    ).label('file_hash'),
+    func.coalesce(Event.registry_key, _raw_event['RegistryKey'].astext).label('registry_key'),
+    func.coalesce(Event.registry_value, _raw_event['RegistryValue'].astext).label('registry_value'),
+    _raw_event['EventType'].astext.label('event_type_detail'),
+    _raw_event['Details'].astext.label('details'),
+    _raw_event['NewName'].astext.label('new_name'),
+)
+
+
+def _fim_base_filters(start_time: Optional[datetime] = None) -> list:
+    """Predicates shared by every FIM query (Sysmon source, FIM codes, time window)"""
+    # source_type is normalized to "Sysmon" at ingest, so a plain equality is
+    # enough (and matches the idx_events_fim partial index)
+    filters = [
+        Event.source_type == "Sysmon",
+        Event.event_code.in_(FIM_EVENT_CODE_LIST)
+    ]
+    if start_time:
+        filters.append(Event.event_time >= start_time)
+    return filters
 
 
 @router.get("/events")
 async def get_fim_events(
+    request: Request,
+
     # Time filters
     start_time: Optional[datetime] = Query(None, description="Filter events after this time"),
     end_time: Optional[datetime] = Query(None, description="Filter events before this time"),
@@ -61,115 +170,110 @@ async def get_fim_events(
     # Pagination
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
+    after: Optional[str] = Query(None, description="Keyset cursor (next_cursor of previous page); replaces offset"),
+    with_total: bool = Query(False, description="Also count all matching events (slow on wide windows)"),
 
     # Dependencies
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Get File Integrity Monitoring events (Sysmon file/registry changes)
     Returns file creations, deletions, and registry modifications
+    (total is only computed when with_total=true)
     """
     try:
-        # Build query - filter for Sysmon events only
-        query = db.query(Event).filter(
-            or_(
-                Event.source_type == "Sysmon",
-                Event.provider.ilike("%Sysmon%")
-            )
-        )
+        # Cache key: hash of the sorted query string + current ingest generation
+        generation = await cache_get_json(FIM_EVENTS_CACHE_GEN_KEY) or 0
+        signature = hashlib.blake2b(
+            orjson.dumps(sorted(request.query_params.multi_items())), digest_size=16
+        ).hexdigest()
+        cache_key = f"{FIM_EVENTS_CACHE_PREFIX}{generation}:{signature}"
 
-        # Filter by FIM event codes
-        query = query.filter(Event.event_code.in_(list(FIM_EVENT_CODES.keys())))
+        cached = await cache_get_json(cache_key)
+        if cached is not None:
+            return ORJSONResponse(cached)
 
         # Time filters
         if last_hours:
             start_time = datetime.utcnow() - timedelta(hours=last_hours)
 
-        if start_time:
-            query = query.filter(Event.event_time >= start_time)
+        start_time, end_time = to_naive_utc(start_time), to_naive_utc(end_time)
+
+        # Build query - Sysmon FIM events only
+        query = select(*FIM_LIST_COLUMNS).where(*_fim_base_filters(start_time))
+
         if end_time:
-            query = query.filter(Event.event_time <= end_time)
+            query = query.where(Event.event_time <= end_time)
 
         # Event type filter
-        if event_type:
-            event_code_map = {
-                "file_created": 11,
-                "file_deleted": [23, 26],
-                "registry_create": 12,
-                "registry_set": 13,
-                "registry_rename": 14
-            }
-            if event_type in event_code_map:
-                codes = event_code_map[event_type]
-                if isinstance(codes, list):
-                    query = query.filter(Event.event_code.in_(codes))
-                else:
-                    query = query.filter(Event.event_code == codes)
+        if event_type in FIM_EVENT_TYPE_CODES:
+            query = query.where(Event.event_code.in_(FIM_EVENT_TYPE_CODES[event_type]))
 
         # FIM-specific filters
         if file_path:
-            query = query.filter(Event.file_path.ilike(f"%{file_path}%"))
+            query = query.where(Event.file_path.ilike(f"%{file_path}%"))
 
         if registry_key:
             # FIX BUG-005: Use snake_case field registry_key instead of JSONB access
             # Event model has registry_key column directly
-            query = query.filter(Event.registry_key.ilike(f"%{registry_key}%"))
+            query = query.where(Event.registry_key.ilike(f"%{registry_key}%"))
 
         if process_name:
-            query = query.filter(Event.process_name.ilike(f"%{process_name}%"))
+            query = query.where(Event.process_name.ilike(f"%{process_name}%"))
 
         # General filters
         if agent_id:
-            query = query.filter(Event.agent_id == agent_id)
+            query = query.where(Event.agent_id == agent_id)
 
         if hostname:
-            query = query.filter(Event.computer.ilike(f"%{hostname}%"))
-
-        # Get total count
-        total = query.count()
-
-        # Apply pagination and ordering
-        events = query.order_by(Event.event_time.desc()).offset(offset).limit(limit).all()
-
-        # Convert to dict with FIM-specific fields
-        # FIX BUG-005, BUG-011: Use snake_case attributes and parse raw_event JSON
-        fim_events = []
-        for event in events:
-            # Parse raw_event JSON for additional FIM data
-            event_data = parse_event_data(event.raw_event)
-
-            event_dict = {
-                "event_id": event.event_id,
-                "event_time": event.event_time.isoformat() if event.event_time else None,
-                "event_code": event.event_code,
-                "event_type": FIM_EVENT_CODES.get(event.event_code, "Unknown"),
-                "hostname": event.computer,  # Event model uses 'computer', not 'hostname'
-                "agent_id": str(event.agent_id) if event.agent_id else None,
-                "file_path": event.file_path,
-                "process_name": event.process_name,
-                "target_user": event.target_user,
-                "message": event.message,
-                "severity": event.severity,
-                "category": event.category,
-                # Use model fields or parse from raw_event JSON
-                "file_hash": event.file_hash or event_data.get("FileHash") or event_data.get("Hashes"),
-                "registry_key": event.registry_key or event_data.get("RegistryKey"),
-                "registry_value": event.registry_value or event_data.get("RegistryValue"),
-                "event_type_detail": event_data.get("EventType"),  # CreateKey, SetValue, etc.
-                "details": event_data.get("Details"),  # Registry value details
-                "new_name": event_data.get("NewName"),  # For rename operations
-            }
-            fim_events.append(event_dict)
-
-        return {
+            query = query.where(Event.computer.ilike(f"%{hostname}%"))
+
+        order_by = (Event.event_time.desc(), Event.event_id.desc())
+
+        # Total is a second scan over the whole window; only on request
+        total = None
+        if with_total:
+            # Same predicates, none of the projected columns
+            total = (await db.execute(
+                select(func.count()).select_from(Event).where(query.whereclause)
+            )).scalar_one()
+
+        if after:
+            # Keyset pagination: seek past the cursor, cost independent of page depth
+            cursor_time, cursor_id = decode_event_cursor(after)
+            page_query = query.where(
+                tuple_(Event.event_time, Event.event_id) < (cursor_time, cursor_id)
+            ).order_by(*order_by)
+        else:
+            page_query = query.order_by(*order_by).offset(offset)
+
+        # One extra row tells whether another page exists
+        events = (await db.execute(page_query.limit(limit + 1))).mappings().all()
+        has_more = len(events) > limit
+        events = events[:limit]
+
+        # FIM-specific fields (JSON paths already projected) come straight from
+        # the row mappings; only the event type name is added here
+        fim_events = [
+            {**event, "event_type": FIM_EVENT_CODES.get(event["event_code"], "Unknown")}
+            for event in events
+        ]
+
+        page = {
             "events": fim_events,
             "total": total,
             "limit": limit,
-            "offset": offset,
-            "has_more": (offset + limit) < total
+            "offset": None if after else offset,
+            "has_more": has_more,
+            "next_cursor": encode_event_cursor(events[-1]["event_time"], events[-1]["event_id"]) if has_more and events else None
         }
+        await cache_set_json(cache_key, page, settings.fim_events_cache_ttl)
+
+        return ORJSONResponse(page)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving FIM events: {e}", exc_info=True)
         raise HTTPException(
@@ -181,22 +285,16 @@ async def get_fim_events(
 @router.get("/events/{event_id}")
 async def get_fim_event_detail(
     event_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Get detailed FIM event information by ID
     """
-    event = db.query(Event).filter(
-        Event.event_id == event_id,
-        or_(
-            Event.source_type == "Sysmon",
-            Event.provider.ilike("%Sysmon%")
-        ),
-        Event.event_code.in_(list(FIM_EVENT_CODES.keys()))
-    ).first()
-
-    if not event:
+    # Plain lookup by id; the FIM checks are done on the loaded row
+    event = await db.get(Event, event_id)
+
+    if not event or event.source_type != "Sysmon" or event.event_code not in FIM_EVENT_CODES:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"FIM event with ID {event_id} not found"
@@ -207,11 +305,11 @@ async def get_fim_event_detail(
 
     return {
         "event_id": event.event_id,
-        "event_time": event.event_time.isoformat() if event.event_time else None,
+        "event_time": event.event_time,
         "event_code": event.event_code,
         "event_type": FIM_EVENT_CODES.get(event.event_code, "Unknown"),
         "hostname": event.computer,
-        "agent_id": str(event.agent_id) if event.agent_id else None,
+        "agent_id": event.agent_id,
         "source_type": event.source_type,
         "provider": event.provider,
         "severity": event.severity,
@@ -245,81 +343,97 @@ async def get_fim_event_detail(
     }
 
 
+async def _fetch_rows(statement, params: dict = None) -> list:
+    """Run one aggregation on its own pooled connection"""
+    async with async_engine.connect() as conn:
+        result = await conn.execute(statement, params or {})
+        return result.all()
+
+
+async def _fetch_code_severity_counts(start_time: datetime, base_filters: list) -> list:
+    """Get (event_code, severity, count) from hourly rollup, falling back to raw events"""
+    try:
+        return await _fetch_rows(FIM_STATS_ROLLUP_SQL, {
+            "start_hour": start_time.replace(minute=0, second=0, microsecond=0)
+        })
+    except DBAPIError as e:
+        logger.warning(f"FIM stats rollup unavailable, aggregating raw events: {e}")
+        return await _fetch_rows(
+            select(Event.event_code, Event.severity, func.count())
+            .where(*base_filters)
+            .group_by(Event.event_code, Event.severity)
+        )
+
+
 @router.get("/statistics")
 async def get_fim_statistics(
     hours: int = Query(24, ge=1, le=168, description="Time window in hours (max 7 days)"),
-    db: Session = Depends(get_db),
     current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Get FIM statistics for the specified time window
     """
     try:
+        hit, cached = fim_stats_cache.get(hours)
+        if hit:
+            return Response(content=cached, media_type="application/json")
+
         start_time = datetime.utcnow() - timedelta(hours=hours)
 
-        # Base query for FIM events
-        base_query = db.query(Event).filter(
-            or_(
-                Event.source_type == "Sysmon",
-                Event.provider.ilike("%Sysmon%")
-            ),
-            Event.event_code.in_(list(FIM_EVENT_CODES.keys())),
-            Event.event_time >= start_time
+        # Base predicates for the raw-events fallback of the counts
+        base_filters = _fim_base_filters(start_time)
+
+        # Counts and top-N run concurrently on separate connections, so wall
+        # time is the slower of the two instead of the sum. Totals, events by
+        # type and by severity all derive from one (event_code, severity)
+        # breakdown
+        code_severity_counts, top_n_rows = await asyncio.gather(
+            _fetch_code_severity_counts(start_time, base_filters),
+            _fetch_rows(FIM_TOP_N_SQL, {
+                "codes": list(FIM_EVENT_CODE_LIST),
+                "start_time": start_time
+            }),
         )
 
-        # Total FIM events
-        total_events = base_query.count()
-
-        # Events by type
-        events_by_type = {}
-        for event_code, event_name in FIM_EVENT_CODES.items():
-            count = base_query.filter(Event.event_code == event_code).count()
-            events_by_type[event_name] = count
-
-        # Top modified paths (files and registry)
-        top_file_paths = db.query(
-            Event.file_path,
-            func.count(Event.event_id).label('count')
-        ).filter(
-            Event.event_id.in_(base_query.with_entities(Event.event_id).subquery()),
-            Event.file_path.isnot(None)
-        ).group_by(Event.file_path).order_by(func.count(Event.event_id).desc()).limit(10).all()
-
-        # Top processes making changes
-        top_processes = db.query(
-            Event.process_name,
-            func.count(Event.event_id).label('count')
-        ).filter(
-            Event.event_id.in_(base_query.with_entities(Event.event_id).subquery()),
-            Event.process_name.isnot(None)
-        ).group_by(Event.process_name).order_by(func.count(Event.event_id).desc()).limit(10).all()
-
-        # Events by severity
-        events_by_severity = db.query(
-            Event.severity,
-            func.count(Event.event_id).label('count')
-        ).filter(
-            Event.event_id.in_(base_query.with_entities(Event.event_id).subquery())
-        ).group_by(Event.severity).all()
+        # Top modified paths (files and registry) and top processes making changes
+        top_file_paths = [{"path": name, "count": count} for kind, name, count in top_n_rows if kind == "path"]
+        top_processes = [{"name": name, "count": count} for kind, name, count in top_n_rows if kind == "process"]
+
+        total_events = 0
+        critical_changes = 0
+        type_counts = {}
+        severity_counts = {}
+        for event_code, severity, count in code_severity_counts:
+            total_events += count
+            if severity is not None and severity >= 3:
+                critical_changes += count
+            type_counts[event_code] = type_counts.get(event_code, 0) + count
+            severity_counts[severity] = severity_counts.get(severity, 0) + count
+
+        events_by_type = {
+            event_name: type_counts.get(event_code, 0)
+            for event_code, event_name in FIM_EVENT_CODES.items()
+        }
 
         severity_map = {0: 'Info', 1: 'Low', 2: 'Medium', 3: 'High', 4: 'Critical'}
         events_by_severity_dict = {
             severity_map.get(sev, 'Unknown'): count
-            for sev, count in events_by_severity
+            for sev, count in severity_counts.items()
         }
 
-        # Critical file changes (high severity)
-        critical_changes = base_query.filter(Event.severity >= 3).count()
-
-        return {
+        stats = {
             "time_window_hours": hours,
             "total_fim_events": total_events,
             "critical_changes": critical_changes,
             "events_by_type": events_by_type,
             "events_by_severity": events_by_severity_dict,
-            "top_file_paths": [{"path": path, "count": count} for path, count in top_file_paths],
-            "top_processes": [{"name": name, "count": count} for name, count in top_processes]
+            "top_file_paths": top_file_paths,
+            "top_processes": top_processes
         }
+        content = orjson.dumps(stats)
+        fim_stats_cache.set(hours, content)
+
+        return Response(content=content, media_type="application/json")
 
     except Exception as e:
         logger.error(f"Error retrieving FIM statistics: {e}", exc_info=True)
@@ -4,14 +4,17 @@ Handles incident management, correlation, and CBR reporting
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, text
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, raiseload
+from sqlalchemy import func, and_, or_, text, select, update, delete, cast
+from sqlalchemy.dialects.postgresql import JSONB
 from typing import List, Optional
 from datetime import datetime, timedelta
 import json
 import logging
 
-from app.api.deps import get_db, get_current_user, require_analyst, require_admin
+from app.api.deps import get_async_db, get_current_user, require_analyst, require_admin
 from app.schemas.incident import (
     IncidentCreate,
     IncidentUpdate,
@@ -33,11 +36,27 @@ from app.schemas.auth import CurrentUser
 from app.models.incident import Incident, Alert
 from app.models.user import User
 from app.config import settings
+from app.core.settings_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Overview statistics are polled by every dashboard; each worker keeps them per
+# time window for a short TTL. Mutations that change counts clear this
+# worker's entries, other workers catch up within the TTL.
+incident_stats_cache = TTLCache(ttl=settings.incident_stats_cache_ttl, maxsize=64)
+
+
+def _jsonb_append(column, entry: dict):
+    """
+    SQL expression appending entry to a JSONB array column.
+
+    The append happens in the UPDATE itself, so work logs and action lists
+    are never read back and re-serialized in Python.
+    """
+    return func.coalesce(column, cast([], JSONB)).op('||')(cast([entry], JSONB))
+
 
 # ============================================================================
 # INCIDENT MANAGEMENT
@@ -46,7 +65,7 @@ router = APIRouter()
 @router.post("", response_model=IncidentResponse, status_code=status.HTTP_201_CREATED)
 async def create_incident(
     incident: IncidentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(require_analyst)
 ):
     """
@@ -56,7 +75,9 @@ async def create_incident(
     try:
         # Validate alerts if provided
         if incident.alert_ids:
-            alerts = db.query(Alert).filter(Alert.AlertId.in_(incident.alert_ids)).all()
+            alerts = (await db.execute(
+                select(Alert).where(Alert.AlertId.in_(incident.alert_ids))
+            )).scalars().all()
             if len(alerts) != len(incident.alert_ids):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -76,8 +97,8 @@ async def create_incident(
             Category=incident.category,
             AlertCount=len(incident.alert_ids) if incident.alert_ids else 0,
             EventCount=event_count,
-            AffectedAgents=json.dumps(incident.affected_agents) if incident.affected_agents else None,
-            AffectedUsers=json.dumps(incident.affected_users) if incident.affected_users else None,
+            AffectedAgents=incident.affected_agents or None,
+            AffectedUsers=incident.affected_users or None,
             AffectedAssets=len(incident.affected_agents) if incident.affected_agents else 0,
             StartTime=incident.start_time,
             EndTime=incident.end_time,
@@ -85,31 +106,33 @@ async def create_incident(
             Status='open',
             AssignedTo=incident.assigned_to or current_user.user_id,
             Priority=incident.priority,
-            MitreAttackTactics=json.dumps(incident.mitre_attack_tactics) if incident.mitre_attack_tactics else None,
-            MitreAttackTechniques=json.dumps(incident.mitre_attack_techniques) if incident.mitre_attack_techniques else None,
+            MitreAttackTactics=incident.mitre_attack_tactics or None,
+            MitreAttackTechniques=incident.mitre_attack_techniques or None,
             OperationalRiskCategory=incident.operational_risk_category,
             EstimatedDamage_RUB=incident.estimated_damage_rub,
             CreatedAt=datetime.utcnow(),
-            WorkLog=json.dumps([{
+            WorkLog=[{
                 "timestamp": datetime.utcnow().isoformat(),
                 "user": current_user.username,
                 "entry": f"Incident created by {current_user.username}",
                 "type": "milestone"
-            }])
+            }]
         )
 
         db.add(new_incident)
-        db.flush()
+        await db.flush()
 
-        # Link alerts to this incident
+        # Link alerts to this incident (one UPDATE for all of them)
         if incident.alert_ids:
-            for alert_id in incident.alert_ids:
-                alert = db.query(Alert).filter(Alert.AlertId == alert_id).first()
-                if alert:
-                    alert.IncidentId = new_incident.IncidentId
+            await db.execute(
+                update(Alert)
+                .where(Alert.AlertId.in_(incident.alert_ids))
+                .values(IncidentId=new_incident.IncidentId)
+                .execution_options(synchronize_session=False)
+            )
 
-        db.commit()
-        db.refresh(new_incident)
+        await db.commit()
+        incident_stats_cache.invalidate()
 
         logger.info(f"Incident '{new_incident.Title}' created by {current_user.username} (ID: {new_incident.IncidentId})")
 
@@ -118,7 +141,7 @@ async def create_incident(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error creating incident: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -153,51 +176,58 @@ async def get_incidents(
     offset: int = Query(0, ge=0),
 
     # Dependencies
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Get list of incidents with filtering
     """
     try:
-        query = db.query(Incident)
+        # IncidentResponse reads columns only; a relationship access would
+        # be a query per row, so make it fail loudly instead
+        query = select(Incident).options(raiseload("*"))
 
         # Time filters
         if last_days:
             start_time = datetime.utcnow() - timedelta(days=last_days)
 
         if start_time:
-            query = query.filter(Incident.DetectedAt >= start_time)
+            query = query.where(Incident.DetectedAt >= start_time)
         if end_time:
-            query = query.filter(Incident.DetectedAt <= end_time)
+            query = query.where(Incident.DetectedAt <= end_time)
 
         # Status filters
         if incident_status:
-            query = query.filter(Incident.Status == incident_status)
+            query = query.where(Incident.Status == incident_status)
         if min_severity is not None:
-            query = query.filter(Incident.Severity >= min_severity)
+            query = query.where(Incident.Severity >= min_severity)
         if category:
-            query = query.filter(Incident.Category == category)
+            query = query.where(Incident.Category == category)
 
         # Assignment filters
         if assigned_to_me:
-            query = query.filter(Incident.AssignedTo == current_user.user_id)
+            query = query.where(Incident.AssignedTo == current_user.user_id)
         elif assigned_to is not None:
-            query = query.filter(Incident.AssignedTo == assigned_to)
+            query = query.where(Incident.AssignedTo == assigned_to)
 
         # MITRE filter
         if mitre_tactic:
-            query = query.filter(Incident.MitreAttackTactics.like(f'%{mitre_tactic}%'))
+            # jsonb @> is served by idx_incidents_mitre_tactics (GIN)
+            query = query.where(Incident.MitreAttackTactics.contains([mitre_tactic]))
 
         # CBR filter
         if is_reported_to_cbr is not None:
-            query = query.filter(Incident.IsReportedToCBR == is_reported_to_cbr)
+            query = query.where(Incident.IsReportedToCBR == is_reported_to_cbr)
 
         # Get total
-        total = query.count()
+        total = (await db.execute(
+            select(func.count()).select_from(query.order_by(None).subquery())
+        )).scalar_one()
 
         # Apply pagination
-        incidents = query.order_by(Incident.DetectedAt.desc()).offset(offset).limit(limit).all()
+        incidents = (await db.execute(
+            query.order_by(Incident.DetectedAt.desc()).offset(offset).limit(limit)
+        )).scalars().all()
 
         return {
             "incidents": [IncidentResponse.from_orm(incident) for incident in incidents],
@@ -217,13 +247,13 @@ async def get_incidents(
 @router.get("/{incident_id}", response_model=IncidentDetail)
 async def get_incident(
     incident_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Get incident details
     """
-    incident = db.query(Incident).filter(Incident.IncidentId == incident_id).first()
+    incident = await db.get(Incident, incident_id)
 
     if not incident:
         raise HTTPException(
@@ -238,14 +268,14 @@ async def get_incident(
 async def update_incident(
     incident_id: int,
     update_data: IncidentUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(require_analyst)
 ):
     """
     Update incident (analyst or admin)
     """
     try:
-        incident = db.query(Incident).filter(Incident.IncidentId == incident_id).first()
+        incident = await db.get(Incident, incident_id)
 
         if not incident:
             raise HTTPException(
@@ -270,14 +300,12 @@ async def update_incident(
                 incident.Status = update_data.status
 
                 # Add to work log
-                work_log = json.loads(incident.WorkLog) if incident.WorkLog else []
-                work_log.append({
+                incident.WorkLog = _jsonb_append(Incident.WorkLog, {
                     "timestamp": datetime.utcnow().isoformat(),
                     "user": current_user.username,
                     "entry": f"Status changed from {old_status} to {update_data.status}",
                     "type": "milestone"
                 })
-                incident.WorkLog = json.dumps(work_log)
 
         if update_data.priority is not None:
             incident.Priority = update_data.priority
@@ -296,8 +324,8 @@ async def update_incident(
 
         incident.UpdatedAt = datetime.utcnow()
 
-        db.commit()
-        db.refresh(incident)
+        await db.commit()
+        incident_stats_cache.invalidate()
 
         logger.info(f"Incident {incident_id} updated by {current_user.username}")
 
@@ -306,7 +334,7 @@ async def update_incident(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error updating incident: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -317,7 +345,7 @@ async def update_incident(
 @router.delete("/{incident_id}")
 async def delete_incident(
     incident_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(require_admin)
 ):
     """
@@ -325,7 +353,7 @@ async def delete_incident(
     Note: This will NOT delete related alerts, just unlink them
     """
     try:
-        incident = db.query(Incident).filter(Incident.IncidentId == incident_id).first()
+        incident = await db.get(Incident, incident_id)
 
         if not incident:
             raise HTTPException(
@@ -336,11 +364,15 @@ async def delete_incident(
         title = incident.Title
 
         # Unlink alerts
-        db.query(Alert).filter(Alert.IncidentId == incident_id).update({Alert.IncidentId: None})
+        await db.execute(
+            update(Alert).where(Alert.IncidentId == incident_id).values(IncidentId=None)
+        )
 
-        # Delete incident
-        db.delete(incident)
-        db.commit()
+        # Delete incident (Core DELETE: alerts are already unlinked, so the ORM
+        # does not need to load the relationship)
+        await db.execute(delete(Incident).where(Incident.IncidentId == incident_id))
+        await db.commit()
+        incident_stats_cache.invalidate()
 
         logger.warning(f"Incident '{title}' (ID: {incident_id}) deleted by {current_user.username}")
 
@@ -352,7 +384,7 @@ async def delete_incident(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error deleting incident: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -368,14 +400,14 @@ async def delete_incident(
 async def add_work_log_entry(
     incident_id: int,
     entry: IncidentWorkLogEntry,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Add work log entry to incident
     """
     try:
-        incident = db.query(Incident).filter(Incident.IncidentId == incident_id).first()
+        incident = await db.get(Incident, incident_id)
 
         if not incident:
             raise HTTPException(
@@ -384,17 +416,15 @@ async def add_work_log_entry(
             )
 
         # Add to work log
-        work_log = json.loads(incident.WorkLog) if incident.WorkLog else []
-        work_log.append({
+        incident.WorkLog = _jsonb_append(Incident.WorkLog, {
             "timestamp": datetime.utcnow().isoformat(),
             "user": current_user.username,
             "entry": entry.entry,
             "type": entry.entry_type
         })
-        incident.WorkLog = json.dumps(work_log)
         incident.UpdatedAt = datetime.utcnow()
 
-        db.commit()
+        await db.commit()
 
         logger.info(f"Work log entry added to incident {incident_id} by {current_user.username}")
 
@@ -406,7 +436,7 @@ async def add_work_log_entry(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error adding work log entry: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -422,14 +452,14 @@ async def add_work_log_entry(
 async def add_containment_action(
     incident_id: int,
     action: IncidentContainmentAction,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(require_analyst)
 ):
     """
     Add containment action to incident (analyst or admin)
     """
     try:
-        incident = db.query(Incident).filter(Incident.IncidentId == incident_id).first()
+        incident = await db.get(Incident, incident_id)
 
         if not incident:
             raise HTTPException(
@@ -438,21 +468,20 @@ async def add_containment_action(
             )
 
         # Add to containment actions
-        containment = json.loads(incident.ContainmentActions) if incident.ContainmentActions else []
-        containment.append({
+        incident.ContainmentActions = _jsonb_append(Incident.ContainmentActions, {
             "timestamp": (action.timestamp or datetime.utcnow()).isoformat(),
             "performed_by": action.performed_by or current_user.username,
             "action": action.action,
             "result": action.result
         })
-        incident.ContainmentActions = json.dumps(containment)
 
         # Update status if first containment action
         if incident.Status == 'investigating':
             incident.Status = 'contained'
 
         incident.UpdatedAt = datetime.utcnow()
-        db.commit()
+        await db.commit()
+        incident_stats_cache.invalidate()
 
         logger.info(f"Containment action added to incident {incident_id} by {current_user.username}")
 
@@ -464,7 +493,7 @@ async def add_containment_action(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error adding containment action: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -476,14 +505,14 @@ async def add_containment_action(
 async def add_remediation_action(
     incident_id: int,
     action: IncidentRemediationAction,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(require_analyst)
 ):
     """
     Add remediation action to incident (analyst or admin)
     """
     try:
-        incident = db.query(Incident).filter(Incident.IncidentId == incident_id).first()
+        incident = await db.get(Incident, incident_id)
 
         if not incident:
             raise HTTPException(
@@ -492,18 +521,16 @@ async def add_remediation_action(
             )
 
         # Add to remediation actions
-        remediation = json.loads(incident.RemediationActions) if incident.RemediationActions else []
-        remediation.append({
+        incident.RemediationActions = _jsonb_append(Incident.RemediationActions, {
             "timestamp": (action.timestamp or datetime.utcnow()).isoformat(),
             "performed_by": action.performed_by or current_user.username,
             "action": action.action,
             "result": action.result,
             "verified": action.verified
         })
-        incident.RemediationActions = json.dumps(remediation)
         incident.UpdatedAt = datetime.utcnow()
 
-        db.commit()
+        await db.commit()
 
         logger.info(f"Remediation action added to incident {incident_id} by {current_user.username}")
 
@@ -515,7 +542,7 @@ async def add_remediation_action(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error adding remediation action: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -527,14 +554,14 @@ async def add_remediation_action(
 async def close_incident(
     incident_id: int,
     close_data: IncidentClose,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(require_analyst)
 ):
     """
     Close incident (analyst or admin)
     """
     try:
-        incident = db.query(Incident).filter(Incident.IncidentId == incident_id).first()
+        incident = await db.get(Incident, incident_id)
 
         if not incident:
             raise HTTPException(
@@ -557,19 +584,17 @@ async def close_incident(
             incident.ActualDamage_RUB = close_data.actual_damage_rub
 
         # Add to work log
-        work_log = json.loads(incident.WorkLog) if incident.WorkLog else []
-        work_log.append({
+        incident.WorkLog = _jsonb_append(Incident.WorkLog, {
             "timestamp": datetime.utcnow().isoformat(),
             "user": current_user.username,
             "entry": f"Incident closed by {current_user.username}. {close_data.final_notes or ''}",
             "type": "milestone"
         })
-        incident.WorkLog = json.dumps(work_log)
 
         incident.UpdatedAt = datetime.utcnow()
 
-        db.commit()
-        db.refresh(incident)
+        await db.commit()
+        incident_stats_cache.invalidate()
 
         logger.info(f"Incident {incident_id} closed by {current_user.username}")
 
@@ -578,7 +603,7 @@ async def close_incident(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error closing incident: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -594,14 +619,14 @@ async def close_incident(
 async def report_to_cbr(
     incident_id: int,
     report: IncidentCBRReport,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(require_analyst)
 ):
     """
     Mark incident as reported to CBR (analyst or admin)
     """
     try:
-        incident = db.query(Incident).filter(Incident.IncidentId == incident_id).first()
+        incident = await db.get(Incident, incident_id)
 
         if not incident:
             raise HTTPException(
@@ -619,18 +644,16 @@ async def report_to_cbr(
             incident.ActualDamage_RUB = report.actual_damage_rub
 
         # Add to work log
-        work_log = json.loads(incident.WorkLog) if incident.WorkLog else []
-        work_log.append({
+        incident.WorkLog = _jsonb_append(Incident.WorkLog, {
             "timestamp": datetime.utcnow().isoformat(),
             "user": current_user.username,
             "entry": f"Reported to CBR. Incident number: {report.cbr_incident_number}. {report.report_notes or ''}",
             "type": "milestone"
         })
-        incident.WorkLog = json.dumps(work_log)
 
         incident.UpdatedAt = datetime.utcnow()
 
-        db.commit()
+        await db.commit()
 
         logger.info(f"Incident {incident_id} reported to CBR by {current_user.username}")
 
@@ -642,7 +665,7 @@ async def report_to_cbr(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error reporting to CBR: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -657,51 +680,69 @@ async def report_to_cbr(
 @router.get("/stats/overview", response_model=IncidentStatistics)
 async def get_incident_statistics(
     days: int = Query(30, ge=1, le=365, description="Time window in days"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Get incident statistics for dashboard
     """
+    cache_headers = {"Cache-Control": f"private, max-age={settings.incident_stats_cache_ttl}"}
     try:
-        start_time = datetime.utcnow() - timedelta(days=days)
-
-        # Total incidents
-        total_incidents = db.query(func.count(Incident.IncidentId)).filter(
-            Incident.DetectedAt >= start_time
-        ).scalar()
+        hit, cached = incident_stats_cache.get(days)
+        if hit:
+            return ORJSONResponse(cached, headers=cache_headers)
 
-        # Incidents by status
-        open_incidents = db.query(func.count(Incident.IncidentId)).filter(
-            and_(Incident.DetectedAt >= start_time, Incident.Status == 'open')
-        ).scalar()
-
-        investigating_incidents = db.query(func.count(Incident.IncidentId)).filter(
-            and_(Incident.DetectedAt >= start_time, Incident.Status == 'investigating')
-        ).scalar()
-
-        contained_incidents = db.query(func.count(Incident.IncidentId)).filter(
-            and_(Incident.DetectedAt >= start_time, Incident.Status == 'contained')
-        ).scalar()
-
-        resolved_incidents = db.query(func.count(Incident.IncidentId)).filter(
-            and_(Incident.DetectedAt >= start_time, Incident.Status == 'resolved')
-        ).scalar()
+        start_time = datetime.utcnow() - timedelta(days=days)
 
-        closed_incidents = db.query(func.count(Incident.IncidentId)).filter(
-            and_(Incident.DetectedAt >= start_time, Incident.Status == 'closed')
-        ).scalar()
+        month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        last_month_start = (month_start - timedelta(days=1)).replace(day=1)
 
-        critical_incidents = db.query(func.count(Incident.IncidentId)).filter(
-            and_(Incident.DetectedAt >= start_time, Incident.Severity >= 4)
-        ).scalar()
+        # Window totals, average resolution time and month comparison in one
+        # pass (conditional aggregates)
+        in_window = Incident.DetectedAt >= start_time
+        (
+            total_incidents,
+            critical_incidents,
+            avg_resolution_time_hours,
+            incidents_this_month,
+            incidents_last_month
+        ) = (await db.execute(select(
+            func.count().filter(in_window),
+            func.count().filter(and_(in_window, Incident.Severity >= 4)),
+            func.avg(
+                func.extract('epoch', Incident.ClosedAt - Incident.DetectedAt) / 3600.0
+            ).filter(and_(
+                in_window,
+                Incident.Status.in_(['resolved', 'closed']),
+                Incident.ClosedAt.isnot(None)
+            )),
+            func.count().filter(Incident.DetectedAt >= month_start),
+            func.count().filter(and_(
+                Incident.DetectedAt >= last_month_start,
+                Incident.DetectedAt < month_start
+            ))
+        ).select_from(Incident).where(
+            Incident.DetectedAt >= min(start_time, last_month_start)
+        ))).one()
+
+        # Incidents by status (one GROUP BY instead of a count per status)
+        status_counts = dict((await db.execute(
+            select(Incident.Status, func.count())
+            .where(in_window)
+            .group_by(Incident.Status)
+        )).all())
+        open_incidents = status_counts.get('open', 0)
+        investigating_incidents = status_counts.get('investigating', 0)
+        contained_incidents = status_counts.get('contained', 0)
+        resolved_incidents = status_counts.get('resolved', 0)
+        closed_incidents = status_counts.get('closed', 0)
 
         # Incidents by severity
         incidents_by_severity = {}
-        severity_stats = db.query(
-            Incident.Severity,
-            func.count(Incident.IncidentId).label('count')
-        ).filter(Incident.DetectedAt >= start_time).group_by(Incident.Severity).all()
+        severity_stats = (await db.execute(
+            select(Incident.Severity, func.count().label('count'))
+            .where(in_window).group_by(Incident.Severity)
+        )).all()
 
         for severity, count in severity_stats:
             severity_name = ['Info', 'Low', 'Medium', 'High', 'Critical'][severity]
@@ -709,10 +750,10 @@ async def get_incident_statistics(
 
         # Incidents by category
         incidents_by_category = {}
-        category_stats = db.query(
-            Incident.Category,
-            func.count(Incident.IncidentId).label('count')
-        ).filter(Incident.DetectedAt >= start_time).group_by(Incident.Category).all()
+        category_stats = (await db.execute(
+            select(Incident.Category, func.count().label('count'))
+            .where(in_window).group_by(Incident.Category)
+        )).all()
 
         for category, count in category_stats:
             incidents_by_category[category or 'Unknown'] = count
@@ -726,40 +767,7 @@ async def get_incident_statistics(
             'closed': closed_incidents or 0
         }
 
-        # Average resolution time
-        resolved_with_times = db.query(Incident).filter(
-            and_(
-                Incident.DetectedAt >= start_time,
-                Incident.Status.in_(['resolved', 'closed']),
-                Incident.ClosedAt.isnot(None)
-            )
-        ).all()
-
-        if resolved_with_times:
-            total_hours = sum([
-                (inc.ClosedAt - inc.DetectedAt).total_seconds() / 3600
-                for inc in resolved_with_times
-            ])
-            avg_resolution_time_hours = total_hours / len(resolved_with_times)
-        else:
-            avg_resolution_time_hours = None
-
-        # This month vs last month
-        month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        last_month_start = (month_start - timedelta(days=1)).replace(day=1)
-
-        incidents_this_month = db.query(func.count(Incident.IncidentId)).filter(
-            Incident.DetectedAt >= month_start
-        ).scalar()
-
-        incidents_last_month = db.query(func.count(Incident.IncidentId)).filter(
-            and_(
-                Incident.DetectedAt >= last_month_start,
-                Incident.DetectedAt < month_start
-            )
-        ).scalar()
-
-        return IncidentStatistics(
+        stats = IncidentStatistics(
             total_incidents=total_incidents or 0,
             open_incidents=open_incidents or 0,
             investigating_incidents=investigating_incidents or 0,
@@ -770,10 +778,13 @@ async def get_incident_statistics(
             incidents_by_severity=incidents_by_severity,
             incidents_by_category=incidents_by_category,
             incidents_by_status=incidents_by_status,
-            avg_resolution_time_hours=avg_resolution_time_hours,
+            avg_resolution_time_hours=float(avg_resolution_time_hours) if avg_resolution_time_hours is not None else None,
             incidents_this_month=incidents_this_month or 0,
             incidents_last_month=incidents_last_month or 0
-        )
+        ).dict()
+        incident_stats_cache.set(days, stats)
+
+        return ORJSONResponse(stats, headers=cache_headers)
 
     except Exception as e:
         logger.error(f"Error getting incident statistics: {e}", exc_info=True)
@@ -790,14 +801,21 @@ async def get_incident_statistics(
 @router.get("/{incident_id}/timeline", response_model=IncidentTimeline)
 async def get_incident_timeline(
     incident_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Get incident timeline with all events, alerts, and actions
     """
     try:
-        incident = db.query(Incident).filter(Incident.IncidentId == incident_id).first()
+        # Alerts are loaded eagerly; any other lazy load raises
+        result = await db.execute(
+            select(Incident).options(
+                selectinload(Incident.alerts),
+                raiseload("*"),
+            ).where(Incident.IncidentId == incident_id)
+        )
+        incident = result.scalar_one_or_none()
 
         if not incident:
             raise HTTPException(
@@ -817,8 +835,7 @@ async def get_incident_timeline(
         ))
 
         # Add related alerts
-        alerts = db.query(Alert).filter(Alert.IncidentId == incident_id).all()
-        for alert in alerts:
+        for alert in incident.alerts:
             timeline.append(IncidentTimelineEntry(
                 timestamp=alert.CreatedAt,
                 event_type="alert",
@@ -830,8 +847,7 @@ async def get_incident_timeline(
 
         # Add containment actions
         if incident.ContainmentActions:
-            containment = json.loads(incident.ContainmentActions)
-            for action in containment:
+            for action in incident.ContainmentActions:
                 timeline.append(IncidentTimelineEntry(
                     timestamp=datetime.fromisoformat(action['timestamp']),
                     event_type="containment",
@@ -841,8 +857,7 @@ async def get_incident_timeline(
 
         # Add remediation actions
         if incident.RemediationActions:
-            remediation = json.loads(incident.RemediationActions)
-            for action in remediation:
+            for action in incident.RemediationActions:
                 timeline.append(IncidentTimelineEntry(
                     timestamp=datetime.fromisoformat(action['timestamp']),
                     event_type="remediation",
@@ -877,13 +892,13 @@ async def get_incident_timeline(
 @router.get("/{incident_id}/alerts")
 async def get_incident_alerts(
     incident_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Get all alerts related to this incident
     """
-    incident = db.query(Incident).filter(Incident.IncidentId == incident_id).first()
+    incident = await db.get(Incident, incident_id)
 
     if not incident:
         raise HTTPException(
@@ -891,7 +906,9 @@ async def get_incident_alerts(
             detail=f"Incident {incident_id} not found"
         )
 
-    alerts = db.query(Alert).filter(Alert.IncidentId == incident_id).all()
+    alerts = (await db.execute(
+        select(Alert).where(Alert.IncidentId == incident_id)
+    )).scalars().all()
 
     from app.schemas.alert import AlertResponse
     return {
@@ -908,7 +925,7 @@ async def get_incident_alerts(
 @router.post("/{incident_id}/ai-analysis")
 async def analyze_incident_with_ai(
     incident_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(get_current_user)
 ):
     """
@@ -924,7 +941,7 @@ async def analyze_incident_with_ai(
                 detail="AI service is not available. Please configure DeepSeek or Yandex GPT."
             )
 
-        incident = db.query(Incident).filter(Incident.IncidentId == incident_id).first()
+        incident = await db.get(Incident, incident_id)
 
         if not incident:
             raise HTTPException(
@@ -933,7 +950,9 @@ async def analyze_incident_with_ai(
             )
 
         # Get related alerts
-        alerts = db.query(Alert).filter(Alert.IncidentId == incident_id).all()
+        alerts = (await db.execute(
+            select(Alert).where(Alert.IncidentId == incident_id)
+        )).scalars().all()
 
         if not alerts:
             raise HTTPException(
@@ -951,10 +970,10 @@ async def analyze_incident_with_ai(
             "start_time": incident.StartTime.isoformat() if incident.StartTime else None,
             "detected_at": incident.DetectedAt.isoformat(),
             "status": incident.Status,
-            "mitre_tactics": json.loads(incident.MitreAttackTactics) if incident.MitreAttackTactics else [],
-            "mitre_techniques": json.loads(incident.MitreAttackTechniques) if incident.MitreAttackTechniques else [],
-            "affected_hosts": json.loads(incident.AffectedAgents) if incident.AffectedAgents else [],
-            "affected_users": json.loads(incident.AffectedUsers) if incident.AffectedUsers else [],
+            "mitre_tactics": incident.MitreAttackTactics or [],
+            "mitre_techniques": incident.MitreAttackTechniques or [],
+            "affected_hosts": incident.AffectedAgents or [],
+            "affected_users": incident.AffectedUsers or [],
             "event_count": incident.EventCount,
             "alert_count": incident.AlertCount
         }
@@ -993,16 +1012,14 @@ async def analyze_incident_with_ai(
         incident.UpdatedAt = datetime.utcnow()
 
         # Add to work log
-        work_log = json.loads(incident.WorkLog) if incident.WorkLog else []
-        work_log.append({
+        incident.WorkLog = _jsonb_append(Incident.WorkLog, {
             "timestamp": datetime.utcnow().isoformat(),
             "user": current_user.username,
             "entry": f"AI analysis completed by {current_user.username}",
             "type": "analysis"
         })
-        incident.WorkLog = json.dumps(work_log)
 
-        db.commit()
+        await db.commit()
 
         logger.info(f"AI analysis completed for incident {incident_id} by {current_user.username}")
 
@@ -1015,7 +1032,7 @@ async def analyze_incident_with_ai(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error in AI analysis: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1026,13 +1043,13 @@ async def analyze_incident_with_ai(
 @router.get("/{incident_id}/ai-analysis")
 async def get_incident_ai_analysis(
     incident_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Get AI analysis for incident
     """
-    incident = db.query(Incident).filter(Incident.IncidentId == incident_id).first()
+    incident = await db.get(Incident, incident_id)
 
     if not incident:
         raise HTTPException(
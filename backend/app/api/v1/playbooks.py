@@ -556,19 +556,19 @@ async def get_playbook_stats(
     Get playbook execution statistics
     """
     try:
-        total_playbooks = db.query(func.count(Playbook.playbook_id)).scalar() or 0
-        enabled_playbooks = db.query(func.count(Playbook.playbook_id)).filter(
+        total_playbooks = db.query(func.count()).select_from(Playbook).scalar() or 0
+        enabled_playbooks = db.query(func.count()).select_from(Playbook).filter(
             Playbook.is_enabled == True
         ).scalar() or 0
 
-        total_executions = db.query(func.count(PlaybookExecution.execution_id)).scalar() or 0
-        successful_executions = db.query(func.count(PlaybookExecution.execution_id)).filter(
+        total_executions = db.query(func.count()).select_from(PlaybookExecution).scalar() or 0
+        successful_executions = db.query(func.count()).select_from(PlaybookExecution).filter(
             PlaybookExecution.status == PlaybookStatus.COMPLETED
         ).scalar() or 0
-        failed_executions = db.query(func.count(PlaybookExecution.execution_id)).filter(
+        failed_executions = db.query(func.count()).select_from(PlaybookExecution).filter(
             PlaybookExecution.status == PlaybookStatus.FAILED
         ).scalar() or 0
-        pending_approvals = db.query(func.count(PlaybookExecution.execution_id)).filter(
+        pending_approvals = db.query(func.count()).select_from(PlaybookExecution).filter(
             PlaybookExecution.status == PlaybookStatus.PENDING_APPROVAL
         ).scalar() or 0
 
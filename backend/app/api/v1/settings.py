@@ -29,6 +29,7 @@ from app.schemas.settings import (
 from app.schemas.auth import CurrentUser
 from app.models.settings import SystemSettings
 from app.config import settings as app_settings
+from app.core.settings_cache import settings_cache
 
 logger = logging.getLogger(__name__)
 
@@ -104,6 +105,15 @@ def get_setting(db: Session, key: str, default: any = None) -> any:
         return default
 
 
+def get_setting_cached(db: Session, key: str, default: any = None) -> any:
+    """Get a setting value, served from the in-process TTL cache when possible"""
+    hit, value = settings_cache.get(key)
+    if not hit:
+        value = get_setting(db, key)
+        settings_cache.set(key, value)
+    return value if value is not None else default
+
+
 def set_setting(db: Session, key: str, value: any, category: str = 'general',
                 setting_type: str = 'string', encrypt: bool = False):
     """Set a setting value in database"""
@@ -139,6 +149,7 @@ def set_setting(db: Session, key: str, value: any, category: str = 'general',
             db.add(setting)
 
         db.commit()
+        settings_cache.invalidate(key)
         return True
 
     except Exception as e:
@@ -25,6 +25,8 @@ class Settings(BaseSettings):
     api_port: int = Field(default=8000, env="API_PORT")
     api_workers: int = Field(default=4, env="API_WORKERS")
     api_reload: bool = Field(default=True, env="API_RELOAD")
+    gzip_min_size: int = Field(default=1024, env="GZIP_MIN_SIZE")
+    gzip_compress_level: int = Field(default=5, env="GZIP_COMPRESS_LEVEL")  # 1-9
 
     # CORS
     cors_origins: str = Field(
@@ -90,6 +92,17 @@ class Settings(BaseSettings):
                 f"&TrustServerCertificate={self.mssql_trust_cert}"
             )
 
+    def get_async_database_url(self) -> str:
+        """Build SQLAlchemy async connection string (asyncpg / aioodbc)"""
+        if self.database_type.lower() == "postgresql":
+            return (
+                f"postgresql+asyncpg://{self.postgres_user}:{self.postgres_password}"
+                f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
+            )
+        else:
+            # MS SQL Server (legacy, requires aioodbc)
+            return self.get_database_url().replace("mssql+pyodbc://", "mssql+aioodbc://", 1)
+
     # ============================================================================
     # AI PROVIDER SELECTION
     # ============================================================================
@@ -210,6 +223,8 @@ class Settings(BaseSettings):
         default=True,
         env="PASSWORD_REQUIRE_SPECIAL"
     )
+    # Argon2 worker processes per uvicorn worker (64 MiB per hash in flight)
+    password_hash_workers: int = Field(default=2, ge=1, env="PASSWORD_HASH_WORKERS")
 
     # Account Lockout
     failed_login_attempts: int = Field(default=5, env="FAILED_LOGIN_ATTEMPTS")
@@ -283,6 +298,13 @@ class Settings(BaseSettings):
     redis_password: str = Field(default="", env="REDIS_PASSWORD")
     redis_db: int = Field(default=0, env="REDIS_DB")
     redis_cache_ttl: int = Field(default=300, env="REDIS_CACHE_TTL")
+    dashboard_stats_cache_ttl: int = Field(default=15, env="DASHBOARD_STATS_CACHE_TTL")
+    fim_stats_cache_ttl: int = Field(default=15, env="FIM_STATS_CACHE_TTL")
+    fim_events_cache_ttl: int = Field(default=5, env="FIM_EVENTS_CACHE_TTL")
+    incident_stats_cache_ttl: int = Field(default=30, env="INCIDENT_STATS_CACHE_TTL")
+    threat_intel_ip_cache_ttl: int = Field(default=3600, env="THREAT_INTEL_IP_CACHE_TTL")
+    threat_intel_hash_cache_ttl: int = Field(default=604800, env="THREAT_INTEL_HASH_CACHE_TTL")
+    geoip_cache_ttl: int = Field(default=86400, env="GEOIP_CACHE_TTL")
 
     # Redis Queues
     redis_queue_enabled: bool = Field(default=False, env="REDIS_QUEUE_ENABLED")
@@ -330,6 +352,8 @@ class Settings(BaseSettings):
         default=True,
         env="AGENT_COMPRESSION_ENABLED"
     )
+    # Agent installation packages storage (default: backend/storage/agent_packages)
+    agent_packages_dir: str = Field(default="", env="AGENT_PACKAGES_DIR")
 
     # ============================================================================
     # CBR REPORTING (ЦБ РФ)
@@ -401,8 +425,12 @@ class Settings(BaseSettings):
     query_timeout_sec: int = Field(default=30, env="QUERY_TIMEOUT_SEC")
 
     db_pool_size: int = Field(default=20, env="DB_POOL_SIZE")
-    db_max_overflow: int = Field(default=10, env="DB_MAX_OVERFLOW")
-    db_pool_recycle_sec: int = Field(default=3600, env="DB_POOL_RECYCLE_SEC")
+    db_max_overflow: int = Field(default=20, env="DB_MAX_OVERFLOW")  # burst headroom for concurrent ingestion
+    db_pool_recycle_sec: int = Field(default=1800, env="DB_POOL_RECYCLE_SEC")
+    db_pool_timeout_sec: int = Field(default=30, env="DB_POOL_TIMEOUT_SEC")
+    db_use_pgbouncer: bool = Field(default=False, env="DB_USE_PGBOUNCER")  # pooling left to PgBouncer (NullPool)
+    db_query_cache_size: int = Field(default=2000, env="DB_QUERY_CACHE_SIZE")  # compiled SQL cache entries
+    db_prepared_statement_cache_size: int = Field(default=500, env="DB_PREPARED_STATEMENT_CACHE_SIZE")  # asyncpg
 
     # ============================================================================
     # RATE LIMITING
@@ -0,0 +1,203 @@
+"""
+Redis cache helpers (optional)
+Shared redis.asyncio client. When Redis is disabled or unreachable, every helper
+degrades to a cache miss / no-op so callers fall back to the database.
+"""
+
+import logging
+from typing import Any, Optional
+
+import orjson
+import redis.asyncio as aioredis
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# CLIENT
+# ============================================================================
+
+_redis_client: Optional[aioredis.Redis] = None
+
+
+def get_redis() -> Optional[aioredis.Redis]:
+    """
+    Get shared Redis client
+
+    Returns:
+        Redis client or None if Redis is disabled
+    """
+    global _redis_client
+
+    if not settings.redis_enabled:
+        return None
+
+    if _redis_client is None:
+        _redis_client = aioredis.from_url(
+            settings.get_redis_url(),
+            socket_timeout=1.0,
+            socket_connect_timeout=1.0,
+        )
+
+    return _redis_client
+
+
+async def close_redis() -> None:
+    """Close shared Redis client (called on application shutdown)"""
+    global _redis_client
+
+    if _redis_client is not None:
+        try:
+            await _redis_client.close()
+        except Exception as e:
+            logger.warning(f"Error closing Redis connection: {e}")
+        _redis_client = None
+
+
+# ============================================================================
+# JSON CACHE
+# ============================================================================
+
+async def cache_get_json(key: str) -> Optional[Any]:
+    """
+    Get JSON value from cache
+
+    Args:
+        key: Cache key
+
+    Returns:
+        Decoded value or None on miss / Redis unavailable
+    """
+    client = get_redis()
+    if client is None:
+        return None
+
+    try:
+        raw = await client.get(key)
+    except Exception as e:
+        logger.warning(f"Redis GET {key} failed: {e}")
+        return None
+
+    if raw is None:
+        return None
+
+    return orjson.loads(raw)
+
+
+async def cache_set_json(key: str, value: Any, ttl: int) -> None:
+    """
+    Store JSON value in cache with TTL
+
+    Args:
+        key: Cache key
+        value: JSON-serializable value (datetime/UUID supported by orjson)
+        ttl: Time to live in seconds
+    """
+    client = get_redis()
+    if client is None:
+        return
+
+    try:
+        await client.setex(key, ttl, orjson.dumps(value))
+    except Exception as e:
+        logger.warning(f"Redis SETEX {key} failed: {e}")
+
+
+async def cache_incr(key: str) -> None:
+    """Increment counter key, e.g. a cache generation (best effort)"""
+    client = get_redis()
+    if client is None:
+        return
+
+    try:
+        await client.incr(key)
+    except Exception as e:
+        logger.warning(f"Redis INCR {key} failed: {e}")
+
+
+async def cache_delete(*keys: str) -> None:
+    """Delete keys from cache (best effort)"""
+    client = get_redis()
+    if client is None or not keys:
+        return
+
+    try:
+        await client.delete(*keys)
+    except Exception as e:
+        logger.warning(f"Redis DEL {keys} failed: {e}")
+
+
+# ============================================================================
+# TOKEN REVOCATION
+# ============================================================================
+
+REVOKED_JTI_PREFIX = "auth:revoked_jti:"
+
+
+async def revoke_jti(jti: str, ttl: int) -> None:
+    """
+    Mark JWT id as revoked until the token would expire anyway
+
+    Args:
+        jti: JWT id (session_id)
+        ttl: Seconds until token expiration
+    """
+    client = get_redis()
+    if client is None:
+        return
+
+    try:
+        await client.setex(f"{REVOKED_JTI_PREFIX}{jti}", max(ttl, 1), 1)
+    except Exception as e:
+        logger.warning(f"Failed to revoke token {jti}: {e}")
+
+
+async def is_jti_revoked(jti: str) -> bool:
+    """Check if JWT id was revoked (False when Redis is unavailable)"""
+    client = get_redis()
+    if client is None:
+        return False
+
+    try:
+        return bool(await client.exists(f"{REVOKED_JTI_PREFIX}{jti}"))
+    except Exception as e:
+        logger.warning(f"Failed to check token revocation for {jti}: {e}")
+        return False
+
+
+# ============================================================================
+# RATE LIMITING
+# ============================================================================
+
+# INCR + EXPIRE on first hit in one atomic round-trip
+_INCR_WITH_TTL_LUA = """
+local n = redis.call('INCR', KEYS[1])
+if n == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return n
+"""
+
+
+async def incr_with_ttl(key: str, window: int) -> int:
+    """
+    Increment counter that expires `window` seconds after its first hit
+
+    Args:
+        key: Counter key
+        window: Window length in seconds
+
+    Returns:
+        Counter value after increment, 0 if Redis is unavailable
+    """
+    client = get_redis()
+    if client is None:
+        return 0
+
+    try:
+        return int(await client.eval(_INCR_WITH_TTL_LUA, 1, key, window))
+    except Exception as e:
+        logger.warning(f"Redis rate limit counter {key} failed: {e}")
+        return 0
@@ -6,11 +6,15 @@ Actual implementation is in app.database
 from app.database import (
     Base,
     engine,
+    async_engine,
     SessionLocal,
+    AsyncSessionLocal,
     get_db,
+    get_async_db,
     init_db,
     check_db_connection,
     close_db_connection,
+    close_async_db_connection,
     db_transaction,
     paginate,
     Page,
@@ -19,11 +23,15 @@ from app.database import (
 __all__ = [
     "Base",
     "engine",
+    "async_engine",
     "SessionLocal",
+    "AsyncSessionLocal",
     "get_db",
+    "get_async_db",
     "init_db",
     "check_db_connection",
     "close_db_connection",
+    "close_async_db_connection",
     "db_transaction",
     "paginate",
     "Page",
@@ -0,0 +1,47 @@
+"""
+Non-blocking logging setup
+Request handlers only enqueue records (QueueHandler); a background
+QueueListener thread owns the real handlers and does the I/O.
+"""
+
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(level: str) -> None:
+    """
+    Route root logger through an in-memory queue
+
+    Args:
+        level: Log level name (e.g. "INFO")
+    """
+    global _listener
+
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, level.upper()))
+    root.addHandler(QueueHandler(log_queue))
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread (called on shutdown)"""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -2,6 +2,13 @@
 Security utilities: JWT, password hashing, authentication
 """
 
+import asyncio
+import hashlib
+import multiprocessing
+import secrets
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from jose import JWTError, jwt
@@ -10,7 +17,15 @@ from passlib.context import CryptContext
 from app.config import settings
 
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# argon2id for new hashes; bcrypt hashes are still verified and rehashed on login
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=64 * 1024,
+    argon2__parallelism=1,
+)
 
 
 # ============================================================================
@@ -23,7 +38,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
     Args:
         plain_password: Plain text password
-        hashed_password: Bcrypt hashed password
+        hashed_password: Argon2id or bcrypt hashed password
 
     Returns:
         bool: True if password matches
@@ -31,9 +46,23 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """
+    Verify a password and return a new hash if the stored one uses a deprecated scheme
+
+    Args:
+        plain_password: Plain text password
+        hashed_password: Argon2id or bcrypt hashed password
+
+    Returns:
+        tuple: (is_valid, new_hash) - new_hash is set when bcrypt hash should be migrated to argon2id
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """
-    Hash a password using bcrypt
+    Hash a password using argon2id
 
     Args:
         password: Plain text password
@@ -44,6 +73,116 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# CPU-bound hashing runs in worker processes so the event loop is never blocked
+_password_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_password_pool() -> ProcessPoolExecutor:
+    """
+    Get (lazily create) process pool for password hashing
+
+    Workers are started from a forkserver (spawn where unavailable), never
+    forked from the running app: its logging/background threads may hold
+    locks that a forked child would inherit in the locked state.
+    """
+    global _password_pool
+    if _password_pool is None:
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _password_pool = ProcessPoolExecutor(
+            max_workers=settings.password_hash_workers,
+            mp_context=multiprocessing.get_context(start_method),
+        )
+    return _password_pool
+
+
+def shutdown_password_pool() -> None:
+    """Shutdown password hashing process pool (called on application shutdown)"""
+    global _password_pool
+    if _password_pool is not None:
+        _password_pool.shutdown(wait=False, cancel_futures=True)
+        _password_pool = None
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Non-blocking verify_password (runs in process pool)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_password_pool(), verify_password, plain_password, hashed_password
+    )
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    """Non-blocking verify_and_update_password (runs in process pool)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_password_pool(), verify_and_update_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Non-blocking get_password_hash (runs in process pool)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_password_pool(), get_password_hash, password)
+
+
+# Hash verified against when the user does not exist, so unknown usernames
+# cost the same as wrong passwords (no timing-based user enumeration)
+_dummy_password_hash: Optional[str] = None
+
+
+def get_dummy_password_hash() -> str:
+    """Get (lazily create) dummy password hash"""
+    global _dummy_password_hash
+    if _dummy_password_hash is None:
+        _dummy_password_hash = get_password_hash(secrets.token_urlsafe(16))
+    return _dummy_password_hash
+
+
+# Short-lived verification results, so a retry storm for one account does not
+# re-run argon2/bcrypt per request. Keyed by a per-process keyed BLAKE2b of the
+# password, never the password itself.
+_VERIFY_CACHE_TTL_SEC = 1.0
+_VERIFY_CACHE_MAX_SIZE = 4096
+_verify_cache_key = secrets.token_bytes(32)
+_verify_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+
+async def verify_and_update_password_cached(
+    user_id: int, plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    """
+    verify_and_update_password_async with a small in-process TTL cache
+
+    Args:
+        user_id: User ID
+        plain_password: Plain text password
+        hashed_password: Stored password hash
+
+    Returns:
+        tuple: (is_valid, new_hash)
+    """
+    password_digest = hashlib.blake2b(
+        plain_password.encode("utf-8"), key=_verify_cache_key, digest_size=32
+    ).digest()
+    cache_key = (user_id, password_digest, hashed_password)
+    now = time.monotonic()
+
+    cached = _verify_cache.get(cache_key)
+    if cached is not None and now - cached[0] < _VERIFY_CACHE_TTL_SEC:
+        return cached[1], cached[2]
+
+    is_valid, new_hash = await verify_and_update_password_async(plain_password, hashed_password)
+
+    _verify_cache[cache_key] = (now, is_valid, new_hash)
+    _verify_cache.move_to_end(cache_key)
+    while len(_verify_cache) > _VERIFY_CACHE_MAX_SIZE:
+        _verify_cache.popitem(last=False)
+
+    return is_valid, new_hash
+
+
 def validate_password_strength(password: str) -> tuple[bool, Optional[str]]:
     """
     Validate password against policy
@@ -130,13 +269,14 @@ def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def create_session_token(user_id: int, username: str) -> str:
+def create_session_token(user_id: int, username: str, session_id: Optional[str] = None) -> str:
     """
     Create session token for user
 
     Args:
         user_id: User ID
         username: Username
+        session_id: Session ID, stored as jti claim for revocation
 
     Returns:
         str: JWT token
@@ -146,6 +286,8 @@ def create_session_token(user_id: int, username: str) -> str:
         "username": username,
         "type": "access"
     }
+    if session_id:
+        token_data["jti"] = session_id
 
     return create_access_token(token_data)
 
@@ -236,8 +378,6 @@ def get_user_agent(request) -> str:
 # API KEY GENERATION (for agents)
 # ============================================================================
 
-import secrets
-
 
 def generate_api_key(length: int = 32) -> str:
     """
@@ -261,3 +401,22 @@ def generate_agent_id() -> str:
     """
     import uuid
     return str(uuid.uuid4())
+
+
+def generate_session_id() -> str:
+    """
+    Generate time-ordered session ID (UUIDv7)
+
+    config.sessions.session_id is a UUID primary key; v7 keeps inserts
+    appended to the right edge of the B-tree instead of random pages.
+
+    Returns:
+        str: UUIDv7 string
+    """
+    import time
+    import uuid
+    unix_ts_ms = time.time_ns() // 1_000_000
+    value = ((unix_ts_ms & 0xFFFFFFFFFFFF) << 80) | int.from_bytes(secrets.token_bytes(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return str(uuid.UUID(int=value))
@@ -0,0 +1,59 @@
+"""
+In-process TTL cache for system settings
+Settings (feature flags, API keys) change rarely but are read on every
+enrichment request; each worker keeps them for a short TTL.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Hashable, Tuple
+
+
+class TTLCache:
+    """Small thread-safe TTL cache (entries expire `ttl` seconds after being set)"""
+
+    def __init__(self, ttl: float, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Get cached value
+
+        Returns:
+            tuple: (hit, value)
+        """
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return False, None
+        return True, entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value for `ttl` seconds"""
+        with self._lock:
+            if len(self._data) >= self.maxsize and key not in self._data:
+                # Drop expired entries first, then the oldest one
+                now = time.monotonic()
+                for expired in [k for k, (expires, _) in self._data.items() if expires <= now]:
+                    del self._data[expired]
+                if len(self._data) >= self.maxsize:
+                    del self._data[next(iter(self._data))]
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Remove keys (all keys if none given)"""
+        with self._lock:
+            if not keys:
+                self._data.clear()
+                return
+            for key in keys:
+                self._data.pop(key, None)
+
+
+# Settings changed through the API are invalidated immediately in this worker;
+# other workers pick them up within the TTL
+SETTINGS_CACHE_TTL_SEC = 60
+
+settings_cache = TTLCache(ttl=SETTINGS_CACHE_TTL_SEC, maxsize=128)
@@ -3,13 +3,18 @@ Database connection and session management
 Supports PostgreSQL (primary) and MS SQL Server (legacy)
 """
 
-from typing import Generator
+import logging
+from typing import AsyncGenerator, Generator
 from sqlalchemy import create_engine, event, pool, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.pool import NullPool, QueuePool
 
 from app.config import settings
+from app.schemas.event import normalize_source_type
+
+logger = logging.getLogger(__name__)
 
 # ============================================================================
 # DATABASE ENGINE
@@ -32,16 +37,67 @@ def _get_connect_args():
             "TrustServerCertificate": settings.mssql_trust_cert,
         }
 
+def _get_executemany_options():
+    """
+    Driver batching for executemany (bulk event inserts):
+    psycopg2 sends batches of statements per round-trip, pyodbc binds
+    whole parameter arrays (fast_executemany)
+    """
+    if settings.database_type.lower() == "postgresql":
+        return {
+            "executemany_mode": "values_plus_batch",
+            "executemany_batch_page_size": 500,
+        }
+    return {"fast_executemany": True}
+
+def _get_pool_options(poolclass=None):
+    """
+    Pool arguments shared by the sync and async engines.
+    Behind PgBouncer the application keeps no pool of its own (NullPool)
+    """
+    if settings.db_use_pgbouncer:
+        return {"poolclass": NullPool}
+    options = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_sec,
+        "pool_recycle": settings.db_pool_recycle_sec,
+        "pool_pre_ping": True,  # Проверка соединения перед использованием
+    }
+    if poolclass is not None:
+        options["poolclass"] = poolclass
+    return options
+
 # Create engine with connection pooling
 engine = create_engine(
     DATABASE_URL,
-    poolclass=QueuePool,
-    pool_size=settings.db_pool_size,
-    max_overflow=settings.db_max_overflow,
-    pool_recycle=settings.db_pool_recycle_sec,
-    pool_pre_ping=True,  # Проверка соединения перед использованием
+    **_get_pool_options(QueuePool),
+    query_cache_size=settings.db_query_cache_size,  # Кэш скомпилированных select()
     echo=settings.debug_sql,  # Вывод SQL запросов в лог
     connect_args=_get_connect_args(),
+    execution_options={
+        "isolation_level": "READ COMMITTED"
+    },
+    **_get_executemany_options()
+)
+
+# Async engine (asyncpg) for endpoints that use AsyncSession
+def _get_async_connect_args():
+    """Get async driver connection arguments"""
+    if settings.database_type.lower() == "postgresql":
+        return {
+            "timeout": settings.query_timeout_sec,
+            # PgBouncer transaction pooling cannot keep prepared statements
+            "prepared_statement_cache_size": 0 if settings.db_use_pgbouncer else settings.db_prepared_statement_cache_size,
+        }
+    return {}
+
+async_engine = create_async_engine(
+    settings.get_async_database_url(),
+    **_get_pool_options(),
+    query_cache_size=settings.db_query_cache_size,
+    echo=settings.debug_sql,
+    connect_args=_get_async_connect_args(),
     execution_options={
         "isolation_level": "READ COMMITTED"
     }
@@ -57,6 +113,13 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # ============================================================================
 # BASE CLASS FOR MODELS
 # ============================================================================
@@ -84,6 +147,20 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency для получения асинхронной сессии БД (asyncpg)
+
+    Usage:
+        @app.get("/items/")
+        async def read_items(db: AsyncSession = Depends(get_async_db)):
+            result = await db.execute(select(Item))
+            return result.scalars().all()
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 # ============================================================================
 # DATABASE UTILITIES
 # ============================================================================
@@ -122,6 +199,31 @@ def close_db_connection():
     engine.dispose()
 
 
+async def close_async_db_connection():
+    """Close all async database connections"""
+    await async_engine.dispose()
+
+
+def get_pool_status() -> dict:
+    """
+    Connection pool usage of both engines (for /health)
+
+    Returns:
+        dict: {engine: {size, checked_out, overflow}} or pool description
+    """
+    status = {}
+    for name, pool_ in (("sync", engine.pool), ("async", async_engine.pool)):
+        if isinstance(pool_, QueuePool):
+            status[name] = {
+                "size": pool_.size(),
+                "checked_out": pool_.checkedout(),
+                "overflow": pool_.overflow(),
+            }
+        else:
+            status[name] = pool_.status()
+    return status
+
+
 # ============================================================================
 # EVENT LISTENERS FOR CONNECTION POOLING
 # ============================================================================
@@ -146,6 +248,22 @@ def receive_checkout(dbapi_conn, connection_record, connection_proxy):
     pass
 
 
+def _watch_pool_exhaustion(name: str, engine_pool: pool.Pool) -> None:
+    """Warn when every pooled connection is checked out (next request waits pool_timeout)"""
+    if not isinstance(engine_pool, QueuePool):
+        return
+    capacity = settings.db_pool_size + settings.db_max_overflow
+
+    @event.listens_for(engine_pool, "checkout")
+    def _on_checkout(dbapi_conn, connection_record, connection_proxy):
+        if engine_pool.checkedout() >= capacity:
+            logger.warning(f"DB pool '{name}' exhausted: {engine_pool.status()}")
+
+
+_watch_pool_exhaustion("sync", engine.pool)
+_watch_pool_exhaustion("async", async_engine.pool)
+
+
 @event.listens_for(pool.Pool, "checkin")
 def receive_checkin(dbapi_conn, connection_record):
     """
@@ -224,26 +342,25 @@ def bulk_insert_events(db: Session, events: list) -> dict:
         return {'InsertedCount': 0, 'Status': 'success'}
 
     try:
-        # Use PostgreSQL batch insert
-        inserted_count = 0
-        for event in events:
-            db.execute(
-                text("""
-                    INSERT INTO security_events.events
-                    (agent_id, event_time, event_code, provider, source_type, category,
-                     severity, message, subject_user, target_user, source_ip, destination_ip,
-                     process_name, process_id, file_path, registry_key, raw_event)
-                    VALUES
-                    (:agent_id, :event_time, :event_code, :provider, :source_type, :category,
-                     :severity, :message, :subject_user, :target_user, :source_ip, :destination_ip,
-                     :process_name, :process_id, :file_path, :registry_key, :raw_event::jsonb)
-                """),
+        # One executemany (psycopg2 sends it in pages, see _get_executemany_options)
+        db.execute(
+            text("""
+                INSERT INTO security_events.events
+                (agent_id, event_time, event_code, provider, source_type, category,
+                 severity, message, subject_user, target_user, source_ip, destination_ip,
+                 process_name, process_id, file_path, registry_key, raw_event)
+                VALUES
+                (:agent_id, :event_time, :event_code, :provider, :source_type, :category,
+                 :severity, :message, :subject_user, :target_user, :source_ip, :destination_ip,
+                 :process_name, :process_id, :file_path, :registry_key, CAST(:raw_event AS jsonb))
+            """),
+            [
                 {
                     "agent_id": event.get("agent_id"),
                     "event_time": event.get("event_time"),
                     "event_code": event.get("event_code"),
                     "provider": event.get("provider"),
-                    "source_type": event.get("source_type"),
+                    "source_type": normalize_source_type(event.get("source_type"), event.get("provider")),
                     "category": event.get("category"),
                     "severity": event.get("severity", 0),
                     "message": event.get("message"),
@@ -257,8 +374,10 @@ def bulk_insert_events(db: Session, events: list) -> dict:
                     "registry_key": event.get("registry_key"),
                     "raw_event": event.get("raw_event") if isinstance(event.get("raw_event"), str) else None
                 }
-            )
-            inserted_count += 1
+                for event in events
+            ]
+        )
+        inserted_count = len(events)
 
         db.commit()
         return {'InsertedCount': inserted_count, 'Status': 'success'}
@@ -6,24 +6,25 @@ FastAPI application with REST API and WebSocket support
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
 import time
 import logging
 
 from app.config import settings
-from app.database import engine, check_db_connection, close_db_connection, get_db
+from app.database import engine, check_db_connection, close_db_connection, close_async_db_connection, get_db, get_pool_status
+from app.core.cache import close_redis
 from app.tasks import get_ai_analyzer_task, get_dashboard_updater_task
 from app.migrations_runner import run_migrations_on_startup
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash, shutdown_password_pool
 from app.models.user import User
+from app.api.v1.docs import build_docs_index
+from app.api.v1.deployment import sync_package_file_availability
+from app.core.logging_setup import setup_logging, stop_logging
 
-# Setup logging
-logging.basicConfig(
-    level=getattr(logging, settings.log_level.upper()),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Setup logging (records are written by a background listener thread)
+setup_logging(settings.log_level)
 
 logger = logging.getLogger(__name__)
 
@@ -119,6 +120,16 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.warning(f"Default admin user check skipped: {e}")
 
+        # Re-check agent package files on disk
+        try:
+            db = next(get_db())
+            changed = sync_package_file_availability(db)
+            db.close()
+            if changed:
+                logger.info(f"✓ Agent package file availability updated for {changed} package(s)")
+        except Exception as e:
+            logger.warning(f"Agent package file check skipped: {e}")
+
     else:
         logger.error("✗ Database connection failed!")
         logger.warning("API will start but database operations will fail")
@@ -129,6 +140,13 @@ async def lifespan(app: FastAPI):
     logger.info(f"AI Provider: {settings.ai_provider}")
     logger.info(f"Email notifications: {'Enabled' if settings.email_enabled else 'Disabled'}")
 
+    # Index documentation files once
+    try:
+        docs = build_docs_index()
+        logger.info(f"✓ Documentation index built ({len(docs)} files)")
+    except Exception as e:
+        logger.warning(f"Documentation index skipped: {e}")
+
     # Start background tasks
     logger.info("Starting background tasks...")
     try:
@@ -163,9 +181,13 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error stopping background tasks: {e}")
 
+    await close_redis()
+    shutdown_password_pool()
     close_db_connection()
+    await close_async_db_connection()
     logger.info("✓ Application shutdown complete")
     logger.info("=" * 70)
+    stop_logging()
 
 
 # ============================================================================
@@ -178,6 +200,7 @@ app = FastAPI(
     version=settings.app_version,
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -195,7 +218,13 @@ app.add_middleware(
 )
 
 # Gzip Compression
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# Event listings and NDJSON exports are large, repetitive JSON; a mid gzip
+# level keeps nearly the level-9 ratio at a fraction of the CPU cost
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=settings.gzip_min_size,
+    compresslevel=settings.gzip_compress_level
+)
 
 
 # SECURITY: Add security headers middleware
@@ -294,6 +323,7 @@ async def health_check():
         "service": settings.app_name,
         "version": settings.app_version,
         "database": db_status,
+        "db_pool": get_pool_status(),
         "timestamp": time.time()
     }
 
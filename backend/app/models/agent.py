@@ -2,7 +2,7 @@
 SQLAlchemy models for Agents and Assets
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, BigInteger, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, BigInteger, Date, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -249,13 +249,23 @@ class AgentPackage(Base):
     """Agent Package model - stores uploaded agent installation packages"""
 
     __tablename__ = "AgentPackages"
-    __table_args__ = {'schema': 'assets'}
+    __table_args__ = (
+        # One active package per version/platform/architecture (migration 007)
+        Index(
+            'idx_agent_packages_active_version',
+            'Version', 'Platform', 'Architecture',
+            unique=True,
+            postgresql_where=text('"IsActive" = TRUE'),
+        ),
+        {'schema': 'assets'},
+    )
 
     PackageId = Column(Integer, primary_key=True, autoincrement=True)
     Version = Column(String(20), nullable=False, index=True)
     FileName = Column(String(255), nullable=False)
     FileSize = Column(BigInteger)
     FileHash = Column(String(64))  # SHA256
+    FileHashBlake3 = Column(String(64))  # BLAKE3 (optional, set when blake3 is installed)
 
     # Package details
     Platform = Column(String(20), default='windows')  # windows, linux
@@ -266,6 +276,7 @@ class AgentPackage(Base):
     # File storage
     StoragePath = Column(String(500))  # Path on server
     DownloadUrl = Column(String(500))  # URL for download
+    FileAvailable = Column(Boolean, default=True)  # File present at StoragePath (checked on startup)
 
     # Status
     IsActive = Column(Boolean, default=True)
@@ -284,7 +295,15 @@ class AgentDeployment(Base):
     """Agent Deployment configuration model"""
 
     __tablename__ = "AgentDeployments"
-    __table_args__ = {'schema': 'assets'}
+    __table_args__ = (
+        # delete_package probes for active deployments of a package (migration 010)
+        Index(
+            'idx_agent_deployments_active_package',
+            'PackageId',
+            postgresql_where=text('"Status" = \'active\''),
+        ),
+        {'schema': 'assets'},
+    )
 
     DeploymentId = Column(Integer, primary_key=True, autoincrement=True)
     Name = Column(String(100), nullable=False)
@@ -327,7 +346,11 @@ class AgentDeploymentTarget(Base):
     """Target computers for agent deployment"""
 
     __tablename__ = "AgentDeploymentTargets"
-    __table_args__ = {'schema': 'assets'}
+    __table_args__ = (
+        # Status reports from agents look up (DeploymentId, ComputerName) (migration 008)
+        Index('idx_agent_deployment_targets_lookup', 'DeploymentId', 'ComputerName'),
+        {'schema': 'assets'},
+    )
 
     TargetId = Column(Integer, primary_key=True, autoincrement=True)
     DeploymentId = Column(Integer, ForeignKey('assets.AgentDeployments.DeploymentId'), nullable=False)
@@ -171,6 +171,9 @@ class Incident(Base):
 
     __tablename__ = "incidents"
     __table_args__ = {'schema': 'incidents'}
+    # Fetch server defaults (incident_guid) with RETURNING on INSERT, so the
+    # new incident can be returned without a refresh round-trip
+    __mapper_args__ = {'eager_defaults': True}
 
     IncidentId = Column('incident_id', Integer, primary_key=True, autoincrement=True)
     IncidentGuid = Column('incident_guid', UUID(as_uuid=True), unique=True, index=True, server_default=func.gen_random_uuid())
@@ -2,7 +2,7 @@
 SQLAlchemy models for Users and Sessions
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -13,7 +13,15 @@ class User(Base):
     """User model - config.users table"""
 
     __tablename__ = "users"
-    __table_args__ = {'schema': 'config'}
+    __table_args__ = (
+        # Covering index for keyset-paginated user listing (migration 005)
+        Index(
+            'idx_users_listing', 'user_id',
+            postgresql_include=['username', 'email', 'role', 'is_ad_user',
+                                'is_active', 'created_at', 'last_login'],
+        ),
+        {'schema': 'config'},
+    )
 
     # Column names match PostgreSQL schema (snake_case)
     user_id = Column('user_id', Integer, primary_key=True, index=True, autoincrement=True)
@@ -98,7 +106,11 @@ class Session(Base):
     """Session model - config.sessions table"""
 
     __tablename__ = "sessions"
-    __table_args__ = {'schema': 'config'}
+    __table_args__ = (
+        # Partial index for logout / password change (migration 004)
+        Index('idx_sessions_active_user', 'user_id', postgresql_where=text('is_active = TRUE')),
+        {'schema': 'config'},
+    )
 
     session_id = Column('session_id', String(36), primary_key=True)  # GUID
     user_id = Column('user_id', Integer, ForeignKey('config.users.user_id'), nullable=False)
@@ -10,6 +10,7 @@ from app.schemas.auth import (
     UserCreate,
     UserUpdate,
     UserResponse,
+    UserListResponse,
     CurrentUser,
 )
 
@@ -84,6 +85,7 @@ __all__ = [
     "UserCreate",
     "UserUpdate",
     "UserResponse",
+    "UserListResponse",
     "CurrentUser",
     # Agent
     "AgentRegister",
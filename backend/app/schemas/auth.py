@@ -2,7 +2,7 @@
 Pydantic schemas for Authentication
 """
 
-from pydantic import BaseModel, Field, EmailStr, validator
+from pydantic import BaseModel, ConfigDict, Field, EmailStr, validator
 from typing import Optional
 from datetime import datetime
 
@@ -12,17 +12,20 @@ class LoginRequest(BaseModel):
     username: str = Field(..., min_length=3, max_length=100)
     password: str = Field(..., min_length=1)
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "username": "admin",
                 "password": "Admin123!"
             }
         }
+    )
 
 
 class UserInfo(BaseModel):
     """User information in token response"""
+    model_config = ConfigDict(from_attributes=True)
+
     user_id: int
     username: str
     email: Optional[str]
@@ -32,6 +35,8 @@ class UserInfo(BaseModel):
 
 class TokenResponse(BaseModel):
     """Token response schema"""
+    model_config = ConfigDict(from_attributes=True)
+
     access_token: str
     token_type: str = "bearer"
     expires_in: int  # seconds
@@ -81,8 +86,8 @@ class UserCreate(BaseModel):
             raise ValueError(f'Role must be one of: {", ".join(allowed_roles)}')
         return v
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "username": "analyst1",
                 "email": "analyst1@company.local",
@@ -90,6 +95,7 @@ class UserCreate(BaseModel):
                 "role": "analyst"
             }
         }
+    )
 
 
 class UserUpdate(BaseModel):
@@ -110,6 +116,8 @@ class UserUpdate(BaseModel):
 
 class UserResponse(BaseModel):
     """User response schema"""
+    model_config = ConfigDict(from_attributes=True)
+
     user_id: int
     username: str
     email: Optional[str]
@@ -119,20 +127,20 @@ class UserResponse(BaseModel):
     created_at: datetime
     last_login: Optional[datetime]
 
-    class Config:
-        orm_mode = True
-        from_attributes = True
+
+class UserListResponse(BaseModel):
+    """Keyset-paginated user list"""
+    items: list[UserResponse]
+    next: Optional[int] = None  # pass as after_user_id to get the next page
 
 
 class CurrentUser(BaseModel):
     """Current authenticated user"""
+    model_config = ConfigDict(from_attributes=True)
+
     user_id: int
     username: str
     role: str
     is_admin: bool
     is_analyst: bool
     can_write: bool
-
-    class Config:
-        orm_mode = True
-        from_attributes = True
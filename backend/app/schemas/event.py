@@ -2,93 +2,113 @@
 Pydantic schemas for Events
 """
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, validator, field_validator, model_validator
 from typing import Optional, List, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 from uuid import UUID
 
 
+def normalize_source_type(source_type: Optional[str], provider: Optional[str]) -> Optional[str]:
+    """Sysmon events are stored with source_type 'Sysmon' whatever the agent sent"""
+    if provider and "sysmon" in provider.lower():
+        return "Sysmon"
+    return source_type
+
+
+def to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Convert an aware datetime to naive UTC.
+
+    event_time columns are TIMESTAMP WITHOUT TIME ZONE holding UTC, and
+    asyncpg refuses to bind aware datetimes (agents send RFC3339 with an
+    offset, clients send ...Z) to them.
+    """
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
 class EventCreate(BaseModel):
     """Schema for creating an event"""
     agent_id: UUID
     event_time: datetime
     source_type: str = Field(..., max_length=50)
-    event_code: Optional[int]
-    channel: Optional[str]
-    provider: Optional[str]
-    computer: Optional[str]
+    event_code: Optional[int] = None
+    channel: Optional[str] = None
+    provider: Optional[str] = None
+    computer: Optional[str] = None
 
     # Normalized fields
     severity: int = Field(default=0, ge=0, le=4)
-    category: Optional[str]
-    action: Optional[str]
-    outcome: Optional[str]
+    category: Optional[str] = None
+    action: Optional[str] = None
+    outcome: Optional[str] = None
 
     # Subject
-    subject_user: Optional[str]
-    subject_domain: Optional[str]
-    subject_sid: Optional[str]
-    subject_logon_id: Optional[str]
+    subject_user: Optional[str] = None
+    subject_domain: Optional[str] = None
+    subject_sid: Optional[str] = None
+    subject_logon_id: Optional[str] = None
 
     # Target
-    target_user: Optional[str]
-    target_domain: Optional[str]
-    target_host: Optional[str]
-    target_ip: Optional[str]
-    target_port: Optional[int]
+    target_user: Optional[str] = None
+    target_domain: Optional[str] = None
+    target_host: Optional[str] = None
+    target_ip: Optional[str] = None
+    target_port: Optional[int] = None
 
     # Process
-    process_name: Optional[str]
-    process_id: Optional[int]
-    process_path: Optional[str]
-    process_command_line: Optional[str]
-    process_hash: Optional[str]
+    process_name: Optional[str] = None
+    process_id: Optional[int] = None
+    process_path: Optional[str] = None
+    process_command_line: Optional[str] = None
+    process_hash: Optional[str] = None
 
     # Parent Process
-    parent_process_name: Optional[str]
-    parent_process_id: Optional[int]
-    parent_process_path: Optional[str]
-    parent_process_command_line: Optional[str]
+    parent_process_name: Optional[str] = None
+    parent_process_id: Optional[int] = None
+    parent_process_path: Optional[str] = None
+    parent_process_command_line: Optional[str] = None
 
     # Network
-    source_ip: Optional[str]
-    source_port: Optional[int]
-    source_hostname: Optional[str]
-    destination_ip: Optional[str]
-    destination_port: Optional[int]
-    destination_hostname: Optional[str]
-    protocol: Optional[str]
+    source_ip: Optional[str] = None
+    source_port: Optional[int] = None
+    source_hostname: Optional[str] = None
+    destination_ip: Optional[str] = None
+    destination_port: Optional[int] = None
+    destination_hostname: Optional[str] = None
+    protocol: Optional[str] = None
 
     # DNS
-    dns_query: Optional[str]
-    dns_response: Optional[str]
+    dns_query: Optional[str] = None
+    dns_response: Optional[str] = None
 
     # File
-    file_path: Optional[str]
-    file_name: Optional[str]
-    file_hash: Optional[str]
-    file_extension: Optional[str]
-    file_size: Optional[int]
+    file_path: Optional[str] = None
+    file_name: Optional[str] = None
+    file_hash: Optional[str] = None
+    file_extension: Optional[str] = None
+    file_size: Optional[int] = None
 
     # Registry
-    registry_path: Optional[str]
-    registry_key: Optional[str]
-    registry_value: Optional[str]
-    registry_value_type: Optional[str]
+    registry_path: Optional[str] = None
+    registry_key: Optional[str] = None
+    registry_value: Optional[str] = None
+    registry_value_type: Optional[str] = None
 
     # Additional
-    message: Optional[str]
-    raw_event: Optional[Dict[str, Any]]
-    tags: Optional[List[str]]
+    message: Optional[str] = None
+    raw_event: Optional[Dict[str, Any]] = None
+    tags: Optional[List[str]] = None
 
     # MITRE ATT&CK
-    mitre_attack_tactic: Optional[str]
-    mitre_attack_technique: Optional[str]
-    mitre_attack_subtechnique: Optional[str]
+    mitre_attack_tactic: Optional[str] = None
+    mitre_attack_technique: Optional[str] = None
+    mitre_attack_subtechnique: Optional[str] = None
 
     # GeoIP
-    geo_country: Optional[str]
-    geo_city: Optional[str]
+    geo_country: Optional[str] = None
+    geo_city: Optional[str] = None
 
     @validator('severity')
     def validate_severity(cls, v):
@@ -96,6 +116,16 @@ class EventCreate(BaseModel):
             raise ValueError('Severity must be between 0 and 4')
         return v
 
+    @field_validator('event_time')
+    @classmethod
+    def normalize_event_time(cls, v):
+        return to_naive_utc(v)
+
+    @model_validator(mode="after")
+    def normalize_sysmon_source(self):
+        self.source_type = normalize_source_type(self.source_type, self.provider)
+        return self
+
 
 class EventBatchCreate(BaseModel):
     """Schema for batch event creation"""
@@ -104,24 +134,29 @@ class EventBatchCreate(BaseModel):
 
 class EventFilter(BaseModel):
     """Schema for filtering events"""
-    start_time: Optional[datetime]
-    end_time: Optional[datetime]
-    agent_id: Optional[UUID]
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+    agent_id: Optional[UUID] = None
     min_severity: Optional[int] = Field(None, ge=0, le=4)
-    categories: Optional[List[str]]
-    source_types: Optional[List[str]]
-    subject_user: Optional[str]
-    source_ip: Optional[str]
-    destination_ip: Optional[str]
-    process_name: Optional[str]
-    search_text: Optional[str]
-    mitre_tactic: Optional[str]
-    mitre_technique: Optional[str]
-    ai_processed: Optional[bool]
-    ai_is_attack: Optional[bool]
+    categories: Optional[List[str]] = None
+    source_types: Optional[List[str]] = None
+    subject_user: Optional[str] = None
+    source_ip: Optional[str] = None
+    destination_ip: Optional[str] = None
+    process_name: Optional[str] = None
+    search_text: Optional[str] = None
+    mitre_tactic: Optional[str] = None
+    mitre_technique: Optional[str] = None
+    ai_processed: Optional[bool] = None
+    ai_is_attack: Optional[bool] = None
     limit: int = Field(default=100, ge=1, le=10000)
     offset: int = Field(default=0, ge=0)
 
+    @field_validator('start_time', 'end_time')
+    @classmethod
+    def normalize_time_range(cls, v):
+        return to_naive_utc(v)
+
 
 class EventResponse(BaseModel):
     """Event response schema"""
@@ -4,13 +4,19 @@ Uses MaxMind GeoLite2 database for IP geolocation
 """
 
 import logging
+from functools import lru_cache
 from typing import Optional, Dict
 import geoip2.database
 import geoip2.errors
+import maxminddb
 import os
 
 logger = logging.getLogger(__name__)
 
+# Per-process memo of resolved IPs; enrichment traffic is dominated by a
+# small set of hot addresses, so most lookups never walk the mmdb tree
+GEOIP_LOOKUP_CACHE_SIZE = 65536
+
 
 class GeoIPService:
     """GeoIP lookup service using MaxMind GeoLite2"""
@@ -36,17 +42,32 @@ class GeoIPService:
 
         self.db_path = db_path
         self.reader = None
+        self._lookup_cached = lru_cache(maxsize=GEOIP_LOOKUP_CACHE_SIZE)(self._lookup_uncached)
 
         if db_path and os.path.exists(db_path):
             try:
-                self.reader = geoip2.database.Reader(db_path)
-                logger.info(f"GeoIP database loaded from {db_path}")
+                self.reader = self._open_reader(db_path)
             except Exception as e:
                 logger.error(f"Failed to load GeoIP database: {e}")
         else:
             logger.warning("GeoIP database not found. IP geolocation will not be available.")
             logger.info("To enable GeoIP, download GeoLite2-City.mmdb from https://dev.maxmind.com/geoip/geolite2-free-geolocation-data")
 
+    @staticmethod
+    def _open_reader(db_path: str) -> geoip2.database.Reader:
+        """
+        Open mmdb with the C extension (mmap'd, tree walk in libmaxminddb),
+        falling back to the pure Python mmap reader if the extension is missing
+        """
+        try:
+            reader = geoip2.database.Reader(db_path, mode=maxminddb.MODE_MMAP_EXT)
+            logger.info(f"GeoIP database loaded from {db_path} (C extension)")
+        except ValueError as e:
+            reader = geoip2.database.Reader(db_path, mode=maxminddb.MODE_MMAP)
+            logger.warning(f"GeoIP C extension unavailable ({e}), using pure Python reader")
+            logger.info(f"GeoIP database loaded from {db_path}")
+        return reader
+
     def lookup_ip(self, ip_address: str) -> Optional[Dict]:
         """
         Lookup IP address geolocation
@@ -55,6 +76,11 @@ class GeoIPService:
         if not self.reader:
             return None
 
+        result = self._lookup_cached(ip_address)
+        return dict(result) if result is not None else None
+
+    def _lookup_uncached(self, ip_address: str) -> Optional[Dict]:
+        """Walk the mmdb tree for one IP (memoized by lookup_ip)"""
         try:
             response = self.reader.city(ip_address)
 
@@ -98,6 +124,7 @@ class GeoIPService:
         """Close GeoIP database reader"""
         if self.reader:
             self.reader.close()
+        self._lookup_cached.cache_clear()
 
     def __del__(self):
         """Cleanup on deletion"""
@@ -11,7 +11,8 @@ import logging
 from typing import List, Dict, Any, Optional, Set
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, cast
+from sqlalchemy.dialects.postgresql import JSONB
 import json
 
 from app.models.incident import Alert, Incident, DetectionRule
@@ -83,14 +84,15 @@ class IncidentCorrelationService:
                 self._update_incident_assets(existing_incident, [alert])
 
                 # Add work log entry
-                work_log = json.loads(existing_incident.WorkLog) if existing_incident.WorkLog else []
-                work_log.append({
+                # (appended by the UPDATE, the stored log is not read back)
+                existing_incident.WorkLog = func.coalesce(
+                    Incident.WorkLog, cast([], JSONB)
+                ).op('||')(cast([{
                     "timestamp": datetime.utcnow().isoformat(),
                     "user": "system",
                     "entry": f"Correlated new alert: {alert.Title}",
                     "type": "correlation"
-                })
-                existing_incident.WorkLog = json.dumps(work_log)
+                }], JSONB))
 
                 self.db.commit()
                 logger.info(f"Alert {alert.AlertId} added to existing incident {existing_incident.IncidentId}")
@@ -281,23 +283,23 @@ class IncidentCorrelationService:
             Category=category,
             AlertCount=len(alerts),
             EventCount=total_events,
-            AffectedAgents=json.dumps(list(affected_hosts)),
-            AffectedUsers=json.dumps(list(affected_users)),
+            AffectedAgents=list(affected_hosts),
+            AffectedUsers=list(affected_users),
             AffectedAssets=len(affected_hosts),
             StartTime=min(alert.FirstSeenAt for alert in alerts),
             DetectedAt=datetime.utcnow(),
             Status='open',
             Priority=2 if max_severity >= 4 else 1,
-            MitreAttackTactics=json.dumps(list(mitre_tactics)),
-            MitreAttackTechniques=json.dumps(list(mitre_techniques)),
+            MitreAttackTactics=list(mitre_tactics),
+            MitreAttackTechniques=list(mitre_techniques),
             IsAutoCorrelated=True,
             CreatedAt=datetime.utcnow(),
-            WorkLog=json.dumps([{
+            WorkLog=[{
                 "timestamp": datetime.utcnow().isoformat(),
                 "user": "system",
                 "entry": f"Incident auto-created from {len(alerts)} correlated alerts",
                 "type": "milestone"
-            }])
+            }]
         )
 
         self.db.add(incident)
@@ -352,23 +354,23 @@ class IncidentCorrelationService:
             Category=self._determine_incident_category([alert.MitreAttackTactic]) if alert.MitreAttackTactic else 'Suspicious Activity',
             AlertCount=1,
             EventCount=alert.EventCount,
-            AffectedAgents=json.dumps([alert.Computer]) if alert.Computer else None,
-            AffectedUsers=json.dumps([alert.Username]) if alert.Username else None,
+            AffectedAgents=[alert.Computer] if alert.Computer else None,
+            AffectedUsers=[alert.Username] if alert.Username else None,
             AffectedAssets=1 if alert.Computer else 0,
             StartTime=alert.FirstSeenAt,
             DetectedAt=datetime.utcnow(),
             Status='open',
             Priority=2,
-            MitreAttackTactics=json.dumps([alert.MitreAttackTactic]) if alert.MitreAttackTactic else None,
-            MitreAttackTechniques=json.dumps([alert.MitreAttackTechnique]) if alert.MitreAttackTechnique else None,
+            MitreAttackTactics=[alert.MitreAttackTactic] if alert.MitreAttackTactic else None,
+            MitreAttackTechniques=[alert.MitreAttackTechnique] if alert.MitreAttackTechnique else None,
             IsAutoCorrelated=False,
             CreatedAt=datetime.utcnow(),
-            WorkLog=json.dumps([{
+            WorkLog=[{
                 "timestamp": datetime.utcnow().isoformat(),
                 "user": "system",
                 "entry": f"Incident auto-escalated from detection rule '{rule.RuleName}'",
                 "type": "milestone"
-            }])
+            }]
         )
 
         self.db.add(incident)
@@ -408,8 +410,8 @@ class IncidentCorrelationService:
         Update incident's affected hosts and users
         """
         # Load existing
-        affected_hosts = set(json.loads(incident.AffectedAgents)) if incident.AffectedAgents else set()
-        affected_users = set(json.loads(incident.AffectedUsers)) if incident.AffectedUsers else set()
+        affected_hosts = set(incident.AffectedAgents or [])
+        affected_users = set(incident.AffectedUsers or [])
 
         # Add new
         for alert in new_alerts:
@@ -419,8 +421,8 @@ class IncidentCorrelationService:
                 affected_users.add(alert.Username)
 
         # Save
-        incident.AffectedAgents = json.dumps(list(affected_hosts))
-        incident.AffectedUsers = json.dumps(list(affected_users))
+        incident.AffectedAgents = list(affected_hosts)
+        incident.AffectedUsers = list(affected_users)
         incident.AffectedAssets = len(affected_hosts)
 
     async def _analyze_incident_with_ai(self, incident: Incident, alerts: List[Alert]) -> Dict[str, Any]:
@@ -437,10 +439,10 @@ class IncidentCorrelationService:
                 "severity": incident.Severity,
                 "category": incident.Category,
                 "start_time": incident.StartTime.isoformat() if incident.StartTime else None,
-                "mitre_tactics": json.loads(incident.MitreAttackTactics) if incident.MitreAttackTactics else [],
-                "mitre_techniques": json.loads(incident.MitreAttackTechniques) if incident.MitreAttackTechniques else [],
-                "affected_hosts": json.loads(incident.AffectedAgents) if incident.AffectedAgents else [],
-                "affected_users": json.loads(incident.AffectedUsers) if incident.AffectedUsers else []
+                "mitre_tactics": incident.MitreAttackTactics or [],
+                "mitre_techniques": incident.MitreAttackTechniques or [],
+                "affected_hosts": incident.AffectedAgents or [],
+                "affected_users": incident.AffectedUsers or []
             }
 
             # Prepare alerts data
@@ -4,9 +4,10 @@ Integration with VirusTotal, AbuseIPDB, and other threat intel sources
 """
 
 import logging
-import requests
 import hashlib
-from typing import Optional, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Tuple
+import httpx
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 import json
@@ -15,6 +16,17 @@ from app.models.integrations import ThreatIntelligence
 
 logger = logging.getLogger(__name__)
 
+# Shared HTTP/2 client: keep-alive connections to VirusTotal / AbuseIPDB are
+# reused across lookups instead of a TCP + TLS handshake per request
+_http_client = httpx.Client(
+    http2=True,
+    timeout=10.0,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+)
+
+# Worker threads for concurrent source requests within one lookup
+_http_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="threat-intel")
+
 
 class ThreatIntelService:
     """Unified Threat Intelligence Service"""
@@ -44,19 +56,25 @@ class ThreatIntelService:
         if not self.virustotal_enabled:
             return None
 
-        try:
-            # Check cache first
-            cached = self._get_cached_intel(ip_address, 'ip', 'virustotal', db)
-            if cached:
-                return cached
+        cached = self._get_cached_intel(ip_address, 'ip', 'virustotal', db)
+        if cached:
+            return cached
+
+        return self._store_fetched(self._fetch_ip_virustotal(ip_address), db)
 
+    def _fetch_ip_virustotal(self, ip_address: str) -> Optional[Tuple[Dict, Optional[Dict]]]:
+        """
+        Query VirusTotal for IP (HTTP only, no DB access - safe in worker threads)
+        Returns (intel_data, cache entry for _cache_intel or None)
+        """
+        try:
             # Fetch from VirusTotal API
             url = f"https://www.virustotal.com/api/v3/ip_addresses/{ip_address}"
             headers = {
                 'x-apikey': self.virustotal_api_key
             }
 
-            response = requests.get(url, headers=headers, timeout=10)
+            response = _http_client.get(url, headers=headers)
 
             if response.status_code == 200:
                 data = response.json()
@@ -76,7 +94,6 @@ class ThreatIntelService:
                     if category and category not in categories:
                         categories.append(category)
 
-                # Cache result
                 intel_data = {
                     'is_malicious': is_malicious,
                     'threat_score': threat_score,
@@ -86,19 +103,18 @@ class ThreatIntelService:
                     'raw': data
                 }
 
-                self._cache_intel(
-                    indicator=ip_address,
-                    indicator_type='ip',
-                    source='virustotal',
-                    is_malicious=is_malicious,
-                    threat_score=threat_score,
-                    categories=categories,
-                    raw_data=data,
-                    db=db
-                )
+                cache_entry = {
+                    'indicator': ip_address,
+                    'indicator_type': 'ip',
+                    'source': 'virustotal',
+                    'is_malicious': is_malicious,
+                    'threat_score': threat_score,
+                    'categories': categories,
+                    'raw_data': data
+                }
 
                 logger.info(f"VirusTotal: IP {ip_address} - Malicious: {is_malicious}, Score: {threat_score}")
-                return intel_data
+                return intel_data, cache_entry
 
             elif response.status_code == 404:
                 # IP not found in VT database - not necessarily bad
@@ -107,13 +123,13 @@ class ThreatIntelService:
                     'threat_score': 0,
                     'message': 'IP not found in VirusTotal database'
                 }
-                return intel_data
+                return intel_data, None
 
             else:
                 logger.warning(f"VirusTotal API returned {response.status_code}: {response.text}")
                 return None
 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             logger.error(f"VirusTotal API timeout for IP {ip_address}")
             return None
         except Exception as e:
@@ -140,7 +156,7 @@ class ThreatIntelService:
                 'x-apikey': self.virustotal_api_key
             }
 
-            response = requests.get(url, headers=headers, timeout=10)
+            response = _http_client.get(url, headers=headers)
 
             if response.status_code == 200:
                 data = response.json()
@@ -205,12 +221,18 @@ class ThreatIntelService:
         if not self.abuseipdb_enabled:
             return None
 
-        try:
-            # Check cache
-            cached = self._get_cached_intel(ip_address, 'ip', 'abuseipdb', db)
-            if cached:
-                return cached
+        cached = self._get_cached_intel(ip_address, 'ip', 'abuseipdb', db)
+        if cached:
+            return cached
 
+        return self._store_fetched(self._fetch_ip_abuseipdb(ip_address), db)
+
+    def _fetch_ip_abuseipdb(self, ip_address: str) -> Optional[Tuple[Dict, Optional[Dict]]]:
+        """
+        Query AbuseIPDB for IP (HTTP only, no DB access - safe in worker threads)
+        Returns (intel_data, cache entry for _cache_intel or None)
+        """
+        try:
             # Fetch from AbuseIPDB API
             url = "https://api.abuseipdb.com/api/v2/check"
             headers = {
@@ -223,7 +245,7 @@ class ThreatIntelService:
                 'verbose': True
             }
 
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            response = _http_client.get(url, headers=headers, params=params)
 
             if response.status_code == 200:
                 data = response.json()
@@ -254,31 +276,40 @@ class ThreatIntelService:
                     'raw': data
                 }
 
-                self._cache_intel(
-                    indicator=ip_address,
-                    indicator_type='ip',
-                    source='abuseipdb',
-                    is_malicious=is_malicious,
-                    threat_score=abuse_confidence_score,
-                    categories=categories,
-                    raw_data=data,
-                    db=db
-                )
+                cache_entry = {
+                    'indicator': ip_address,
+                    'indicator_type': 'ip',
+                    'source': 'abuseipdb',
+                    'is_malicious': is_malicious,
+                    'threat_score': abuse_confidence_score,
+                    'categories': categories,
+                    'raw_data': data
+                }
 
                 logger.info(f"AbuseIPDB: IP {ip_address} - Score: {abuse_confidence_score}, Reports: {total_reports}")
-                return intel_data
+                return intel_data, cache_entry
 
             else:
                 logger.warning(f"AbuseIPDB API returned {response.status_code}")
                 return None
 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             logger.error(f"AbuseIPDB API timeout for IP {ip_address}")
             return None
         except Exception as e:
             logger.error(f"Error checking IP with AbuseIPDB: {e}", exc_info=True)
             return None
 
+    def _store_fetched(self, fetched: Optional[Tuple[Dict, Optional[Dict]]], db: Session) -> Optional[Dict]:
+        """Persist a fetched result to the DB cache and return its intel data"""
+        if fetched is None:
+            return None
+
+        intel_data, cache_entry = fetched
+        if cache_entry:
+            self._cache_intel(db=db, **cache_entry)
+        return intel_data
+
     # ========================================================================
     # UNIFIED LOOKUP
     # ========================================================================
@@ -295,25 +326,36 @@ class ThreatIntelService:
             'sources': {}
         }
 
-        # Check VirusTotal
-        if self.virustotal_enabled:
-            vt_result = self.check_ip_virustotal(ip_address, db)
-            if vt_result:
-                results['sources']['virustotal'] = vt_result
-                if vt_result.get('is_malicious'):
-                    results['is_malicious'] = True
-                if vt_result.get('threat_score', 0) > results['max_threat_score']:
-                    results['max_threat_score'] = vt_result.get('threat_score', 0)
-
-        # Check AbuseIPDB
-        if self.abuseipdb_enabled:
-            abuse_result = self.check_ip_abuseipdb(ip_address, db)
-            if abuse_result:
-                results['sources']['abuseipdb'] = abuse_result
-                if abuse_result.get('is_malicious'):
-                    results['is_malicious'] = True
-                if abuse_result.get('threat_score', 0) > results['max_threat_score']:
-                    results['max_threat_score'] = abuse_result.get('threat_score', 0)
+        # DB cache is read serially on the caller's session; both API requests
+        # on a cache miss are sent concurrently (latency = slowest source)
+        vt_result = self._get_cached_intel(ip_address, 'ip', 'virustotal', db) if self.virustotal_enabled else None
+        abuse_result = self._get_cached_intel(ip_address, 'ip', 'abuseipdb', db) if self.abuseipdb_enabled else None
+
+        vt_future = _http_pool.submit(self._fetch_ip_virustotal, ip_address) \
+            if self.virustotal_enabled and not vt_result else None
+        abuse_future = _http_pool.submit(self._fetch_ip_abuseipdb, ip_address) \
+            if self.abuseipdb_enabled and not abuse_result else None
+
+        if vt_future:
+            vt_result = self._store_fetched(vt_future.result(), db)
+        if abuse_future:
+            abuse_result = self._store_fetched(abuse_future.result(), db)
+
+        # VirusTotal
+        if vt_result:
+            results['sources']['virustotal'] = vt_result
+            if vt_result.get('is_malicious'):
+                results['is_malicious'] = True
+            if vt_result.get('threat_score', 0) > results['max_threat_score']:
+                results['max_threat_score'] = vt_result.get('threat_score', 0)
+
+        # AbuseIPDB
+        if abuse_result:
+            results['sources']['abuseipdb'] = abuse_result
+            if abuse_result.get('is_malicious'):
+                results['is_malicious'] = True
+            if abuse_result.get('threat_score', 0) > results['max_threat_score']:
+                results['max_threat_score'] = abuse_result.get('threat_score', 0)
 
         return results
 
@@ -86,15 +86,15 @@ class DashboardUpdaterTask:
             time_24h_ago = datetime.utcnow() - timedelta(hours=24)
 
             # Events statistics (Event model uses snake_case)
-            events_24h = db.query(func.count(Event.event_id)).filter(
+            events_24h = db.query(func.count()).select_from(Event).filter(
                 Event.event_time >= time_24h_ago
             ).scalar() or 0
 
-            events_last_hour = db.query(func.count(Event.event_id)).filter(
+            events_last_hour = db.query(func.count()).select_from(Event).filter(
                 Event.event_time >= datetime.utcnow() - timedelta(hours=1)
             ).scalar() or 0
 
-            high_severity_events = db.query(func.count(Event.event_id)).filter(
+            high_severity_events = db.query(func.count()).select_from(Event).filter(
                 and_(
                     Event.event_time >= time_24h_ago,
                     Event.severity >= 3
@@ -102,7 +102,7 @@ class DashboardUpdaterTask:
             ).scalar() or 0
 
             # AI-detected attacks
-            ai_attacks = db.query(func.count(Event.event_id)).filter(
+            ai_attacks = db.query(func.count()).select_from(Event).filter(
                 and_(
                     Event.event_time >= time_24h_ago,
                     Event.ai_is_attack == True
@@ -110,14 +110,14 @@ class DashboardUpdaterTask:
             ).scalar() or 0
 
             # Alerts statistics
-            new_alerts = db.query(func.count(Alert.AlertId)).filter(
+            new_alerts = db.query(func.count()).select_from(Alert).filter(
                 and_(
                     Alert.CreatedAt >= time_24h_ago,
                     Alert.Status == 'new'
                 )
             ).scalar() or 0
 
-            critical_alerts = db.query(func.count(Alert.AlertId)).filter(
+            critical_alerts = db.query(func.count()).select_from(Alert).filter(
                 and_(
                     Alert.CreatedAt >= time_24h_ago,
                     Alert.Severity >= 4
@@ -125,16 +125,16 @@ class DashboardUpdaterTask:
             ).scalar() or 0
 
             # Incidents statistics
-            open_incidents = db.query(func.count(Incident.IncidentId)).filter(
+            open_incidents = db.query(func.count()).select_from(Incident).filter(
                 Incident.Status.in_(['open', 'investigating', 'contained'])
             ).scalar() or 0
 
             # Agents statistics (Agent model uses snake_case)
-            online_agents = db.query(func.count(Agent.agent_id)).filter(
+            online_agents = db.query(func.count()).select_from(Agent).filter(
                 Agent.status == 'online'
             ).scalar() or 0
 
-            total_agents = db.query(func.count(Agent.agent_id)).scalar() or 0
+            total_agents = db.query(func.count()).select_from(Agent).scalar() or 0
 
             offline_agents = total_agents - online_agents
 
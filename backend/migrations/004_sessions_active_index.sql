@@ -0,0 +1,12 @@
+-- ============================================================================
+-- Migration: 004_sessions_active_index.sql
+-- Description: Partial index on active sessions per user (logout / password change)
+-- Date: 2026-10-17
+-- Phase: Performance
+-- ============================================================================
+
+-- UPDATE config.sessions SET is_active = FALSE WHERE user_id = ? AND is_active
+-- touches only live sessions instead of every historical session of the user
+CREATE INDEX IF NOT EXISTS idx_sessions_active_user
+ON config.sessions(user_id)
+WHERE is_active = TRUE;
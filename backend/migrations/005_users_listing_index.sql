@@ -0,0 +1,11 @@
+-- ============================================================================
+-- Migration: 005_users_listing_index.sql
+-- Description: Covering index for keyset-paginated /auth/users listing
+-- Date: 2026-10-17
+-- Phase: Performance
+-- ============================================================================
+
+-- Keyset page (WHERE user_id > last seen id ORDER BY user_id LIMIT n) becomes an index-only scan
+CREATE INDEX IF NOT EXISTS idx_users_listing
+ON config.users(user_id)
+INCLUDE (username, email, role, is_ad_user, is_active, created_at, last_login);
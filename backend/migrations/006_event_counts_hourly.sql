@@ -0,0 +1,29 @@
+-- ============================================================================
+-- Migration: 006_event_counts_hourly.sql
+-- Description: Hourly event counts rollup (TimescaleDB continuous aggregate)
+-- Date: 2026-10-17
+-- Phase: Performance
+-- ============================================================================
+
+-- Dashboard 24h / 7d counters sum at most 168 hourly rows instead of
+-- scanning millions of events. Real-time aggregation (materialized_only = false)
+-- adds not-yet-materialized recent buckets from the raw hypertable.
+CREATE MATERIALIZED VIEW IF NOT EXISTS security_events.event_counts_hourly
+WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+SELECT
+    time_bucket(INTERVAL '1 hour', event_time) AS hour_bucket,
+    COUNT(*) AS event_count
+FROM security_events.events
+GROUP BY time_bucket(INTERVAL '1 hour', event_time)
+WITH NO DATA;
+
+-- Re-materialize the last 8 days every 5 minutes (covers the 7-day dashboard window)
+SELECT add_continuous_aggregate_policy(
+    'security_events.event_counts_hourly',
+    start_offset => INTERVAL '8 days',
+    end_offset => INTERVAL '1 hour',
+    schedule_interval => INTERVAL '5 minutes',
+    if_not_exists => TRUE
+);
+
+COMMENT ON MATERIALIZED VIEW security_events.event_counts_hourly IS 'Почасовое количество событий (для дашборда)';
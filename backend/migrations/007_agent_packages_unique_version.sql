@@ -0,0 +1,17 @@
+-- ============================================================================
+-- Migration: 007_agent_packages_unique_version.sql
+-- Description: One active agent package per version/platform/architecture
+-- Date: 2026-10-17
+-- Phase: Performance
+-- ============================================================================
+
+-- upload_package relies on this index instead of a duplicate-check SELECT.
+-- Agent deployment tables are created from the ORM models, so skip if absent.
+DO $$
+BEGIN
+    IF to_regclass('assets."AgentPackages"') IS NOT NULL THEN
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_agent_packages_active_version
+        ON assets."AgentPackages"("Version", "Platform", "Architecture")
+        WHERE "IsActive" = TRUE;
+    END IF;
+END $$;
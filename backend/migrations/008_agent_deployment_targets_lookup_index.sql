@@ -0,0 +1,16 @@
+-- ============================================================================
+-- Migration: 008_agent_deployment_targets_lookup_index.sql
+-- Description: Composite index for agent deployment status reports
+-- Date: 2026-10-17
+-- Phase: Performance
+-- ============================================================================
+
+-- report_deployment_status updates the target by (DeploymentId, ComputerName).
+-- Agent deployment tables are created from the ORM models, so skip if absent.
+DO $$
+BEGIN
+    IF to_regclass('assets."AgentDeploymentTargets"') IS NOT NULL THEN
+        CREATE INDEX IF NOT EXISTS idx_agent_deployment_targets_lookup
+        ON assets."AgentDeploymentTargets"("DeploymentId", "ComputerName");
+    END IF;
+END $$;
@@ -0,0 +1,16 @@
+-- ============================================================================
+-- Migration: 009_agent_packages_blake3.sql
+-- Description: Optional BLAKE3 hash column for agent packages
+-- Date: 2026-10-17
+-- Phase: Performance
+-- ============================================================================
+
+-- Filled on upload when the blake3 package is installed; SHA-256 stays in FileHash.
+-- Agent deployment tables are created from the ORM models, so skip if absent.
+DO $$
+BEGIN
+    IF to_regclass('assets."AgentPackages"') IS NOT NULL THEN
+        ALTER TABLE assets."AgentPackages"
+        ADD COLUMN IF NOT EXISTS "FileHashBlake3" VARCHAR(64);
+    END IF;
+END $$;
@@ -0,0 +1,17 @@
+-- ============================================================================
+-- Migration: 010_agent_deployments_active_package_index.sql
+-- Description: Partial index for "package used by an active deployment" check
+-- Date: 2026-10-17
+-- Phase: Performance
+-- ============================================================================
+
+-- delete_package runs EXISTS (... WHERE PackageId = ? AND Status = 'active').
+-- Agent deployment tables are created from the ORM models, so skip if absent.
+DO $$
+BEGIN
+    IF to_regclass('assets."AgentDeployments"') IS NOT NULL THEN
+        CREATE INDEX IF NOT EXISTS idx_agent_deployments_active_package
+        ON assets."AgentDeployments"("PackageId")
+        WHERE "Status" = 'active';
+    END IF;
+END $$;
@@ -0,0 +1,17 @@
+-- ============================================================================
+-- Migration: 011_agent_packages_file_available.sql
+-- Description: Track agent package file presence in the database
+-- Date: 2026-10-17
+-- Phase: Performance
+-- ============================================================================
+
+-- download_package checks this flag instead of stat()ing StoragePath per request;
+-- the application re-verifies it on startup.
+-- Agent deployment tables are created from the ORM models, so skip if absent.
+DO $$
+BEGIN
+    IF to_regclass('assets."AgentPackages"') IS NOT NULL THEN
+        ALTER TABLE assets."AgentPackages"
+        ADD COLUMN IF NOT EXISTS "FileAvailable" BOOLEAN DEFAULT TRUE;
+    END IF;
+END $$;
@@ -0,0 +1,13 @@
+-- ============================================================================
+-- Migration: 012_events_text_search.sql
+-- Description: Extension for indexed text search on events listing filters
+-- Date: 2026-10-17
+-- Phase: Performance
+-- ============================================================================
+
+-- subject_user / process_name are filtered with ILIKE '%value%' and
+-- search_text uses a prefix tsquery on the message body. The full-text and
+-- trigram GIN indexes over the events hypertable are not built here (that
+-- would block startup and ingest for the whole build); run
+-- scripts/build_events_indexes.py once after upgrading.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
@@ -0,0 +1,12 @@
+-- ============================================================================
+-- Migration: 013_events_covering_indexes.sql
+-- Description: Covering / partial indexes for hot events filter combinations (offline)
+-- Date: 2026-10-17
+-- Phase: Performance
+-- ============================================================================
+
+-- idx_events_time_covering (time window aggregates), idx_events_source_type
+-- (source_types filter) and idx_events_ai_attack (ai_is_attack listing)
+-- cover the whole events hypertable, so they are built by
+-- scripts/build_events_indexes.py rather than at startup.
+SELECT 1;
@@ -0,0 +1,33 @@
+-- ============================================================================
+-- Migration: 014_event_stats_hourly.sql
+-- Description: Hourly event statistics rollup (TimescaleDB continuous aggregate)
+-- Date: 2026-10-17
+-- Phase: Performance
+-- ============================================================================
+
+-- /events/stats/dashboard totals, severity / category / source breakdowns and
+-- top agents are summed from this rollup instead of grouping up to 7 days of
+-- raw events per request. Real-time aggregation covers the current hour.
+CREATE MATERIALIZED VIEW IF NOT EXISTS security_events.event_stats_hourly
+WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+SELECT
+    time_bucket(INTERVAL '1 hour', event_time) AS hour_bucket,
+    agent_id,
+    severity,
+    category,
+    source_type,
+    COUNT(*) AS event_count
+FROM security_events.events
+GROUP BY time_bucket(INTERVAL '1 hour', event_time), agent_id, severity, category, source_type
+WITH NO DATA;
+
+-- Refresh incrementally every minute over the 7-day stats window
+SELECT add_continuous_aggregate_policy(
+    'security_events.event_stats_hourly',
+    start_offset => INTERVAL '8 days',
+    end_offset => INTERVAL '1 hour',
+    schedule_interval => INTERVAL '1 minute',
+    if_not_exists => TRUE
+);
+
+COMMENT ON MATERIALIZED VIEW security_events.event_stats_hourly IS 'Почасовая статистика событий по агентам, важности, категориям и источникам';
@@ -0,0 +1,18 @@
+-- ============================================================================
+-- Migration: 015_events_fim_index.sql
+-- Description: Partial index for FIM queries on normalized Sysmon source_type
+-- Date: 2026-10-17
+-- Phase: Performance
+-- ============================================================================
+
+-- Ingest now sets source_type = 'Sysmon' for any Sysmon provider, so the FIM
+-- endpoints filter on source_type alone. Existing rows are not rewritten here
+-- (that would block startup on the whole hypertable); run
+-- scripts/backfill_sysmon_source_type.py once after upgrading.
+
+-- /fim/events, /fim/events/{id} and /fim/statistics: small partial index in
+-- listing order, the keyset page becomes a plain index range scan
+CREATE INDEX IF NOT EXISTS idx_events_fim
+ON security_events.events(event_time DESC, event_id DESC)
+WHERE event_code IN (11, 12, 13, 14, 23, 26)
+AND source_type = 'Sysmon';
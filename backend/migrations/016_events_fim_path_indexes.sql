@@ -0,0 +1,12 @@
+-- ============================================================================
+-- Migration: 016_events_fim_path_indexes.sql
+-- Description: Trigram indexes for FIM file_path / registry_key filters (offline)
+-- Date: 2026-10-17
+-- Phase: Performance
+-- ============================================================================
+
+-- /fim/events filters file_path and registry_key with ILIKE '%value%'.
+-- The partial trigram GIN indexes idx_events_fim_file_path_trgm and
+-- idx_events_fim_registry_key_trgm cover the whole events hypertable, so
+-- they are built by scripts/build_events_indexes.py rather than at startup.
+SELECT 1;
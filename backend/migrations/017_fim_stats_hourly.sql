@@ -0,0 +1,32 @@
+-- ============================================================================
+-- Migration: 017_fim_stats_hourly.sql
+-- Description: Hourly FIM statistics rollup (TimescaleDB continuous aggregate)
+-- Date: 2026-10-17
+-- Phase: Performance
+-- ============================================================================
+
+-- /fim/statistics totals, events by type and by severity are summed from
+-- this rollup. Real-time aggregation covers the current hour.
+CREATE MATERIALIZED VIEW IF NOT EXISTS security_events.fim_stats_hourly
+WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+SELECT
+    time_bucket(INTERVAL '1 hour', event_time) AS hour_bucket,
+    event_code,
+    severity,
+    COUNT(*) AS event_count
+FROM security_events.events
+WHERE source_type = 'Sysmon'
+AND event_code IN (11, 12, 13, 14, 23, 26)
+GROUP BY time_bucket(INTERVAL '1 hour', event_time), event_code, severity
+WITH NO DATA;
+
+-- Refresh incrementally every minute over the 7-day statistics window
+SELECT add_continuous_aggregate_policy(
+    'security_events.fim_stats_hourly',
+    start_offset => INTERVAL '8 days',
+    end_offset => INTERVAL '1 hour',
+    schedule_interval => INTERVAL '1 minute',
+    if_not_exists => TRUE
+);
+
+COMMENT ON MATERIALIZED VIEW security_events.fim_stats_hourly IS 'Почасовая статистика событий FIM по коду события и важности';
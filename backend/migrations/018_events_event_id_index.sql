@@ -0,0 +1,12 @@
+-- ============================================================================
+-- Migration: 018_events_event_id_index.sql
+-- Description: Index for event lookups by event_id (offline)
+-- Date: 2026-10-17
+-- Phase: Performance
+-- ============================================================================
+
+-- The hypertable unique index is (event_time, event_id), so a lookup by
+-- event_id alone (GET /events/{id}, /fim/events/{id}) cannot seek on it.
+-- idx_events_event_id covers the whole events hypertable, so it is built by
+-- scripts/build_events_indexes.py rather than at startup.
+SELECT 1;
@@ -0,0 +1,33 @@
+-- ============================================================================
+-- Migration: 019_incidents_jsonb_unwrap.sql
+-- Description: Store incident JSONB columns as native arrays
+-- Date: 2026-10-17
+-- Phase: Performance
+-- ============================================================================
+
+-- The API used to json.dumps lists before assigning them to the JSONB
+-- columns, so they were stored as JSON strings holding the encoded array.
+-- Values are now written as native arrays (work log and response actions are
+-- appended with || in the UPDATE), so unwrap the existing strings once.
+UPDATE incidents.incidents
+SET work_log = CASE WHEN jsonb_typeof(work_log) = 'string'
+                    THEN (work_log #>> '{}')::jsonb ELSE work_log END,
+    containment_actions = CASE WHEN jsonb_typeof(containment_actions) = 'string'
+                    THEN (containment_actions #>> '{}')::jsonb ELSE containment_actions END,
+    remediation_actions = CASE WHEN jsonb_typeof(remediation_actions) = 'string'
+                    THEN (remediation_actions #>> '{}')::jsonb ELSE remediation_actions END,
+    affected_agents = CASE WHEN jsonb_typeof(affected_agents) = 'string'
+                    THEN (affected_agents #>> '{}')::jsonb ELSE affected_agents END,
+    affected_users = CASE WHEN jsonb_typeof(affected_users) = 'string'
+                    THEN (affected_users #>> '{}')::jsonb ELSE affected_users END,
+    mitre_attack_tactics = CASE WHEN jsonb_typeof(mitre_attack_tactics) = 'string'
+                    THEN (mitre_attack_tactics #>> '{}')::jsonb ELSE mitre_attack_tactics END,
+    mitre_attack_techniques = CASE WHEN jsonb_typeof(mitre_attack_techniques) = 'string'
+                    THEN (mitre_attack_techniques #>> '{}')::jsonb ELSE mitre_attack_techniques END
+WHERE jsonb_typeof(work_log) = 'string'
+   OR jsonb_typeof(containment_actions) = 'string'
+   OR jsonb_typeof(remediation_actions) = 'string'
+   OR jsonb_typeof(affected_agents) = 'string'
+   OR jsonb_typeof(affected_users) = 'string'
+   OR jsonb_typeof(mitre_attack_tactics) = 'string'
+   OR jsonb_typeof(mitre_attack_techniques) = 'string';
@@ -0,0 +1,14 @@
+-- ============================================================================
+-- Migration: 020_incidents_mitre_tactics_gin.sql
+-- Description: GIN index for MITRE tactic filter on incidents
+-- Date: 2026-10-17
+-- Phase: Performance
+-- ============================================================================
+
+-- GET /incidents?mitre_tactic=... filters with mitre_attack_tactics @> '["..."]'
+-- (previously a leading-wildcard LIKE that always scanned the table).
+-- jsonb_path_ops supports only containment and is smaller than the default
+-- jsonb_ops opclass.
+CREATE INDEX IF NOT EXISTS idx_incidents_mitre_tactics
+ON incidents.incidents
+USING GIN (mitre_attack_tactics jsonb_path_ops);
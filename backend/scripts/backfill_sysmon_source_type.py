@@ -0,0 +1,103 @@
+"""
+Backfill source_type = 'Sysmon' for events stored before ingest normalization
+
+Ingest sets source_type = 'Sysmon' for any Sysmon provider and the FIM
+endpoints (and idx_events_fim) filter on source_type alone. Older rows may
+still carry the agent's source_type. This one-off script rewrites them chunk
+by chunk, newest first, in small batches with a commit after each batch, so
+it can run next to a live backend and be interrupted and resumed at any time.
+
+Compressed chunks are skipped unless --include-compressed is given: updating
+them decompresses the affected segments (TimescaleDB 2.11+).
+
+Usage:
+    python scripts/backfill_sysmon_source_type.py [--days 7] [--batch-size 5000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.database import engine
+from sqlalchemy import text
+
+
+CHUNKS_SQL = text("""
+    SELECT chunk_schema, chunk_name, range_start, range_end, is_compressed
+    FROM timescaledb_information.chunks
+    WHERE hypertable_schema = 'security_events'
+    AND hypertable_name = 'events'
+    AND range_end > now() - make_interval(days => :days)
+    ORDER BY range_start DESC
+""")
+
+# Batches are picked from the chunk itself; the hypertable's
+# (event_time, event_id) unique index makes the IN lookup an index probe
+BATCH_UPDATE_SQL = """
+    UPDATE security_events.events
+    SET source_type = 'Sysmon'
+    WHERE event_time >= :range_start AND event_time < :range_end
+    AND (event_time, event_id) IN (
+        SELECT event_time, event_id
+        FROM {chunk}
+        WHERE provider ILIKE '%Sysmon%'
+        AND source_type IS DISTINCT FROM 'Sysmon'
+        LIMIT :batch_size
+    )
+"""
+
+
+def backfill_chunk(chunk: str, range_start, range_end, batch_size: int) -> int:
+    """Update one chunk batch by batch, returns the number of rows changed"""
+    statement = text(BATCH_UPDATE_SQL.format(chunk=chunk))
+    total = 0
+    while True:
+        with engine.begin() as conn:
+            updated = conn.execute(statement, {
+                "range_start": range_start,
+                "range_end": range_end,
+                "batch_size": batch_size,
+            }).rowcount
+        total += updated
+        if updated < batch_size:
+            return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--days", type=int, default=7, help="Only chunks newer than this many days (default: 7)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per UPDATE/commit (default: 5000)")
+    parser.add_argument("--include-compressed", action="store_true", help="Also rewrite compressed chunks")
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        chunks = conn.execute(CHUNKS_SQL, {"days": args.days}).all()
+
+    total = 0
+    skipped = 0
+    for chunk in chunks:
+        name = f'"{chunk.chunk_schema}"."{chunk.chunk_name}"'
+        if chunk.is_compressed and not args.include_compressed:
+            skipped += 1
+            continue
+
+        started = time.monotonic()
+        updated = backfill_chunk(name, chunk.range_start, chunk.range_end, args.batch_size)
+        total += updated
+        print(f"  {name}: {updated} rows ({time.monotonic() - started:.1f}s)")
+
+    print(f"\n✓ Updated {total} events in {len(chunks) - skipped} chunks")
+    if skipped:
+        print(f"  Skipped {skipped} compressed chunks (use --include-compressed)")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nInterrupted by user")
+        sys.exit(1)
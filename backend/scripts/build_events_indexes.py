@@ -0,0 +1,181 @@
+"""
+Build the optional security_events.events indexes outside application startup
+
+Migrations run at startup in one transaction; building these indexes there
+would block startup and hold a SHARE lock on the whole hypertable (stopping
+ingest) for the entire build. This operator-run script creates them with
+TimescaleDB's transaction_per_chunk option instead: every chunk is indexed
+in its own transaction, so only the chunk being built is locked and ingest
+into the current chunk only waits for that one chunk.
+
+Indexes that already exist and are valid are skipped. An index left invalid
+by an interrupted run is dropped and built again, so the script can simply
+be re-run.
+
+Usage:
+    python scripts/build_events_indexes.py [--only idx_name ...] [--list]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.database import engine
+from sqlalchemy import text
+
+
+# (index name, what it serves, CREATE INDEX statement)
+# WITH (timescaledb.transaction_per_chunk) must precede the WHERE clause
+EVENTS_INDEXES = [
+    (
+        "idx_events_message_fts",
+        "GET /events search_text (the expression must match the one built in events.py)",
+        """
+        CREATE INDEX IF NOT EXISTS idx_events_message_fts
+        ON security_events.events
+        USING GIN (to_tsvector('simple', COALESCE(message, '')))
+        WITH (timescaledb.transaction_per_chunk)
+        """,
+    ),
+    (
+        "idx_events_subject_user_trgm",
+        "GET /events subject_user ILIKE filter",
+        """
+        CREATE INDEX IF NOT EXISTS idx_events_subject_user_trgm
+        ON security_events.events
+        USING GIN (subject_user gin_trgm_ops)
+        WITH (timescaledb.transaction_per_chunk)
+        WHERE subject_user IS NOT NULL
+        """,
+    ),
+    (
+        "idx_events_process_name_trgm",
+        "GET /events process_name ILIKE filter",
+        """
+        CREATE INDEX IF NOT EXISTS idx_events_process_name_trgm
+        ON security_events.events
+        USING GIN (process_name gin_trgm_ops)
+        WITH (timescaledb.transaction_per_chunk)
+        WHERE process_name IS NOT NULL
+        """,
+    ),
+    (
+        "idx_events_fim_file_path_trgm",
+        "GET /fim/events file_path ILIKE filter (predicate repeats the FIM base filter)",
+        """
+        CREATE INDEX IF NOT EXISTS idx_events_fim_file_path_trgm
+        ON security_events.events
+        USING GIN (file_path gin_trgm_ops)
+        WITH (timescaledb.transaction_per_chunk)
+        WHERE event_code IN (11, 12, 13, 14, 23, 26)
+        AND source_type = 'Sysmon'
+        AND file_path IS NOT NULL
+        """,
+    ),
+    (
+        "idx_events_fim_registry_key_trgm",
+        "GET /fim/events registry_key ILIKE filter (predicate repeats the FIM base filter)",
+        """
+        CREATE INDEX IF NOT EXISTS idx_events_fim_registry_key_trgm
+        ON security_events.events
+        USING GIN (registry_key gin_trgm_ops)
+        WITH (timescaledb.transaction_per_chunk)
+        WHERE event_code IN (11, 12, 13, 14, 23, 26)
+        AND source_type = 'Sysmon'
+        AND registry_key IS NOT NULL
+        """,
+    ),
+    (
+        "idx_events_time_covering",
+        "Time window aggregates (/events/stats/dashboard) as index-only scans",
+        """
+        CREATE INDEX IF NOT EXISTS idx_events_time_covering
+        ON security_events.events(event_time DESC)
+        INCLUDE (severity, category, source_type, agent_id)
+        WITH (timescaledb.transaction_per_chunk)
+        """,
+    ),
+    (
+        "idx_events_source_type",
+        "GET /events source_types filter",
+        """
+        CREATE INDEX IF NOT EXISTS idx_events_source_type
+        ON security_events.events(source_type, event_time DESC)
+        WITH (timescaledb.transaction_per_chunk)
+        """,
+    ),
+    (
+        "idx_events_ai_attack",
+        "GET /events ai_is_attack=true listing (partial, in listing order)",
+        """
+        CREATE INDEX IF NOT EXISTS idx_events_ai_attack
+        ON security_events.events(event_time DESC, event_id DESC)
+        WITH (timescaledb.transaction_per_chunk)
+        WHERE ai_is_attack = TRUE
+        """,
+    ),
+    (
+        "idx_events_event_id",
+        "GET /events/{id}, /fim/events/{id}: one probe per chunk instead of a full index walk",
+        """
+        CREATE INDEX IF NOT EXISTS idx_events_event_id
+        ON security_events.events(event_id)
+        WITH (timescaledb.transaction_per_chunk)
+        """,
+    ),
+]
+
+INDEX_STATE_SQL = text("""
+    SELECT i.indisvalid
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = 'security_events' AND c.relname = :name
+""")
+
+
+def build_index(conn, name: str, statement: str) -> str:
+    """Create one index, returns what was done"""
+    valid = conn.execute(INDEX_STATE_SQL, {"name": name}).scalar()
+    if valid:
+        return "exists"
+    if valid is False:
+        # Left behind by an interrupted build
+        conn.execute(text(f"DROP INDEX security_events.{name}"))
+
+    started = time.monotonic()
+    conn.execute(text(statement))
+    return f"built ({time.monotonic() - started:.1f}s)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="Build only these indexes")
+    parser.add_argument("--list", action="store_true", help="List indexes and exit")
+    args = parser.parse_args()
+
+    indexes = [index for index in EVENTS_INDEXES if not args.only or index[0] in args.only]
+
+    if args.list:
+        for name, purpose, _ in indexes:
+            print(f"  {name}: {purpose}")
+        return
+
+    # transaction_per_chunk commits per chunk itself: no surrounding transaction
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for name, _, statement in indexes:
+            print(f"  {name}: {build_index(conn, name, statement)}")
+
+    print(f"\n✓ {len(indexes)} events indexes checked")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nInterrupted by user (re-run to finish the remaining indexes)")
+        sys.exit(1)
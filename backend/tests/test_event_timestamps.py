@@ -0,0 +1,69 @@
+"""
+Event timestamps with a UTC offset are stored as naive UTC
+(security_events.events.event_time is TIMESTAMP WITHOUT TIME ZONE)
+"""
+
+from datetime import datetime
+from uuid import uuid4
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_async_db, get_current_user
+from app.api.v1.events import router
+from app.schemas import CurrentUser
+from app.schemas.event import EventFilter
+
+
+class _Result:
+    def scalars(self):
+        return iter(())
+
+
+class _RecordingSession:
+    """Stands in for AsyncSession, keeps the bound parameters"""
+
+    def __init__(self):
+        self.params = []
+
+    async def execute(self, statement, params=None):
+        self.params.append(params)
+        return _Result()
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+
+def _client(session):
+    app = FastAPI()
+    app.include_router(router, prefix="/events")
+    app.dependency_overrides[get_async_db] = lambda: session
+    app.dependency_overrides[get_current_user] = lambda: CurrentUser(
+        user_id=1, username="agent", role="admin",
+        is_admin=True, is_analyst=True, can_write=True
+    )
+    return TestClient(app)
+
+
+def test_batch_with_offset_timestamp_is_bound_as_naive_utc():
+    session = _RecordingSession()
+    response = _client(session).post("/events/batch", json={"events": [{
+        "agent_id": str(uuid4()),
+        "event_time": "2026-10-17T15:30:00+03:00",
+        "source_type": "Security",
+        "event_code": 4624,
+    }]})
+
+    assert response.status_code == 201
+    inserted = session.params[-1][0]
+    assert inserted["event_time"] == datetime(2026, 10, 17, 12, 30)
+
+
+def test_event_filter_z_suffix_is_naive_utc():
+    filters = EventFilter(start_time="2026-10-17T00:00:00Z", end_time="2026-10-17T06:00:00+06:00")
+
+    assert filters.start_time == datetime(2026, 10, 17, 0, 0)
+    assert filters.end_time == datetime(2026, 10, 17, 0, 0)
@@ -86,7 +86,7 @@ export default function Events() {
       const url = window.URL.createObjectURL(blob)
       const a = document.createElement('a')
       a.href = url
-      a.download = `events_${dayjs().format('YYYY-MM-DD_HH-mm-ss')}.csv`
+      a.download = `events_${dayjs().format('YYYY-MM-DD_HH-mm-ss')}.ndjson`
       document.body.appendChild(a)
       a.click()
       window.URL.revokeObjectURL(url)
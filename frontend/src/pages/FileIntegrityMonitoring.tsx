@@ -83,6 +83,12 @@ const FileIntegrityMonitoring: React.FC = () => {
     hostname: undefined as string | undefined,
   })
 
+  // A filter change is a new result set: back to page 1, which recounts total
+  const updateFilters = (changes: Partial<typeof filters>) => {
+    setFilters({ ...filters, ...changes })
+    setCurrentPage(1)
+  }
+
   useEffect(() => {
     loadEvents()
     loadStatistics()
@@ -96,9 +102,13 @@ const FileIntegrityMonitoring: React.FC = () => {
         ...filters,
         limit: pageSize,
         offset,
+        // Counting is expensive; only recount when the result set changes
+        with_total: currentPage === 1,
       })
       setEvents(response.events)
-      setTotal(response.total)
+      if (response.total !== null) {
+        setTotal(response.total)
+      }
     } catch (error: any) {
       console.error('Failed to load FIM events:', error)
       message.error('Не удалось загрузить события FIM')
@@ -308,7 +318,7 @@ const FileIntegrityMonitoring: React.FC = () => {
             style={{ width: 180 }}
             placeholder="Период"
             value={filters.last_hours}
-            onChange={(value) => setFilters({ ...filters, last_hours: value })}
+            onChange={(value) => updateFilters({ last_hours: value })}
           >
             <Option value={1}>Последний час</Option>
             <Option value={6}>Последние 6 часов</Option>
@@ -322,7 +332,7 @@ const FileIntegrityMonitoring: React.FC = () => {
             placeholder="Тип события"
             allowClear
             value={filters.event_type}
-            onChange={(value) => setFilters({ ...filters, event_type: value })}
+            onChange={(value) => updateFilters({ event_type: value })}
           >
             <Option value="file_created">Файл создан</Option>
             <Option value="file_deleted">Файл удален</Option>
@@ -336,7 +346,7 @@ const FileIntegrityMonitoring: React.FC = () => {
             placeholder="Путь файла или реестра"
             allowClear
             value={filters.file_path}
-            onChange={(e) => setFilters({ ...filters, file_path: e.target.value })}
+            onChange={(e) => updateFilters({ file_path: e.target.value })}
             prefix={<FolderOutlined />}
           />
 
@@ -345,7 +355,7 @@ const FileIntegrityMonitoring: React.FC = () => {
             placeholder="Процесс"
             allowClear
             value={filters.process_name}
-            onChange={(e) => setFilters({ ...filters, process_name: e.target.value })}
+            onChange={(e) => updateFilters({ process_name: e.target.value })}
           />
 
           <Input
@@ -353,7 +363,7 @@ const FileIntegrityMonitoring: React.FC = () => {
             placeholder="Хост"
             allowClear
             value={filters.hostname}
-            onChange={(e) => setFilters({ ...filters, hostname: e.target.value })}
+            onChange={(e) => updateFilters({ hostname: e.target.value })}
           />
 
           <Button
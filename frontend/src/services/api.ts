@@ -373,8 +373,17 @@ class APIService {
   // ============================================================================
 
   async getUsers(): Promise<User[]> {
-    const response = await this.client.get<User[]>('/auth/users')
-    return response.data
+    // The endpoint is keyset-paginated: follow `next` until the last page
+    const users: User[] = []
+    let after: number | null = null
+    do {
+      const response = await this.client.get<{ items: User[]; next: number | null }>('/auth/users', {
+        params: { limit: 500, after_user_id: after ?? undefined },
+      })
+      users.push(...response.data.items)
+      after = response.data.next
+    } while (after !== null)
+    return users
   }
 
   async createUser(data: {
@@ -747,6 +756,8 @@ class APIService {
     hostname?: string
     limit?: number
     offset?: number
+    after?: string
+    with_total?: boolean
   }): Promise<{
     events: Array<{
       event_id: number
@@ -768,10 +779,11 @@ class APIService {
       details?: string
       new_name?: string
     }>
-    total: number
+    total: number | null
     limit: number
-    offset: number
+    offset: number | null
     has_more: boolean
+    next_cursor: string | null
   }> {
     const response = await this.client.get('/fim/events', { params })
     return response.data